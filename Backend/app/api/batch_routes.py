@@ -0,0 +1,235 @@
+# app/api/batch_routes.py
+"""
+Batch endpoint: several GET requests in one round trip.
+
+The client (e.g. the frontend bootstrapping /users/me and /users/me/profile)
+sends a list of sub-requests. The batch authenticates once: every
+sub-request runs through the application as usual (routing, validation,
+error handling), but get_current_user returns the batch's user, and
+get_async_db returns the batch's session instead of opening one per
+sub-request.
+
+Sub-requests run concurrently. AsyncSession allows one operation at a time,
+so the shared session serializes its awaitable calls; DB round trips take
+turns while everything else (serialization, cache hits) overlaps. Only GET
+is accepted: reads are independent of each other, whereas writes would
+depend on their order and commit or roll back each other's work in the
+shared transaction.
+
+Handlers that commit mid-request to release their connection early share
+that transaction too. Login and password changes are not GETs, so they never
+run here; the admin user list (UserService.list_users) does, and its commit
+ends the batch's read transaction: sub-requests reading after it see a new
+snapshot. Nothing is lost, since no sub-request writes, but the batch is not
+one consistent snapshot once a user list is part of it.
+
+Sub-responses are buffered into the batch's JSON, so only bodies with a
+Content-Length of at most BATCH_MAX_BODY_BYTES are accepted. A streamed
+response (export) or a larger one (error report download) is stopped at
+its http.response.start, before its body is produced, and reported as 413
+for that sub-request: its iteration would run outside the shared session's
+lock and its size is unbounded.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote
+
+from fastapi import APIRouter, Depends, Request, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.user_routes import get_current_user, handle_service_exceptions
+from app.core.config import get_async_db, settings
+from app.core.exceptions import ValidationError
+from app.core.responses import model_response
+from app.models.user_models import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1", tags=["batch"])
+
+BATCH_PATH = "/api/v1/batch"
+# Set by the batch itself rather than taken from a sub-request
+RESERVED_HEADERS = frozenset({"authorization", "accept-encoding", "content-length", "host"})
+
+# -----------------------------
+# Request/Response Schemas
+# -----------------------------
+
+class SubRequest(BaseModel):
+    """One GET request of a batch."""
+    id: Optional[str] = Field(None, max_length=64, description="Echoed on the matching result")
+    method: str = Field("GET", pattern="^GET$", description="Only GET is supported")
+    path: str = Field(..., max_length=2048, description="API path with query string, e.g. /api/v1/users/me")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Extra headers, e.g. If-None-Match")
+
+class BatchRequest(BaseModel):
+    """Sub-requests executed with one authentication and one database session."""
+    requests: List[SubRequest] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
+
+class BatchResult(BaseModel):
+    """Outcome of one sub-request."""
+    id: Optional[str] = None
+    status: int = Field(..., description="HTTP status of the sub-request")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Response headers (ETag, Cache-Control, ...)")
+    body: Any = Field(None, description="Decoded JSON body (text for other types, null without a body)")
+
+class BatchResponse(BaseModel):
+    """Results in the order of the sub-requests."""
+    responses: List[BatchResult]
+
+# -----------------------------
+# Dispatch
+# -----------------------------
+
+class _SerializedSession:
+    """A session shared by concurrent sub-requests; awaitable calls take turns."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._lock = asyncio.Lock()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._session, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def serialized(*args, **kwargs):
+            async with self._lock:
+                return await attr(*args, **kwargs)
+        return serialized
+
+
+def _check_sub_request(sub: SubRequest) -> None:
+    path = sub.path
+    if not path.startswith("/api/") or "#" in path or not path.isascii():
+        raise ValidationError(f"Batch paths must be absolute API paths: {path!r}")
+    if path.partition("?")[0].rstrip("/") == BATCH_PATH:
+        raise ValidationError("Batches cannot be nested")
+    if not all(f"{name}{value}".isascii() for name, value in sub.headers.items()):
+        raise ValidationError("Batch sub-request headers must be ASCII")
+
+
+class _SubResponseRejected(Exception):
+    """Raised from a sub-request's send() to stop a response the batch cannot buffer."""
+
+
+def _check_sub_response(status_code: int, headers: Dict[str, str]) -> None:
+    length = headers.get("content-length")
+    if length is None:
+        if status_code in (status.HTTP_204_NO_CONTENT, status.HTTP_304_NOT_MODIFIED):
+            return
+        raise _SubResponseRejected("Streamed responses cannot be batched; request the path directly")
+    if int(length) > settings.BATCH_MAX_BODY_BYTES:
+        raise _SubResponseRejected(
+            f"Response body exceeds {settings.BATCH_MAX_BODY_BYTES} bytes; request the path directly"
+        )
+
+
+def _decode_body(body: bytes, content_type: str) -> Any:
+    if not body:
+        return None
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type == "application/json" or media_type.endswith("+json"):
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def _dispatch(request: Request, sub: SubRequest, state: Dict[str, Any]) -> BatchResult:
+    """Run one sub-request through the application and collect its response."""
+    path, _, query = sub.path.partition("?")
+    headers = [
+        (name.lower().encode("ascii"), value.encode("ascii"))
+        for name, value in sub.headers.items()
+        if name.lower() not in RESERVED_HEADERS
+    ]
+    headers.append((b"authorization", request.headers.get("authorization", "").encode("latin-1")))
+    scope = {
+        **{key: request.scope[key] for key in ("asgi", "http_version", "scheme", "server", "client", "root_path")
+           if key in request.scope},
+        "type": "http",
+        "method": "GET",
+        "path": unquote(path),
+        "raw_path": path.encode("ascii"),
+        "query_string": query.encode("ascii"),
+        "headers": headers,
+        "state": dict(state),
+    }
+
+    disconnected = asyncio.Event()
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    result = {"status": 500, "headers": {}, "body": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers = {}
+            for name, value in message["headers"]:
+                name = name.decode("latin-1")
+                previous = headers.get(name)
+                value = value.decode("latin-1")
+                headers[name] = f"{previous}, {value}" if previous else value
+            _check_sub_response(message["status"], headers)
+            headers.pop("content-length", None)
+            result["status"] = message["status"]
+            result["headers"] = headers
+        elif message["type"] == "http.response.body":
+            result["body"].append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except _SubResponseRejected as e:
+        return BatchResult(id=sub.id, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, body={"detail": str(e)})
+    except Exception as e:
+        # ServerErrorMiddleware has already sent the 500; it re-raises for the server to log
+        logger.exception("Batch sub-request GET %s failed: %s", sub.path, e)
+    finally:
+        disconnected.set()
+
+    return BatchResult(
+        id=sub.id,
+        status=result["status"],
+        headers=result["headers"],
+        body=_decode_body(b"".join(result["body"]), result["headers"].get("content-type", "")),
+    )
+
+# -----------------------------
+# Routes
+# -----------------------------
+
+@router.post(
+    "/batch",
+    response_model=BatchResponse,
+    summary="Batch GET requests",
+    description=(
+        f"Run up to {settings.BATCH_MAX_REQUESTS} GET sub-requests in one round trip, authenticated once "
+        "and sharing one database session. Each result has the sub-request's status, headers and body; "
+        "a failing sub-request does not fail the batch."
+    )
+)
+@handle_service_exceptions
+async def batch(
+    batch_in: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Execute a batch of GET requests."""
+    for sub in batch_in.requests:
+        _check_sub_request(sub)
+    # db is the session get_current_user authenticated with (dependencies are cached per request)
+    state = {**request.scope.get("state", {}), "batch_user": current_user, "batch_db": _SerializedSession(db)}
+    results = await asyncio.gather(*(_dispatch(request, sub, state) for sub in batch_in.requests))
+    return model_response(BatchResponse(responses=results))
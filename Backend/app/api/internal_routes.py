@@ -0,0 +1,60 @@
+# app/api/internal_routes.py
+"""
+Internal operational endpoints (admin only).
+Expose runtime metrics used to size worker pools and executors.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.user_routes import get_current_user
+from app.core.database import pool_stats
+from app.core.hashing import password_hasher
+from app.core.write_behind import user_touch_buffer
+from app.schemas.user_schema import UserRole
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def require_admin(current_user=Depends(get_current_user)):
+    """Require admin role for internal endpoints."""
+    if current_user.role != UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+
+@router.get(
+    "/hashing",
+    response_model=Dict[str, Any],
+    summary="Password hashing executor stats",
+    description="Queue depth, rejections and hash latency of the password hashing executor."
+)
+async def hashing_stats(_admin=Depends(require_admin)):
+    """Get password hashing executor statistics."""
+    return password_hasher.stats()
+
+
+@router.get(
+    "/write-behind",
+    response_model=Dict[str, Any],
+    summary="Write-behind buffer stats",
+    description="Pending, flushed and dropped counts of the users touch-column buffer."
+)
+async def write_behind_stats(_admin=Depends(require_admin)):
+    """Get write-behind buffer statistics."""
+    return user_touch_buffer.stats()
+
+
+@router.get(
+    "/db-pool",
+    response_model=Dict[str, Any],
+    summary="Database connection pool stats",
+    description="Checked-out and overflow connections, checkout wait-time histogram and connection ages per engine."
+)
+async def db_pool_stats(_admin=Depends(require_admin)):
+    """Get database connection pool statistics."""
+    return pool_stats()
@@ -10,22 +10,30 @@ from uuid import UUID
 from functools import wraps
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request, Response, Header
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.services.user_service import UserService, UserState
 from app.services.auth_service import AuthService
 from app.services.profile_service import ProfileService
-from app.core.config import get_db
+from app.services import export_service
+from app.core.config import get_async_db
+from app.core.etag import is_not_modified, validator_headers, version_etag
+from app.core.rate_limit import auth_ip_limiter, auth_account_limiter
+from app.core.responses import list_response, model_response
 from app.core.exceptions import (
     ServiceError,
     NotFoundError,
     ConflictError,
     PermissionError,
     ValidationError,
+    PreconditionFailedError,
     UnauthorizedError,
+    ServiceUnavailableError,
+    RateLimitExceededError,
 )
 from app.schemas.user_schema import (
     UserCreate,
@@ -34,7 +42,18 @@ from app.schemas.user_schema import (
     ProfileUpdate,
     ProfileOut,
     UserWithProfileOut,
+    UserPage,
+    CohortPage,
+    TermFacet,
+    UserStatsOverview,
+    BulkUserIds,
+    BulkUserUpdate,
+    JobOut,
     UserRole,
+    Status,
+    USER_OUT_LIST,
+    PROFILE_OUT_LIST,
+    TERM_FACET_LIST,
 )
 from app.models.user_models import User
 
@@ -95,25 +114,29 @@ class PrivacySettingsRequest(BaseModel):
 # Dependencies
 # -----------------------------
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+def get_user_service(db: AsyncSession = Depends(get_async_db, scope="function")) -> UserService:
     """Get user service dependency."""
     return UserService(db)
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+def get_auth_service(db: AsyncSession = Depends(get_async_db, scope="function")) -> AuthService:
     """Get auth service dependency."""
     return AuthService(db)
 
-def get_profile_service(db: Session = Depends(get_db)) -> ProfileService:
+def get_profile_service(db: AsyncSession = Depends(get_async_db, scope="function")) -> ProfileService:
     """Get profile service dependency."""
     return ProfileService(db)
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> User:
-    """Get current authenticated user."""
+    """Get current authenticated user (authenticated once per POST /batch for its sub-requests)."""
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
     try:
-        user = auth_service.get_current_user_from_token(credentials.credentials)
+        user = await auth_service.get_current_user_from_token(credentials.credentials)
         return user
     except Exception as e:
         logger.warning("Authentication failed: %s", e)
@@ -129,7 +152,7 @@ async def get_current_user_secret(
 ) -> User:
     """Get current authenticated user with password hash."""
     try:
-        user = auth_service.get_current_user_with_password_from_token(credentials.credentials)
+        user = await auth_service.get_current_user_with_password_from_token(credentials.credentials)
         return user
     except Exception as e:
         logger.warning("Authentication failed: %s", e)
@@ -138,10 +161,36 @@ async def get_current_user_secret(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    
-    
-    
+
+
+def rate_limit_auth_ip(scope: str):
+    """Build a dependency that rate limits an auth endpoint per client IP."""
+    def dependency(request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        try:
+            auth_ip_limiter.enforce(f"{scope}:{client_ip}")
+        except RateLimitExceededError as e:
+            logger.warning("Rate limit exceeded for %s from %s", scope, client_ip)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+    return dependency
+
+
+def _patch_format(content_type: Optional[str], patch: Any) -> str:
+    """Patch format from the Content-Type; plain application/json is read by body shape."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type == "application/merge-patch+json":
+        return "merge"
+    if media_type == "application/json-patch+json":
+        return "json"
+    if media_type == "application/json":
+        return "json" if isinstance(patch, list) else "merge"
+    raise ValidationError(f"Unsupported patch media type: {media_type or 'none'}")
+
+
 # -----------------------------
 # Exception Handler Decorator
 # -----------------------------
@@ -182,6 +231,26 @@ def handle_service_exceptions(func):
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=str(e)
             )
+        except PreconditionFailedError as e:
+            logger.info("Precondition failed: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=str(e)
+            )
+        except RateLimitExceededError as e:
+            logger.warning("Rate limit exceeded: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except ServiceUnavailableError as e:
+            logger.warning("Service unavailable: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
         except ServiceError as e:
             logger.error("Service error: %s", e)
             raise HTTPException(
@@ -205,7 +274,8 @@ def handle_service_exceptions(func):
     response_model=UserWithProfileOut,
     status_code=status.HTTP_201_CREATED,
     summary="Register a new user",
-    description="Register a new user account with automatic profile creation."
+    description="Register a new user account with automatic profile creation.",
+    dependencies=[Depends(rate_limit_auth_ip("register"))],
 )
 @handle_service_exceptions
 async def register_user(
@@ -213,13 +283,15 @@ async def register_user(
     user_service: UserService = Depends(get_user_service)
 ):
     """Register a new user account."""
-    return user_service.create_user(user_data)
+    await auth_account_limiter.enforce_async(f"register:{user_data.email.lower()}")
+    return await user_service.create_user(user_data)
 
 @router.post(
     "/login",
     response_model=TokenResponse,
     summary="User login",
-    description="Authenticate user and return JWT tokens."
+    description="Authenticate user and return JWT tokens.",
+    dependencies=[Depends(rate_limit_auth_ip("login"))],
 )
 @handle_service_exceptions
 async def login_user(
@@ -227,14 +299,16 @@ async def login_user(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Authenticate user with email and password."""
-    result = auth_service.login(login_data.email, login_data.password)
+    await auth_account_limiter.enforce_async(f"login:{login_data.email.lower()}")
+    result = await auth_service.login(login_data.email, login_data.password)
     return TokenResponse(**result)
 
 @router.post(
     "/refresh",
     response_model=Dict[str, str],
     summary="Refresh access token",
-    description="Get new access token using refresh token."
+    description="Rotate a refresh token and get a new access + refresh token pair.",
+    dependencies=[Depends(rate_limit_auth_ip("refresh"))],
 )
 @handle_service_exceptions
 async def refresh_token(
@@ -242,7 +316,7 @@ async def refresh_token(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Refresh access token using refresh token."""
-    return auth_service.refresh_token(refresh_data.refresh_token)
+    return await auth_service.refresh_token(refresh_data.refresh_token)
 
 # -----------------------------
 # Current User Routes
@@ -252,15 +326,24 @@ async def refresh_token(
     "/me",
     response_model=UserWithProfileOut,
     summary="Get current user info",
-    description="Get current authenticated user with profile information."
+    description=(
+        "Get current authenticated user with profile information. Supports conditional "
+        "requests: with a matching If-None-Match (or If-Modified-Since) the response is 304."
+    )
 )
 @handle_service_exceptions
 async def get_current_user_info(
+    request: Request,
     current_user: User = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service)
 ):
     """Get current user information with profile."""
-    return user_service.get_user_with_profile(current_user.id, current_user)
+    validators = await user_service.get_user_validators(current_user.id)
+    if validators is not None and is_not_modified(request.headers, *validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(*validators))
+    user = await user_service.get_user_with_profile(current_user.id, current_user)
+    # Validators of what is actually sent: a write may have landed since the lookup
+    return model_response(user, validator_headers(*user_service.user_with_profile_validators(user)))
 
 @router.put(
     "/me",
@@ -275,7 +358,7 @@ async def update_current_user(
     user_service: UserService = Depends(get_user_service)
 ):
     """Update current user information."""
-    return user_service.update_user(current_user.id, user_update, current_user)
+    return model_response(await user_service.update_user(current_user.id, user_update, current_user))
 
 @router.post(
     "/me/change-password",
@@ -292,10 +375,10 @@ async def change_password(
     """Change current user's password."""
     # Verify old password first
     print("done till here")
-    if not auth_service.verify_password(password_data.old_password, current_user.password_hash):
+    if not await auth_service.verify_password_async(password_data.old_password, current_user.password_hash):
         return MessageResponse(message="Current password is incorrect", success=False)
     
-    auth_service.change_password(current_user.id, password_data.new_password)
+    await auth_service.change_password(current_user.id, password_data.new_password)
     return MessageResponse(message="Password changed successfully")
 
 @router.delete(
@@ -310,7 +393,7 @@ async def deactivate_current_user(
     user_service: UserService = Depends(get_user_service)
 ):
     """Deactivate current user account."""
-    user_service.delete_user(current_user.id, hard_delete=False, requesting_user=current_user)
+    await user_service.delete_user(current_user.id, hard_delete=False, requesting_user=current_user)
     return MessageResponse(message="Account deactivated successfully")
 
 # -----------------------------
@@ -321,46 +404,90 @@ async def deactivate_current_user(
     "/me/profile",
     response_model=ProfileOut,
     summary="Get current user profile",
-    description="Get current user's profile information."
+    description=(
+        "Get current user's profile information. The ETag is the profile version used by If-Match; "
+        "with a matching If-None-Match (or If-Modified-Since) the response is 304."
+    )
 )
 @handle_service_exceptions
 async def get_current_user_profile(
+    request: Request,
     current_user: User = Depends(get_current_user),
     profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Get current user's profile."""
-    return profile_service.get_profile(current_user.id, current_user)
+    validators = await profile_service.get_profile_validators(current_user.id)
+    if validators is not None and is_not_modified(request.headers, *validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(*validators))
+    profile = await profile_service.get_profile(current_user.id, current_user)
+    return model_response(profile, validator_headers(*profile_service.profile_validators(profile)))
 
 @router.put(
     "/me/profile",
     response_model=ProfileOut,
     summary="Update current user profile",
-    description="Update current user's profile information."
+    description=(
+        "Update current user's profile information. Send the profile's ETag in If-Match "
+        "to fail with 412 instead of overwriting a concurrent change."
+    )
 )
 @handle_service_exceptions
 async def update_current_user_profile(
     profile_update: ProfileUpdate,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Update current user's profile."""
-    return profile_service.update_profile(current_user.id, profile_update, current_user)
+    profile = await profile_service.update_profile(current_user.id, profile_update, current_user, if_match)
+    return model_response(profile, {"ETag": version_etag(profile.version)})
+
+@router.patch(
+    "/me/profile",
+    response_model=ProfileOut,
+    summary="Patch current user profile",
+    description=(
+        "Partially update the current user's profile with a JSON merge patch "
+        "(Content-Type: application/merge-patch+json, RFC 7396) or a JSON patch "
+        "(application/json-patch+json, RFC 6902: add, replace, remove; append to arrays with '/-'). "
+        "Members of primary_pillar_weights, medications, conditions and privacy_settings are patched "
+        "in the database, so concurrent edits of different members do not overwrite each other. "
+        "Send the profile's ETag in If-Match to fail with 412 if it changed."
+    )
+)
+@handle_service_exceptions
+async def patch_current_user_profile(
+    request: Request,
+    if_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    """Patch current user's profile."""
+    try:
+        patch = await request.json()
+    except ValueError:
+        raise ValidationError("Request body must be JSON")
+    patch_format = _patch_format(request.headers.get("content-type"), patch)
+    profile = await profile_service.patch_profile(current_user.id, patch_format, patch, current_user, if_match)
+    return model_response(profile, {"ETag": version_etag(profile.version)})
 
 @router.patch(
     "/me/profile/privacy",
     response_model=ProfileOut,
     summary="Update privacy settings",
-    description="Update current user's profile privacy settings."
+    description="Update current user's profile privacy settings. Honors If-Match like PUT /me/profile."
 )
 @handle_service_exceptions
 async def update_privacy_settings(
     privacy_settings: PrivacySettingsRequest,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Update privacy settings for current user."""
     settings_dict = privacy_settings.dict(exclude_unset=True)
-    return profile_service.update_profile_privacy(current_user.id, settings_dict, current_user)
+    profile = await profile_service.update_profile_privacy(current_user.id, settings_dict, current_user, if_match)
+    return model_response(profile, {"ETag": version_etag(profile.version)})
 
 @router.delete(
     "/me/profile",
@@ -374,13 +501,226 @@ async def delete_current_user_profile(
     profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Delete current user's profile."""
-    profile_service.delete_profile(current_user.id, hard_delete=False, requesting_user=current_user)
+    await profile_service.delete_profile(current_user.id, hard_delete=False, requesting_user=current_user)
     return MessageResponse(message="Profile deleted successfully")
 
+@router.get(
+    "/profiles/search",
+    response_model=List[ProfileOut],
+    summary="Search profiles",
+    description="Search active users by username, full name or location. Hidden profile fields are neither matched nor returned."
+)
+@handle_service_exceptions
+async def search_profiles(
+    q: str = Query(..., min_length=3, max_length=100, description="Search text; terms of 3+ characters"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    fuzzy: bool = Query(True, description="Fill up with typo-tolerant matches"),
+    current_user: User = Depends(get_current_user),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    """Search profiles (privacy-filtered)."""
+    return list_response(PROFILE_OUT_LIST, await profile_service.search_profiles(q, limit, fuzzy, current_user))
+
+# -----------------------------
+# Clinician Routes
+# -----------------------------
+
+@router.get(
+    "/cohorts",
+    response_model=CohortPage,
+    summary="Find a patient cohort (Clinician)",
+    description="Profiles of active users with every given condition AND medication (case-insensitive). Clinician or admin access required."
+)
+@handle_service_exceptions
+async def find_cohort(
+    condition: List[str] = Query([], description="Required condition; repeat for several"),
+    medication: List[str] = Query([], description="Required medication name; repeat for several"),
+    limit: int = Query(50, ge=1, le=500, description="Number of profiles to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    """Find profiles matching all conditions and medications."""
+    return model_response(await profile_service.find_cohort(condition, medication, limit, cursor, current_user))
+
+@router.get(
+    "/cohorts/facets",
+    response_model=List[TermFacet],
+    summary="Cohort facet counts (Clinician)",
+    description="Profile counts per condition or medication, most common first, optionally within a cohort. Clinician or admin access required."
+)
+@handle_service_exceptions
+async def cohort_facets(
+    kind: str = Query("condition", pattern="^(condition|medication)$", description="Facet to count: condition or medication"),
+    condition: List[str] = Query([], description="Restrict to profiles with this condition; repeat for several"),
+    medication: List[str] = Query([], description="Restrict to profiles on this medication; repeat for several"),
+    limit: int = Query(50, ge=1, le=500, description="Number of facet values to return"),
+    current_user: User = Depends(get_current_user),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    """Count profiles per condition or medication."""
+    facets = await profile_service.cohort_facets(kind, condition, medication, limit, current_user)
+    return list_response(TERM_FACET_LIST, facets)
+
 # -----------------------------
 # Admin Routes
 # -----------------------------
 
+@router.get(
+    "/search",
+    response_model=List[UserOut],
+    summary="Search users (Admin)",
+    description="Ranked search by username, email, full name or location. Admin access required."
+)
+@handle_service_exceptions
+async def search_users(
+    q: str = Query(..., min_length=3, max_length=100, description="Search text; terms of 3+ characters"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    fuzzy: bool = Query(True, description="Fill up with typo-tolerant matches"),
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Search users (admin only)."""
+    return list_response(USER_OUT_LIST, await user_service.search_users(q, limit, fuzzy, current_user))
+
+@router.get(
+    "/stats/overview",
+    response_model=UserStatsOverview,
+    summary="User statistics (Admin)",
+    description="Counts by role, status, verification, onboarding and profile completion. Admin access required."
+)
+@handle_service_exceptions
+async def get_user_stats(
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Get user statistics overview (admin only)."""
+    return await user_service.get_user_stats(current_user)
+
+@router.put(
+    "/bulk/update",
+    response_model=JobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk update users (Admin)",
+    description="Change status, role and/or verification of many users in the background. Poll the returned job for progress. Admin access required."
+)
+@handle_service_exceptions
+async def bulk_update_users(
+    bulk_in: BulkUserUpdate,
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Start a bulk user update (admin only)."""
+    return await user_service.bulk_update_users(bulk_in, current_user)
+
+@router.post(
+    "/bulk/delete",
+    response_model=JobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk deactivate users (Admin)",
+    description="Soft-delete (deactivate) many users in the background. Poll the returned job for progress. Admin access required."
+)
+@handle_service_exceptions
+async def bulk_delete_users(
+    bulk_in: BulkUserIds,
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Start a bulk soft delete (admin only)."""
+    return await user_service.bulk_delete_users(bulk_in.user_ids, current_user)
+
+@router.post(
+    "/bulk/import",
+    response_model=JobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk import users (Admin)",
+    description=(
+        "Create users with profiles from a CSV (Content-Type: text/csv) or NDJSON request body, "
+        "streamed to disk and imported in the background. Rows are validated like registration; "
+        "rejected rows are listed in the job's error report. Admin access required."
+    )
+)
+@handle_service_exceptions
+async def import_users(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Override format detection from Content-Type"),
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Start a bulk user import (admin only)."""
+    return await user_service.import_users(
+        request.stream(), format, request.headers.get("content-type"), current_user
+    )
+
+@router.get(
+    "/bulk/jobs/{job_id}",
+    response_model=JobOut,
+    summary="Bulk job progress (Admin)",
+    description="Progress of a bulk operation started on this server. Admin access required."
+)
+@handle_service_exceptions
+async def get_bulk_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Get bulk job progress (admin only)."""
+    return await user_service.get_bulk_job(job_id, current_user)
+
+@router.get(
+    "/bulk/jobs/{job_id}/errors",
+    response_class=FileResponse,
+    summary="Bulk job error report (Admin)",
+    description="NDJSON report of rejected rows ({row, email, errors}) of a finished job. Admin access required."
+)
+@handle_service_exceptions
+async def get_bulk_job_report(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Download a bulk job's error report (admin only)."""
+    path = await user_service.get_bulk_job_report(job_id, current_user)
+    return FileResponse(path, media_type="application/x-ndjson", filename=f"{job_id}-errors.ndjson")
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export users (Admin)",
+    description=(
+        "Stream all users with their profiles as NDJSON or CSV, ordered by id. Pass the last id "
+        "received as `after` to resume an interrupted export. Password hashes are never exported; "
+        "contact and health fields require include_sensitive. Admin access required."
+    )
+)
+@handle_service_exceptions
+async def export_users(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$", description="Output format"),
+    after: Optional[UUID] = Query(None, description="Resume after this user id"),
+    role: Optional[UserRole] = Query(None, description="Filter by role"),
+    user_status: Optional[Status] = Query(None, alias="status", description="Filter by account status"),
+    is_verified: Optional[bool] = Query(None, description="Filter by verification"),
+    onboarding_completed: Optional[bool] = Query(None, description="Filter by onboarding completion"),
+    email_domain: Optional[str] = Query(None, max_length=255, description="Filter by email domain, e.g. example.com"),
+    include_sensitive: bool = Query(False, description="Include contact and health fields"),
+    current_user: User = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Stream a user export (admin only)."""
+    filters = {
+        "role": role,
+        "status": user_status,
+        "is_verified": is_verified,
+        "onboarding_completed": onboarding_completed,
+        "email_domain": email_domain,
+    }
+    chunks = user_service.export_users(format, after, filters, include_sensitive, current_user)
+    return StreamingResponse(
+        chunks,
+        media_type=export_service.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
 @router.get(
     "/{user_id}",
     response_model=UserWithProfileOut,
@@ -394,7 +734,7 @@ async def get_user_by_id(
     user_service: UserService = Depends(get_user_service)
 ):
     """Get user by ID (admin only)."""
-    return user_service.get_user_with_profile(user_id, current_user)
+    return model_response(await user_service.get_user_with_profile(user_id, current_user))
 
 @router.put(
     "/{user_id}",
@@ -410,7 +750,7 @@ async def update_user_by_id(
     user_service: UserService = Depends(get_user_service)
 ):
     """Update user by ID (admin only)."""
-    return user_service.update_user(user_id, user_update, current_user)
+    return model_response(await user_service.update_user(user_id, user_update, current_user))
 
 @router.patch(
     "/{user_id}/status",
@@ -426,7 +766,8 @@ async def change_user_status(
     user_service: UserService = Depends(get_user_service)
 ):
     """Change user status (admin only)."""
-    return user_service.update_user_status(user_id, status_data.status.value, current_user)
+    user = await user_service.update_user_status(user_id, status_data.status.value, current_user)
+    return model_response(user)
 
 @router.post(
     "/{user_id}/reset-password",
@@ -448,7 +789,7 @@ async def admin_reset_password(
             detail="Admin access required"
         )
     
-    auth_service.change_password(password_data.user_id, password_data.new_password)
+    await auth_service.change_password(password_data.user_id, password_data.new_password)
     return MessageResponse(message="Password reset successfully")
 
 @router.delete(
@@ -465,22 +806,35 @@ async def delete_user_by_id(
     user_service: UserService = Depends(get_user_service)
 ):
     """Delete user by ID (admin only)."""
-    user_service.delete_user(user_id, hard_delete, current_user)
+    await user_service.delete_user(user_id, hard_delete, current_user)
     delete_type = "permanently deleted" if hard_delete else "deactivated"
     return MessageResponse(message=f"User {delete_type} successfully")
 
 @router.get(
     "/",
-    response_model=List[UserOut],
+    response_model=UserPage,
     summary="List users (Admin)",
-    description="Get paginated list of users. Admin access required."
+    description="Get a keyset-paginated, filterable list of users, newest first. Admin access required."
 )
 @handle_service_exceptions
 async def list_users(
-    skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of users to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    role: Optional[UserRole] = Query(None, description="Filter by role"),
+    user_status: Optional[Status] = Query(None, alias="status", description="Filter by account status"),
+    is_verified: Optional[bool] = Query(None, description="Filter by verification"),
+    onboarding_completed: Optional[bool] = Query(None, description="Filter by onboarding completion"),
+    email_domain: Optional[str] = Query(None, max_length=255, description="Filter by email domain, e.g. example.com"),
+    include_total: bool = Query(True, description="Include estimated_total"),
     current_user: User = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service)
 ):
-    """List users with pagination (admin only)."""
-    return user_service.list_users(skip, limit, current_user)
\ No newline at end of file
+    """List users with keyset pagination (admin only)."""
+    filters = {
+        "role": role,
+        "status": user_status,
+        "is_verified": is_verified,
+        "onboarding_completed": onboarding_completed,
+        "email_domain": email_domain,
+    }
+    return model_response(await user_service.list_users(limit, cursor, filters, include_total, current_user))
@@ -0,0 +1,130 @@
+# app/core/auth_cache.py
+"""
+In-process cache of per-user auth snapshots.
+
+`get_current_user` only needs a handful of columns to authorize a request
+(id, role, status, is_verified, password_changed_at). Caching them here lets
+the common authenticated request skip the users SELECT entirely. Entries are
+bounded (LRU) and short-lived (TTL), and every write path that changes one of
+the cached columns must call `auth_cache.invalidate(user_id)` (or
+`invalidate_many` for bulk jobs).
+
+The cache is per process and invalidation is local: with several workers,
+only the one that handled the write drops its snapshot. The others keep
+authorizing with the old role or status until their entry expires, at most
+AUTH_CACHE_TTL_SECONDS after the write. That includes revocation by a
+password change, since the token's `iat` is compared with the cached
+password_changed_at.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.schemas.user_schema import UserRole, Status
+
+
+class AuthSnapshot:
+    """Compact, read-only view of the user columns needed for authorization."""
+
+    __slots__ = ("id", "role", "status", "is_verified", "password_changed_at", "expires_at")
+
+    def __init__(
+        self,
+        id: UUID,
+        role: UserRole,
+        status: Optional[Status],
+        is_verified: bool,
+        password_changed_at: Optional[datetime],
+        expires_at: float,
+    ):
+        self.id = id
+        self.role = role
+        self.status = status
+        self.is_verified = is_verified
+        self.password_changed_at = password_changed_at
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_user(cls, user, ttl_seconds: float) -> "AuthSnapshot":
+        """Build a snapshot from a User ORM instance."""
+        return cls(
+            id=user.id,
+            role=UserRole(user.role.value) if user.role is not None else UserRole.user,
+            status=Status(user.status.value) if user.status is not None else None,
+            is_verified=bool(user.is_verified),
+            password_changed_at=user.password_changed_at,
+            expires_at=time.monotonic() + ttl_seconds,
+        )
+
+    def __repr__(self) -> str:
+        return f"AuthSnapshot(id={self.id}, role={self.role.value}, status={self.status})"
+
+
+class AuthSnapshotCache:
+    """Thread-safe LRU cache of AuthSnapshot entries with a fixed TTL."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[UUID, AuthSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: UUID) -> Optional[AuthSnapshot]:
+        """Return a live snapshot for user_id, or None on miss/expiry."""
+        with self._lock:
+            snapshot = self._entries.get(user_id)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            if snapshot.expires_at <= time.monotonic():
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return snapshot
+
+    def put(self, user) -> AuthSnapshot:
+        """Snapshot a User ORM instance and store it, evicting the LRU entry if full."""
+        snapshot = AuthSnapshot.from_user(user, self.ttl_seconds)
+        if self.max_entries <= 0:
+            return snapshot
+        with self._lock:
+            self._entries[snapshot.id] = snapshot
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached snapshot for user_id (no-op if absent)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_many(self, user_ids: Iterable[UUID]) -> None:
+        """Drop the cached snapshots for user_ids under one lock acquisition."""
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached snapshot."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache instance
+auth_cache = AuthSnapshotCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
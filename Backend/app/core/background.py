@@ -0,0 +1,48 @@
+# app/core/background.py
+"""
+Minimal periodic background jobs bound to the application lifespan.
+Job functions are synchronous (they use the sync DB session) and run in a
+worker thread so they never block the event loop.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs fn every interval_seconds until stopped."""
+
+    def __init__(self, name: str, interval_seconds: float, fn: Callable[[], object]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.fn = fn
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> object:
+        """Run the job immediately (in a worker thread)."""
+        return await asyncio.to_thread(self.fn)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception("Background job %s failed: %s", self.name, e)
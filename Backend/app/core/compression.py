@@ -0,0 +1,199 @@
+# app/core/compression.py
+"""
+Negotiated response compression (zstd, brotli or gzip).
+
+CompressionMiddleware picks the encoding from Accept-Encoding: the highest
+q-value wins; ties go to the server's preference, zstd over br over gzip
+(the `zstandard` and `brotli` packages, and zlib).
+
+- Only text-like bodies (JSON, NDJSON, CSV, text/*) are compressed, and only
+  when a complete body reaches COMPRESSION_MINIMUM_SIZE. Small responses such
+  as tokens, messages and 304s go out untouched.
+- Streaming bodies (StreamingResponse, e.g. the user export) are compressed
+  chunk by chunk. Each chunk is flushed, so the client gets it straight away
+  and nothing is held back in the compressor.
+- Bodies and chunks of COMPRESSION_THREAD_MINIMUM_SIZE or more are compressed
+  in a worker thread so a 1000-user page does not stall the event loop.
+
+ETags identify resource versions (app.core.etag). A compressed body is not
+byte-identical to the identity one, so its ETag is made weak: If-None-Match
+(weak comparison) still matches it, If-Match (strong comparison) does not.
+"""
+
+import asyncio
+import zlib
+from functools import partial
+from typing import Callable, Dict, Optional
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = frozenset({"application/json", "application/x-ndjson", "text/csv"})
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        if final:
+            return out + self._compressor.flush()
+        return out + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+# Content-coding -> compressor class (called with a level), in server preference order
+CODECS = {"zstd": _Zstd, "br": _Brotli, "gzip": _Gzip}
+
+
+def available_codecs() -> Dict[str, Callable[[], object]]:
+    """Content-coding -> compressor factory at the configured level, in preference order."""
+    levels = {
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_QUALITY,
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+    }
+    return {coding: partial(codec, levels[coding]) for coding, codec in CODECS.items()}
+
+
+def negotiate_encoding(accept_encoding: str, codecs) -> Optional[str]:
+    """
+    Content-coding to use for an Accept-Encoding header, or None for identity.
+    "*" stands for every coding not listed; q=0 refuses one.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in codecs:  # preference order breaks ties
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _is_compressible(headers: Headers) -> bool:
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES or media_type.startswith("text/") or media_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with the negotiated coding."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.codecs = available_codecs()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        await _Responder(self.app, encoding, self.codecs.get(encoding))(scope, receive, send)
+
+
+class _Responder:
+    """Holds back http.response.start until the first body message decides the encoding."""
+
+    def __init__(self, app: ASGIApp, encoding: Optional[str], factory: Optional[Callable[[], object]]):
+        self.app = app
+        self.encoding = encoding
+        self.factory = factory
+        self.send: Send = None
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] == 206
+                or "content-encoding" in headers
+                or not _is_compressible(headers)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+        elif kind != "http.response.body" or self.passthrough:
+            if self.start is not None:  # e.g. pathsend: sent as is
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+        elif self.start is not None:
+            await self._first_body(message)
+        elif self.compressor is not None:
+            message["body"] = await self._compress(message.get("body", b""), not message.get("more_body", False))
+            await self.send(message)
+        else:
+            await self.send(message)
+
+    async def _first_body(self, message: Message) -> None:
+        start, self.start = self.start, None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers = MutableHeaders(raw=start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.factory is not None:
+            self.compressor = self.factory()
+            message["body"] = await self._compress(body, not more_body)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+        await self.send(start)
+        await self.send(message)
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        if len(data) >= settings.COMPRESSION_THREAD_MINIMUM_SIZE:
+            return await asyncio.to_thread(self.compressor.compress, data, final)
+        return self.compressor.compress(data, final)
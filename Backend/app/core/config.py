@@ -1,30 +1,96 @@
 # config.py
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import AsyncGenerator, Generator
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from pydantic_settings import BaseSettings
+from starlette.requests import HTTPConnection
+
+from app.core.database import create_async_db_engine, create_db_engine
 
 # ---------------------------
 # 1. Settings
 # ---------------------------
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./test.db"
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: int = 30
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_PRE_PING: bool = False        # one extra round trip per checkout; pool_recycle covers idle timeouts
+    DATABASE_CONNECT_TIMEOUT_SECONDS: int = 10
+    DATABASE_ECHO: bool = False
     REFRESH_SECRET_KEY: str = "Harmonysecretkey"
     SECRET_KEY: str = "Supersecretkey"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 3
+    LOGIN_MAX_FAILED_ATTEMPTS: int = 5
+    LOGIN_LOCKOUT_MINUTES: int = 15
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CLAIMS_CACHE_MAX_ENTRIES: int = 10000
+    REFRESH_REVOCATION_FILTER_CAPACITY: int = 100000
+    REFRESH_REVOCATION_FILTER_FP_RATE: float = 0.01
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = 1000
+    WRITE_BEHIND_MAX_ENTRIES: int = 50000
+    WRITE_BEHIND_FLUSH_INTERVAL_SECONDS: int = 5
+    USER_STATS_RECONCILE_INTERVAL_SECONDS: int = 3600
+    SEARCH_MAX_CANDIDATES: int = 1000          # fuzzy matches (best by bm25) scored per search on SQLite
+    SEARCH_MIN_SIMILARITY: float = 0.7         # share of a term's trigrams a fuzzy match must contain
+    USER_LIST_COUNT_CAP: int = 10000           # filtered listings count at most this many rows for estimated_total
+    BULK_UPDATE_CHUNK_SIZE: int = 1000         # ids per UPDATE ... WHERE id IN (...) statement and commit
+    BULK_UPDATE_MAX_IDS: int = 100000
+    JOB_HISTORY_MAX_ENTRIES: int = 100
+    BULK_IMPORT_BATCH_SIZE: int = 500          # rows hashed, checked and inserted together
+    BULK_IMPORT_HASH_WORKERS: int = 4
+    BULK_IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
+    EXPORT_YIELD_PER: int = 1000               # rows fetched per round trip by streaming exports
+    BATCH_MAX_REQUESTS: int = 20               # sub-requests per POST /batch
+    BATCH_MAX_BODY_BYTES: int = 1024 * 1024    # per sub-response; larger or streamed ones get 413
+    COMPRESSION_MINIMUM_SIZE: int = 1400       # bodies within about one TCP segment are sent uncompressed
+    COMPRESSION_THREAD_MINIMUM_SIZE: int = 64 * 1024   # larger bodies/chunks are compressed off the event loop
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"          # "memory" or "sqlite" (shared across workers)
+    RATE_LIMIT_SQLITE_PATH: str = "./ratelimit.db"
+    RATE_LIMIT_SHARDS: int = 64
+    RATE_LIMIT_AUTH_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_AUTH_IP_LIMIT: int = 30
+    RATE_LIMIT_AUTH_ACCOUNT_LIMIT: int = 10
+
+    @property
+    def database_url_async(self) -> str:
+        """DATABASE_URL with its async driver (aiosqlite / asyncpg)."""
+        url = make_url(self.DATABASE_URL)
+        backend = url.get_backend_name()
+        if backend == "sqlite":
+            url = url.set(drivername="sqlite+aiosqlite")
+        elif backend == "postgresql":
+            url = url.set(drivername="postgresql+asyncpg")
+        return url.render_as_string(hide_password=False)
 
 settings = Settings()
 
 # ---------------------------
 # 2. Database Engine & Session
 # ---------------------------
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+# Both engines come from the factory in app.core.database (pool sizing, timeouts, metrics)
+engine = create_db_engine(settings)
+# expire_on_commit=False: CRUD writes refresh objects from RETURNING (app.crud.returning)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine for request handlers; the sync engine above serves background jobs
+async_engine = create_async_db_engine(settings)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # ---------------------------
 # 3. Base Model
@@ -40,3 +106,31 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(connection: HTTPConnection) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request session for async handlers.
+
+    Routes depend on it with scope="function": the session is closed, and
+    its pool connection returned, when the handler returns rather than after
+    the response has been sent. An AsyncSession checks a connection out on
+    its first statement, so requests that never reach the database (auth
+    cache hits, validation errors) never take one. The handler's reads share
+    one transaction: one snapshot, no BEGIN / COMMIT per statement. Handlers
+    that read and then do slow work without the database (bcrypt in login and
+    password changes) commit first to end the read transaction. Pool hold
+    times are reported under "checkout_hold" by /internal/db-pool.
+
+    Sub-requests of POST /batch share the batch request's own session and
+    transaction (app.api.batch_routes), closed when the batch handler returns.
+    """
+    shared = connection.scope.get("state", {}).get("batch_db")
+    if shared is not None:
+        yield shared
+        return
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
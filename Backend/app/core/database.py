@@ -0,0 +1,229 @@
+# app/core/database.py
+"""
+Engine factory and connection-pool metrics.
+
+Every engine in the app (sync for background jobs, async for request
+handlers) is built here from the DATABASE_* settings, so pool sizing,
+recycling and timeouts are configured in one place.
+
+Queue-based pools are instrumented: time spent waiting for a connection and
+time a checked-out connection is held are recorded in fixed-bucket
+histograms, and connection open times are tracked so the age of live
+connections can be reported alongside checked-out and overflow counts.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait / hold histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class _Histogram:
+    """Fixed-bucket millisecond histogram; callers hold the metrics lock."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        index = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if ms <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def summary(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class PoolMetrics:
+    """Thread-safe checkout wait / hold histograms and connection lifetime tracking for one pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self._wait = _Histogram()
+        self._hold = _Histogram()
+        self._timeouts = 0
+        self._opened_at: Dict[int, float] = {}
+        self._checked_out_at: Dict[int, float] = {}
+        self.opened = 0
+        self.closed = 0
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._wait.observe(wait_ms)
+            if timed_out:
+                self._timeouts += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self._checked_out_at[id(connection_record)] = time.perf_counter()
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            checked_out_at = self._checked_out_at.pop(id(connection_record), None)
+            if checked_out_at is not None:
+                self._hold.observe((now - checked_out_at) * 1000)
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._opened_at[id(connection_record)] = time.monotonic()
+            self.opened += 1
+
+    def on_close(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            if self._opened_at.pop(id(connection_record), None) is not None:
+                self.closed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            ages = sorted(now - opened for opened in self._opened_at.values())
+            wait = {"timeouts": self._timeouts, **self._wait.summary()}
+            hold = self._hold.summary()
+            opened, closed = self.opened, self.closed
+
+        pool = self.pool
+        stats: Dict[str, Any] = {"pool_class": type(pool).__name__ if pool else None}
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        stats.update({
+            "connections_opened": opened,
+            "connections_closed": closed,
+            "connection_age_seconds": _age_summary(ages),
+            "checkout_wait": wait,
+            "checkout_hold": hold,
+        })
+        return stats
+
+
+def _age_summary(ages: List[float]) -> Dict[str, Any]:
+    if not ages:
+        return {"count": 0, "min": None, "avg": None, "max": None}
+    return {
+        "count": len(ages),
+        "min": round(ages[0], 1),
+        "avg": round(sum(ages) / len(ages), 1),
+        "max": round(ages[-1], 1),
+    }
+
+
+def _instrumented_pool_class(base, metrics: PoolMetrics):
+    """Subclass a queue pool so every checkout records its wait time in metrics."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.observe_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting on the live one
+        pool = base.recreate(self)
+        metrics.pool = pool
+        return pool
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get, "recreate": recreate})
+
+
+def engine_options(settings, url: str, pool_class) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine from settings."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options: Dict[str, Any] = {
+        "echo": settings.DATABASE_ECHO,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+
+    connect_args: Dict[str, Any] = {}
+    if backend == "sqlite":
+        connect_args["check_same_thread"] = False
+        connect_args["timeout"] = settings.DATABASE_CONNECT_TIMEOUT_SECONDS
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory SQLite keeps its single-connection pool
+            options["connect_args"] = connect_args
+            return options
+    elif parsed.drivername == "postgresql+asyncpg":
+        connect_args["timeout"] = settings.DATABASE_CONNECT_TIMEOUT_SECONDS
+    elif backend == "postgresql":
+        connect_args["connect_timeout"] = settings.DATABASE_CONNECT_TIMEOUT_SECONDS
+
+    options.update({
+        "connect_args": connect_args,
+        "poolclass": pool_class,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    })
+    return options
+
+
+def _attach_metrics(engine: Engine, metrics: PoolMetrics) -> None:
+    metrics.pool = engine.pool
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "close", metrics.on_close)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+
+
+def create_db_engine(settings, url: Optional[str] = None) -> Engine:
+    """Build the sync engine (background jobs, scripts)."""
+    url = url or settings.DATABASE_URL
+    metrics = pool_metrics.setdefault("sync", PoolMetrics("sync"))
+    engine = create_engine(url, **engine_options(settings, url, _instrumented_pool_class(QueuePool, metrics)))
+    _attach_metrics(engine, metrics)
+    return engine
+
+
+def create_async_db_engine(settings, url: Optional[str] = None) -> AsyncEngine:
+    """Build the async engine (request handlers)."""
+    url = url or settings.database_url_async
+    metrics = pool_metrics.setdefault("async", PoolMetrics("async"))
+    engine = create_async_engine(
+        url, **engine_options(settings, url, _instrumented_pool_class(AsyncAdaptedQueuePool, metrics))
+    )
+    _attach_metrics(engine.sync_engine, metrics)
+    return engine
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Live statistics for every engine built by this module."""
+    return {name: metrics.stats() for name, metrics in pool_metrics.items()}
+
+
+# Metrics per engine, keyed "sync" / "async"
+pool_metrics: Dict[str, PoolMetrics] = {}
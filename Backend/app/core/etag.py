@@ -0,0 +1,89 @@
+# app/core/etag.py
+"""
+Entity tags and conditional requests for versioned resources.
+
+A versioned row (e.g. UserProfile.version, bumped by every write) is served
+with the strong ETag "<version>"; a resource made of several rows joins
+their versions ("<v1>-<v2>"), a timestamp column counting as its
+microseconds. Clients send the ETag back
+
+- in If-Match to make a write conditional: the write only applies if the
+  row is still at that version, otherwise it fails with 412 instead of
+  overwriting a concurrent change;
+- in If-None-Match (or Last-Modified in If-Modified-Since) to revalidate a
+  cached GET, answered with 304 and no body when nothing changed.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional
+
+# Authenticated per-user resources: browsers may cache them but must revalidate
+REVALIDATE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def _utc(moment: datetime) -> datetime:
+    """Naive datetimes are stored UTC."""
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+def timestamp_version(moment: Optional[datetime]) -> int:
+    """A timestamp column as a version number (microseconds since the epoch, 0 for NULL)."""
+    if moment is None:
+        return 0
+    delta = _utc(moment) - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def version_etag(*versions: int) -> str:
+    """Strong ETag for a row version, or the versions of several rows."""
+    return '"' + "-".join(str(version) for version in versions) + '"'
+
+
+def if_match_versions(header: Optional[str]) -> Optional[List[int]]:
+    """
+    Row versions an If-Match header accepts, or None when the header is
+    absent or "*" (any version). If-Match uses strong comparison, so weak
+    (W/) and foreign tags never match; a header with none of ours yields [].
+    """
+    if header is None:
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return None
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """ETag / Last-Modified / caching headers for a conditional GET response."""
+    headers = {"ETag": etag, **REVALIDATE_HEADERS}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified).astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Whether a GET can be answered with 304 (RFC 9110 section 13.2.2).
+    If-None-Match (weak comparison) takes precedence; If-Modified-Since is
+    only consulted without it, at the one-second resolution of HTTP dates.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _utc(last_modified).replace(microsecond=0) <= since
@@ -25,6 +25,10 @@ class DatabaseIntegrityError(DatabaseError):
     """Raised when data integrity issues occur (e.g., foreign key violations)."""
     pass
 
+class DatabaseStaleVersionError(DatabaseError):
+    """Raised when a conditional write finds the row at a different version."""
+    pass
+
 # ---------------------------
 # Service (Business logic)
 # ---------------------------
@@ -53,10 +57,26 @@ class ValidationError(BusinessError):
     """Raised when business rule validation fails (e.g., invalid input)."""
     pass
 
+class PreconditionFailedError(BusinessError):
+    """Raised when a conditional request's precondition (If-Match) does not hold."""
+    pass
+
 class UnauthorizedError(BusinessError):
     """Raised when authentication fails."""
     pass
 
+class ServiceUnavailableError(BusinessError):
+    """Raised when a bounded resource is saturated and the caller should retry later."""
+    def __init__(self, message: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class RateLimitExceededError(BusinessError):
+    """Raised when a client exceeds a rate limit."""
+    def __init__(self, message: str = "Too many requests", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 # ---------------------------
 # FastAPI Exception Handlers
@@ -84,6 +104,13 @@ def register_exception_handlers(app):
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(PreconditionFailedError)
+    async def precondition_failed_handler(request: Request, exc: PreconditionFailedError):
+        return JSONResponse(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            content={"detail": str(exc)},
+        )
+
     @app.exception_handler(UnauthorizedError)
     async def unauthorized_handler(request: Request, exc: UnauthorizedError):
         return JSONResponse(
@@ -98,6 +125,22 @@ def register_exception_handlers(app):
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(RateLimitExceededError)
+    async def rate_limit_handler(request: Request, exc: RateLimitExceededError):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(ServiceUnavailableError)
+    async def service_unavailable_handler(request: Request, exc: ServiceUnavailableError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.exception_handler(ServiceError)
     async def service_error_handler(request: Request, exc: ServiceError):
         logger.error(f"Service error: {exc}", exc_info=exc)
@@ -0,0 +1,130 @@
+# app/core/hashing.py
+"""
+Bounded, off-event-loop password hashing.
+
+bcrypt is deliberately slow (hundreds of ms per call). Running it inline in an
+`async def` route stalls every other request on the worker, so hashing and
+verification are pushed to a dedicated thread pool (bcrypt releases the GIL).
+The number of in-flight + queued jobs is capped; once saturated, new jobs are
+rejected immediately with ServiceUnavailableError (mapped to 503 +
+Retry-After) instead of piling up behind a login burst.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    """Plain synchronous bcrypt hash, for callers that run their own pool (bulk import)."""
+    return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """Runs bcrypt hash/verify on a bounded thread pool and records latency."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 64,
+        retry_after_seconds: int = 1,
+        latency_window: int = 1024,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._waits = deque(maxlen=latency_window)
+        self.completed = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        """Hash password off the event loop."""
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, password_hash: str) -> bool:
+        """Verify password against hash off the event loop."""
+        return await self._submit(pwd_context.verify, plain_password, password_hash)
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailableError(
+                    "Authentication is busy, please retry shortly",
+                    retry_after=self.retry_after_seconds,
+                )
+            self._pending += 1
+
+        future = self._executor.submit(self._timed, fn, time.perf_counter(), args)
+        # Released when the job finishes or is dropped from the queue, not when the
+        # caller stops waiting: a cancelled request leaves bcrypt running in the pool
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _timed(self, fn: Callable[..., Any], enqueued_at: float, args: tuple) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._waits.append(started_at - enqueued_at)
+                self._latencies.append(finished_at - started_at)
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and hash latency (milliseconds)."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = sorted(self._waits)
+            pending = self._pending
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(pending, self.workers),
+            "queue_depth": max(0, pending - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "hash_latency_ms": _percentiles(latencies),
+            "queue_wait_ms": _percentiles(waits),
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running jobs."""
+        self._executor.shutdown(wait=True)
+
+
+def _percentiles(samples: list) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+
+    def pick(q: float) -> float:
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+
+    return {"p50": pick(0.50), "p99": pick(0.99), "max": round(samples[-1] * 1000, 2)}
+
+
+# Global hasher instance
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    retry_after_seconds=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
@@ -0,0 +1,111 @@
+# app/core/jobs.py
+"""
+In-process registry of background jobs with pollable progress.
+
+Long admin operations (bulk updates) return a job id straight away; the work
+runs in a worker thread (sync DB session, like the periodic jobs in
+app.core.background) and updates its Job as each chunk commits. The registry
+keeps the most recent max_jobs jobs; older finished ones are forgotten.
+
+Jobs are per-process: poll the worker that accepted the request.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Optional, Set
+from uuid import UUID
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """Progress of one background job; mutated only by its worker thread."""
+
+    __slots__ = (
+        "id", "kind", "status", "total", "processed", "affected", "failed",
+        "error", "report_path", "created_at", "finished_at",
+    )
+
+    def __init__(self, kind: str, total: int):
+        self.id = uuid.uuid4()
+        self.kind = kind
+        self.status = "pending"          # pending -> running -> completed | failed
+        self.total = total
+        self.processed = 0
+        self.affected = 0
+        self.failed = 0
+        self.error: Optional[str] = None
+        self.report_path: Optional[str] = None      # per-item error report file, if the job writes one
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def __repr__(self) -> str:
+        return f"Job(id={self.id}, kind={self.kind}, status={self.status}, {self.processed}/{self.total})"
+
+
+class JobRegistry:
+    """Bounded, thread-safe map of job id -> Job, plus the tasks running them."""
+
+    def __init__(self, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[UUID, Job]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def get(self, job_id: UUID) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, kind: str, total: int, fn: Callable[[Job], None]) -> Job:
+        """Register a job and run fn(job) in a worker thread; returns immediately."""
+        job = Job(kind, total)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        task = asyncio.create_task(self._run(job, fn), name=f"job-{kind}-{job.id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, fn: Callable[[Job], None]) -> None:
+        job.status = "running"
+        try:
+            await asyncio.to_thread(fn, job)
+            job.status = "completed"
+        except Exception as e:
+            logger.exception("Job %s failed: %s", job, e)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def _evict(self) -> None:
+        # Forget the oldest finished jobs beyond max_jobs (running jobs are kept)
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [job.id for job in self._jobs.values() if job.done][:max(0, excess)]:
+            job = self._jobs.pop(job_id)
+            if job.report_path:
+                try:
+                    os.unlink(job.report_path)
+                except OSError:
+                    pass
+
+    async def wait_all(self) -> None:
+        """Wait for running jobs to finish (called at shutdown)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# Global registry instance
+job_registry = JobRegistry(max_jobs=settings.JOB_HISTORY_MAX_ENTRIES)
@@ -0,0 +1,47 @@
+# app/core/pagination.py
+"""
+Opaque keyset cursors.
+
+A cursor encodes the sort key of the last row on a page, e.g.
+(created_at, id), as URL-safe base64 JSON. Clients pass it back unchanged;
+the next page starts strictly after that key, so every page is an index
+range scan regardless of depth.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode a (created_at, id) position as an opaque cursor string."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": id.hex}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_id_cursor(id: UUID) -> str:
+    """Encode an id-only position (listings ordered by id) as an opaque cursor string."""
+    payload = json.dumps({"i": id.hex}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_id_cursor(cursor: str) -> UUID:
+    """Decode a cursor produced by encode_id_cursor; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return UUID(json.loads(base64.urlsafe_b64decode(padded.encode()))["i"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,299 @@
+# app/core/rate_limit.py
+"""
+Rate limiting for authentication endpoints.
+
+Algorithms (O(1) per check, constant state per key):
+- SlidingWindowCounter: weighted previous + current fixed-window counts.
+- TokenBucket: continuous refill at limit/window tokens per second.
+
+Backends:
+- MemoryBackend: per-process, sharded dicts each guarded by its own lock.
+- SQLiteBackend: a small SQLite file shared by every uvicorn worker on a host.
+
+Expired keys are removed by a background sweeper that visits one shard (or
+one batch of rows) per tick, so the request path never scans all keys.
+
+A SQLite hit may wait for another worker's write lock, so checks never run
+on the event loop: sync dependencies run in FastAPI's threadpool, and async
+route / service code uses RateLimiter.enforce_async.
+"""
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError
+
+# State is always a 3-tuple of floats so every backend can store it the same way
+State = Tuple[float, float, float]
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+# -----------------------------
+# Algorithms
+# -----------------------------
+
+class SlidingWindowCounter:
+    """Sliding-window counter: state = (window_start, previous_count, current_count)."""
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.window = float(window_seconds)
+
+    def step(self, state: Optional[State], now: float) -> Tuple[RateLimitResult, State, float]:
+        window_start = math.floor(now / self.window) * self.window
+        if state is None:
+            previous, current = 0.0, 0.0
+        else:
+            last_start, previous, current = state
+            if window_start - last_start >= 2 * self.window:
+                previous, current = 0.0, 0.0
+            elif window_start > last_start:
+                previous, current = current, 0.0
+
+        weight = 1.0 - (now - window_start) / self.window
+        estimated = previous * weight + current
+        expires_at = window_start + 2 * self.window
+
+        if estimated + 1 > self.limit:
+            if current + 1 > self.limit or previous <= 0:
+                retry_after = window_start + self.window - now
+            else:
+                # Time until the weighted previous window has decayed enough
+                needed_weight = (self.limit - current - 1) / previous
+                retry_after = window_start + self.window * (1.0 - needed_weight) - now
+            result = RateLimitResult(False, 0, max(retry_after, 0.0))
+            return result, (window_start, previous, current), expires_at
+
+        current += 1
+        remaining = max(0, int(self.limit - (previous * weight + current)))
+        return RateLimitResult(True, remaining, 0.0), (window_start, previous, current), expires_at
+
+
+class TokenBucket:
+    """Token bucket: state = (tokens, last_refill, 0). Refills limit tokens per window."""
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.capacity = float(limit)
+        self.rate = limit / float(window_seconds)
+
+    def step(self, state: Optional[State], now: float) -> Tuple[RateLimitResult, State, float]:
+        if state is None:
+            tokens = self.capacity
+        else:
+            tokens, last_refill, _ = state
+            tokens = min(self.capacity, tokens + (now - last_refill) * self.rate)
+
+        if tokens < 1.0:
+            retry_after = (1.0 - tokens) / self.rate
+            expires_at = now + (self.capacity - tokens) / self.rate
+            return RateLimitResult(False, 0, retry_after), (tokens, now, 0.0), expires_at
+
+        tokens -= 1.0
+        # Once the bucket has refilled completely the key is indistinguishable from a new one
+        expires_at = now + (self.capacity - tokens) / self.rate
+        return RateLimitResult(True, int(tokens), 0.0), (tokens, now, 0.0), expires_at
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+
+class MemoryBackend:
+    """In-process store sharded by key hash; each shard has its own lock."""
+
+    def __init__(self, shards: int = 64):
+        self.shards = shards
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._data: List[Dict[str, Tuple[State, float]]] = [{} for _ in range(shards)]
+        self._sweep_cursor = 0
+
+    def hit(self, key: str, algorithm, now: float) -> RateLimitResult:
+        index = hash(key) % self.shards
+        with self._locks[index]:
+            shard = self._data[index]
+            entry = shard.get(key)
+            state = entry[0] if entry is not None and entry[1] > now else None
+            result, new_state, expires_at = algorithm.step(state, now)
+            shard[key] = (new_state, expires_at)
+        return result
+
+    def sweep(self, now: float) -> int:
+        """Remove expired keys from the next shard. Returns the number removed."""
+        index = self._sweep_cursor
+        self._sweep_cursor = (index + 1) % self.shards
+        with self._locks[index]:
+            shard = self._data[index]
+            expired = [key for key, (_, expires_at) in shard.items() if expires_at <= now]
+            for key in expired:
+                del shard[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        for lock, shard in zip(self._locks, self._data):
+            with lock:
+                shard.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._data)
+
+
+class SQLiteBackend:
+    """SQLite-backed store shared across worker processes on the same host."""
+
+    def __init__(self, path: str, sweep_batch: int = 1000):
+        self.path = path
+        self.sweep_batch = sweep_batch
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY, a REAL NOT NULL, b REAL NOT NULL, c REAL NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, algorithm, now: float) -> RateLimitResult:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT a, b, c, expires_at FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            state = (row[0], row[1], row[2]) if row is not None and row[3] > now else None
+            result, new_state, expires_at = algorithm.step(state, now)
+            conn.execute(
+                "INSERT INTO rate_limits (key, a, b, c, expires_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET a = excluded.a, b = excluded.b, "
+                "c = excluded.c, expires_at = excluded.expires_at",
+                (key, *new_state, expires_at),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def sweep(self, now: float) -> int:
+        """Delete one batch of expired rows. Returns the number removed."""
+        cursor = self._connection().execute(
+            "DELETE FROM rate_limits WHERE key IN "
+            "(SELECT key FROM rate_limits WHERE expires_at <= ? LIMIT ?)",
+            (now, self.sweep_batch),
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM rate_limits")
+
+
+# -----------------------------
+# Limiter
+# -----------------------------
+
+class RateLimiter:
+    """A named limit (algorithm + parameters) applied to keys in a backend."""
+
+    def __init__(self, name: str, algorithm, backend):
+        self.name = name
+        self.algorithm = algorithm
+        self.backend = backend
+
+    def hit(self, key: str) -> RateLimitResult:
+        """Count one request for key and report whether it is allowed."""
+        return self.backend.hit(f"{self.name}:{key}", self.algorithm, time.time())
+
+    def enforce(self, key: str) -> RateLimitResult:
+        """Count one request for key, raising RateLimitExceededError if over the limit."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return RateLimitResult(True, self.algorithm.limit, 0.0)
+        result = self.hit(key)
+        if not result.allowed:
+            raise RateLimitExceededError(
+                "Too many requests. Try again later.",
+                retry_after=max(1, math.ceil(result.retry_after)),
+            )
+        return result
+
+    async def enforce_async(self, key: str) -> RateLimitResult:
+        """
+        enforce() for async code: runs in a worker thread, because the SQLite
+        backend can wait up to its busy timeout for another worker's lock.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return RateLimitResult(True, self.algorithm.limit, 0.0)
+        return await asyncio.to_thread(self.enforce, key)
+
+
+class ExpirySweeper:
+    """Background thread that amortizes key expiry across backend shards/batches."""
+
+    def __init__(self, backend, interval_seconds: float = 1.0):
+        self.backend = backend
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rate-limit-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds * 2)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.backend.sweep(time.time())
+
+
+def create_backend():
+    """Build the backend selected by RATE_LIMIT_BACKEND ("memory" or "sqlite")."""
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBackend(settings.RATE_LIMIT_SQLITE_PATH)
+    return MemoryBackend(shards=settings.RATE_LIMIT_SHARDS)
+
+
+# Global backend, sweeper and auth limiters
+rate_limit_backend = create_backend()
+rate_limit_sweeper = ExpirySweeper(rate_limit_backend)
+
+# Per client IP: burst-tolerant token bucket
+auth_ip_limiter = RateLimiter(
+    "auth-ip",
+    TokenBucket(settings.RATE_LIMIT_AUTH_IP_LIMIT, settings.RATE_LIMIT_AUTH_WINDOW_SECONDS),
+    rate_limit_backend,
+)
+# Per account: strict sliding window against credential stuffing
+auth_account_limiter = RateLimiter(
+    "auth-account",
+    SlidingWindowCounter(settings.RATE_LIMIT_AUTH_ACCOUNT_LIMIT, settings.RATE_LIMIT_AUTH_WINDOW_SECONDS),
+    rate_limit_backend,
+)
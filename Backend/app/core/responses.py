@@ -0,0 +1,46 @@
+# app/core/responses.py
+"""
+JSON responses for models the service layer has already validated.
+
+When a route returns a model, FastAPI validates it against the route's
+response_model a second time (from_attributes, field by field for every list
+item) before serializing it. Services build UserOut / ProfileOut / page
+models from ORM rows themselves, so the user, profile and list routes return
+one of these responses instead: the model is dumped straight to JSON bytes
+by its compiled pydantic-core serializer, and FastAPI passes a returned
+Response through untouched. response_model stays on the route for the
+OpenAPI schema.
+
+Headers set on an injected `response: Response` are not copied onto a
+returned Response, so routes pass theirs (ETag, ...) here.
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def model_response(
+    model: BaseModel,
+    headers: Optional[Mapping[str, str]] = None,
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """A validated model serialized as the JSON body, without re-validation."""
+    return Response(
+        model.__pydantic_serializer__.to_json(model),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+def list_response(
+    adapter: TypeAdapter,
+    items: Any,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """A list of validated models serialized with a precompiled adapter (see user_schema)."""
+    return Response(adapter.dump_json(items), headers=headers, media_type=JSON_MEDIA_TYPE)
@@ -0,0 +1,71 @@
+# app/core/revocation.py
+"""
+In-memory Bloom filter of revoked refresh-token ids.
+
+A negative answer ("definitely not revoked") lets the refresh path skip the
+revocation lookup. A positive answer may be a false positive and must be
+confirmed against the refresh_tokens table. Bloom filters cannot delete, so
+the filter is rebuilt from the table after expired rows are purged.
+
+The filter is per-process; the conditional rotation UPDATE in token_crud
+remains the source of truth across workers.
+"""
+
+import hashlib
+import math
+import threading
+from typing import Iterable
+from uuid import UUID
+
+from app.core.config import settings
+
+
+class RevocationFilter:
+    """Fixed-size Bloom filter keyed by token id (UUID)."""
+
+    def __init__(self, capacity: int = 100000, false_positive_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.false_positive_rate = false_positive_rate
+        self.size_bits = max(8, int(-self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, token_id: UUID):
+        # Double hashing: h1 + i*h2 over one 128-bit digest
+        digest = hashlib.blake2b(token_id.bytes, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, token_id: UUID) -> None:
+        with self._lock:
+            bits = self._bits
+            for position in self._positions(token_id):
+                bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def add_many(self, token_ids: Iterable[UUID]) -> None:
+        for token_id in token_ids:
+            self.add(token_id)
+
+    def might_contain(self, token_id: UUID) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(token_id))
+
+    def rebuild(self, token_ids: Iterable[UUID]) -> None:
+        """Replace the contents with token_ids (used after purging expired rows)."""
+        fresh = RevocationFilter(self.capacity, self.false_positive_rate)
+        fresh.add_many(token_ids)
+        with self._lock:
+            self._bits = fresh._bits
+            self.count = fresh.count
+
+
+# Global filter instance
+revocation_filter = RevocationFilter(
+    capacity=settings.REFRESH_REVOCATION_FILTER_CAPACITY,
+    false_positive_rate=settings.REFRESH_REVOCATION_FILTER_FP_RATE,
+)
@@ -0,0 +1,140 @@
+# app/core/tokens.py
+"""
+JWT signing and verification (PyJWT only).
+
+TokenCodec binds one key and algorithm at construction. The access-token
+codec also keeps a bounded LRU of verified claims keyed by a SHA-256 digest of
+the raw token; entries expire at the token's own `exp`. A bearer token that
+was already verified is answered from the cache without re-running the HMAC
+check or JSON parsing.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+
+from app.core.config import settings
+
+__all__ = [
+    "TokenCodec",
+    "VerifiedClaimsCache",
+    "ExpiredSignatureError",
+    "InvalidTokenError",
+    "access_token_codec",
+    "refresh_token_codec",
+]
+
+
+class VerifiedClaimsCache:
+    """Thread-safe LRU of verified claims keyed by token digest, expiring at `exp`."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return claims
+
+    def put(self, digest: bytes, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (claims, float(exp))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenCodec:
+    """Signs and verifies JWTs with a pre-bound key and algorithm."""
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        default_expires: timedelta,
+        token_type: Optional[str] = None,
+        cache: Optional[VerifiedClaimsCache] = None,
+    ):
+        self._key = secret_key
+        self._algorithm = algorithm
+        self._algorithms = [algorithm]
+        self._jwt = jwt.PyJWT()
+        self.default_expires = default_expires
+        self.token_type = token_type
+        self.cache = cache
+
+    def encode(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+        """Sign claims, adding exp/iat (and type, if the codec has one)."""
+        now = datetime.now(timezone.utc)
+        to_encode = data.copy()
+        # Sub-second "iat" so revocation by password_changed_at is exact
+        to_encode.update({"exp": now + (expires_delta or self.default_expires), "iat": now.timestamp()})
+        if self.token_type:
+            to_encode["type"] = self.token_type
+        return self._jwt.encode(to_encode, self._key, algorithm=self._algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify and decode a token.
+        The returned claims may be shared with other callers; do not mutate them.
+        Raises: ExpiredSignatureError, InvalidTokenError
+        """
+        if self.cache is None:
+            return self._verify(token)
+
+        digest = self.cache.digest(token)
+        claims = self.cache.get(digest)
+        if claims is None:
+            claims = self._verify(token)
+            self.cache.put(digest, claims)
+        return claims
+
+    def _verify(self, token: str) -> Dict[str, Any]:
+        claims = self._jwt.decode(token, self._key, algorithms=self._algorithms)
+        if self.token_type and claims.get("type") != self.token_type:
+            raise InvalidTokenError("Unexpected token type")
+        return claims
+
+
+# Global codecs
+access_token_codec = TokenCodec(
+    settings.SECRET_KEY,
+    settings.ALGORITHM,
+    default_expires=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    cache=VerifiedClaimsCache(max_entries=settings.TOKEN_CLAIMS_CACHE_MAX_ENTRIES),
+)
+refresh_token_codec = TokenCodec(
+    settings.REFRESH_SECRET_KEY,
+    settings.ALGORITHM,
+    default_expires=timedelta(days=7),
+    token_type="refresh",
+)
@@ -0,0 +1,147 @@
+# app/core/write_behind.py
+"""
+Write-behind buffer for hot "touch" timestamp columns.
+
+Columns such as users.last_login_at change on every event but are only ever
+read as "latest value". Instead of one commit per event, touches are
+coalesced per row in memory (keeping the newest value per column) and flushed
+periodically as one executemany UPDATE per column set.
+
+A touch is not a modification of the row: columns with an onupdate default
+(users.updated_at, which the /me ETag and Last-Modified derive from) keep
+their value on flush unless they are themselves touched.
+
+Memory is bounded by max_entries rows; touches for new rows beyond that are
+dropped (and counted) until the next flush. Pending touches are lost only if
+the process dies without a clean shutdown — acceptable for these columns.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+
+from sqlalchemy import Table, bindparam, case, or_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import SessionLocal, settings
+from app.models.user_models import User
+
+logger = logging.getLogger(__name__)
+
+
+class TouchBuffer:
+    """Coalesces per-row timestamp updates and flushes them in batches."""
+
+    def __init__(
+        self,
+        table: Table,
+        columns: FrozenSet[str],
+        session_factory: Callable[[], Session],
+        max_entries: int = 10000,
+    ):
+        self.table = table
+        self.columns = columns
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self._pending: Dict[Any, Dict[str, datetime]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.flushed = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    def touch(self, row_id: Any, **values: datetime) -> bool:
+        """Record newer timestamps for row_id. Returns False if dropped (buffer full)."""
+        unknown = set(values) - self.columns
+        if unknown:
+            raise ValueError(f"Columns not managed by write-behind buffer: {unknown}")
+        with self._lock:
+            return self._merge(row_id, values)
+
+    def _merge(self, row_id: Any, values: Dict[str, datetime]) -> bool:
+        entry = self._pending.get(row_id)
+        if entry is None:
+            if len(self._pending) >= self.max_entries:
+                self.dropped += 1
+                return False
+            self._pending[row_id] = dict(values)
+            return True
+        for column, value in values.items():
+            current = entry.get(column)
+            if current is None or value > current:
+                entry[column] = value
+        return True
+
+    def flush(self) -> int:
+        """Write all pending touches. Returns the number of rows updated."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            # One executemany per distinct column set
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for row_id, values in pending.items():
+                key = tuple(sorted(values))
+                params = {f"b_{column}": value for column, value in values.items()}
+                params["b_id"] = row_id
+                groups.setdefault(key, []).append(params)
+
+            db = self.session_factory()
+            try:
+                for columns, rows in groups.items():
+                    values = {column: self._forward_only(column) for column in columns}
+                    # Explicit values suppress onupdate defaults
+                    values.update({
+                        column.name: column
+                        for column in self.table.c
+                        if column.onupdate is not None and column.name not in values
+                    })
+                    stmt = update(self.table).where(self.table.c.id == bindparam("b_id")).values(values)
+                    db.execute(stmt, rows)
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                self.failed_flushes += 1
+                logger.error("Write-behind flush failed, re-queueing %d rows: %s", len(pending), e)
+                with self._lock:
+                    for row_id, values in pending.items():
+                        self._merge(row_id, values)
+                return 0
+            finally:
+                db.close()
+
+            self.flushes += 1
+            self.flushed += len(pending)
+            return len(pending)
+
+    def _forward_only(self, column: str):
+        """Never move a timestamp backwards (a direct write may have landed since the touch)."""
+        current = self.table.c[column]
+        value = bindparam(f"b_{column}", type_=current.type)
+        return case((or_(current.is_(None), current < value), value), else_=current)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "max_entries": self.max_entries,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+# Global buffer for users touch columns
+user_touch_buffer = TouchBuffer(
+    User.__table__,
+    frozenset({"last_login_at", "updated_at"}),
+    SessionLocal,
+    max_entries=settings.WRITE_BEHIND_MAX_ENTRIES,
+)
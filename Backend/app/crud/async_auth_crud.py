@@ -0,0 +1,104 @@
+# app/crud/async_auth_crud.py
+"""Async (AsyncSession) counterparts of app.crud.auth_crud, used by request handlers."""
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, func, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.exceptions import (
+    DatabaseError,
+    DatabaseConflictError,
+    DatabaseNotFoundError,
+)
+from app.models.user_models import User
+from app.core.write_behind import user_touch_buffer
+from app.crud.returning import async_update_returning
+
+# -----------------------------
+# Auth CRUD Operations
+# -----------------------------
+
+
+async def update_last_login(db: AsyncSession, db_user: User) -> User:
+    """
+    Update user's last login timestamp via the write-behind buffer.
+    The value is visible on db_user immediately and persisted on the next flush.
+    """
+    if not db_user:
+        raise DatabaseNotFoundError("User not found")
+
+    now = datetime.now(timezone.utc)
+    user_touch_buffer.touch(db_user.id, last_login_at=now)
+    # Reflect the new value without marking the instance dirty
+    set_committed_value(db_user, "last_login_at", now)
+    return db_user
+
+
+async def update_password_changed_at(db: AsyncSession, db_user: User) -> User:
+    """Update user's password changed timestamp."""
+    if not db_user:
+        raise DatabaseNotFoundError("User not found")
+
+    values = {"password_changed_at": datetime.now(timezone.utc)}
+    return await async_update_returning(db, db_user, values, "updating password timestamp")
+
+
+async def record_login_outcome(
+    db: AsyncSession,
+    user_id: UUID,
+    success: bool,
+    max_failed_attempts: int = 5,
+    lockout_minutes: int = 15,
+) -> Row:
+    """
+    Record a login attempt as a single atomic UPDATE ... RETURNING.
+    See auth_crud.record_login_outcome.
+    """
+    now = datetime.now(timezone.utc)
+
+    if success:
+        values = {
+            "failed_login_attempts": 0,
+            "lockout_until": None,
+            "last_login_at": now,
+        }
+    else:
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        values = {
+            "failed_login_attempts": attempts,
+            "lockout_until": case(
+                (attempts >= max_failed_attempts, now + timedelta(minutes=lockout_minutes)),
+                else_=User.lockout_until,
+            ),
+        }
+
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(**values)
+        .returning(
+            User.failed_login_attempts,
+            User.lockout_until,
+            User.last_login_at,
+            User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    try:
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            await db.rollback()
+            raise DatabaseNotFoundError("User not found")
+        await db.commit()
+        return row
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError("Conflict occurred while recording login outcome") from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError("Unexpected database error while recording login outcome") from e
@@ -0,0 +1,35 @@
+# app/crud/async_cohort_crud.py
+"""Async (AsyncSession) counterparts of app.crud.cohort_crud, used by request handlers."""
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_models import HEALTH_TERM_KINDS, UserProfile
+from app.crud.cohort_crud import Requirement, cohort_statement, facet_statement
+
+
+async def find_cohort(
+    db: AsyncSession,
+    requirements: List[Requirement],
+    limit: int = 50,
+    after: Optional[UUID] = None,
+    include_hidden: bool = False,
+) -> List[UserProfile]:
+    """Return up to `limit` profiles holding every requirement (see cohort_crud.find_cohort)."""
+    if not requirements:
+        return []
+    return list(await db.scalars(cohort_statement(requirements, limit, after, include_hidden)))
+
+
+async def facet_counts(
+    db: AsyncSession,
+    kind: str,
+    requirements: Optional[List[Requirement]] = None,
+    limit: int = 50,
+    include_hidden: bool = False,
+) -> Dict[str, int]:
+    """Per-term profile counts for `kind` within the cohort (see cohort_crud.facet_counts)."""
+    if kind not in HEALTH_TERM_KINDS:
+        raise ValueError(f"Unknown facet kind: {kind}")
+    return dict((await db.execute(facet_statement(kind, requirements, limit, include_hidden))).all())
@@ -0,0 +1,141 @@
+# app/crud/async_profile_crud.py
+"""Async (AsyncSession) counterparts of app.crud.profile_crud, used by request handlers."""
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import (
+    DatabaseError,
+    DatabaseConflictError,
+)
+from app.models.user_models import UserProfile
+from app.crud.profile_crud import (
+    patch_profile_statement,
+    patch_values,
+    profile_validators_statement,
+    raise_patch_failure,
+    version_conditions,
+)
+from app.crud.returning import async_insert_returning, async_update_returning, column_values
+
+# -----------------------------
+# Profile CRUD Operations
+# -----------------------------
+
+
+async def get_profile_by_user_id(db: AsyncSession, user_id: UUID) -> Optional[UserProfile]:
+    """Retrieve profile by user ID."""
+    return await db.scalar(select(UserProfile).where(UserProfile.id == user_id).limit(1))
+
+
+async def get_profile_validators(db: AsyncSession, user_id: UUID):
+    """(version, last_updated_at) of a profile, or None if there is no profile."""
+    return (await db.execute(profile_validators_statement(user_id))).one_or_none()
+
+
+async def create_profile(db: AsyncSession, user_id: UUID, profile_create) -> UserProfile:
+    """
+    Create a new user profile.
+    profile_create: Pydantic schema (ProfileCreate).
+    Maps schema fields to ORM and returns the ORM instance.
+    """
+    db_profile = UserProfile(
+        id=user_id, **profile_create.model_dump(exclude_unset=True)
+    )
+    return await async_insert_returning(db, db_profile, "creating profile")
+
+
+async def update_profile(
+    db: AsyncSession, db_profile: UserProfile, profile_update, expected_versions: Optional[List[int]] = None
+) -> UserProfile:
+    """
+    Update profile fields from schema with one UPDATE ... RETURNING.
+    profile_update: Pydantic schema (ProfileUpdate).
+    """
+    update_data = column_values(db_profile, profile_update.model_dump(exclude_unset=True))
+    update_data["version"] = UserProfile.version + 1
+    return await async_update_returning(
+        db, db_profile, update_data, "updating profile", version_conditions(expected_versions)
+    )
+
+
+async def update_profile_privacy(
+    db: AsyncSession,
+    db_profile: UserProfile,
+    privacy_settings: Dict[str, bool],
+    expected_versions: Optional[List[int]] = None,
+) -> UserProfile:
+    """Update profile privacy settings."""
+    return await async_update_returning(
+        db, db_profile, {"privacy_settings": privacy_settings, "version": UserProfile.version + 1},
+        "updating profile privacy", version_conditions(expected_versions)
+    )
+
+
+async def delete_profile(db: AsyncSession, db_profile: UserProfile, hard_delete: bool = False) -> bool:
+    """
+    Delete profile (hard or soft).
+    - Hard delete: removes the row.
+    - Soft delete: anonymizes/clears PII while keeping the row (one UPDATE).
+    """
+    if not hard_delete:
+        # Soft delete: anonymize PII fields
+        pii_fields = [
+            "full_name",
+            "date_of_birth",
+            "gender",
+            "location",
+            "timezone",
+            "crisis_contact"
+        ]
+        values = {field: None for field in pii_fields}
+        values["privacy_settings"] = {"show_profile": False}
+        values["version"] = UserProfile.version + 1
+        await async_update_returning(db, db_profile, values, "deleting profile")
+        return True
+
+    try:
+        await db.delete(db_profile)
+        await db.commit()
+        return True
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError("Unexpected database error while deleting profile") from e
+
+
+async def patch_profile(
+    db: AsyncSession,
+    user_id: UUID,
+    patch_format: str,
+    patch: Any,
+    expected_versions: Optional[List[int]] = None,
+    validate: Optional[Callable[[UserProfile], None]] = None,
+) -> UserProfile:
+    """
+    Apply a merge or JSON patch to a profile with one UPDATE ... RETURNING,
+    no prior read (see profile_crud.patch_profile).
+    """
+    values, conditions = patch_values(db.get_bind().dialect.name, patch_format, patch)
+    try:
+        profile = await db.scalar(patch_profile_statement(user_id, values, conditions, expected_versions))
+        if profile is None:
+            await db.rollback()
+            raise_patch_failure(
+                await db.scalar(select(UserProfile.version).where(UserProfile.id == user_id)), expected_versions
+            )
+        if validate is not None:
+            validate(profile)
+        await db.commit()
+        return profile
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError("Conflict occurred while patching profile") from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError("Unexpected database error while patching profile") from e
+    except Exception:
+        await db.rollback()
+        raise
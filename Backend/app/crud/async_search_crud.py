@@ -0,0 +1,60 @@
+# app/crud/async_search_crud.py
+"""Async (AsyncSession) counterparts of app.crud.search_crud, used by request handlers."""
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_models import User, UserProfile
+from app.crud.search_crud import MAX_CANDIDATES, MIN_SIMILARITY, search_statement, search_terms
+
+
+async def search(
+    db: AsyncSession,
+    entity,
+    query: str,
+    limit: int = 20,
+    fuzzy: bool = True,
+    include_private: bool = False,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+) -> list:
+    """Substring/prefix matches, then fuzzy fill-up (see search_crud.search)."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect_name = db.get_bind().dialect.name
+    results = list(await db.scalars(
+        search_statement(entity, dialect_name, terms, False, include_private, limit, candidates, min_similarity)
+    ))
+    if fuzzy and len(results) < limit:
+        seen = {row.id for row in results}
+        fuzzy_matches = search_statement(entity, dialect_name, terms, True, include_private, limit, candidates, min_similarity)
+        for row in await db.scalars(fuzzy_matches):
+            if row.id not in seen and len(results) < limit:
+                results.append(row)
+    return results
+
+
+async def search_users(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    fuzzy: bool = True,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+) -> List[User]:
+    """Admin user search over username, email, full_name and location."""
+    return await search(db, User, query, limit, fuzzy, include_private=True, candidates=candidates, min_similarity=min_similarity)
+
+
+async def search_profiles(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    fuzzy: bool = True,
+    include_private: bool = False,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+) -> List[UserProfile]:
+    """Profile search; only public text (active accounts, visible fields) unless include_private."""
+    return await search(db, UserProfile, query, limit, fuzzy, include_private, candidates=candidates, min_similarity=min_similarity)
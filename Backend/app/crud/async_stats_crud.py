@@ -0,0 +1,13 @@
+# app/crud/async_stats_crud.py
+"""Async (AsyncSession) counterparts of app.crud.stats_crud, used by request handlers."""
+from typing import List
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.stats_crud import USER_STATS_TOTALS
+
+
+async def get_user_stats(db: AsyncSession) -> List[Row]:
+    """All counters, one row each (summed over the shards)."""
+    return list(await db.execute(USER_STATS_TOTALS))
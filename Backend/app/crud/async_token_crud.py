@@ -0,0 +1,132 @@
+# app/crud/async_token_crud.py
+"""Async (AsyncSession) counterparts of the request-path functions in app.crud.token_crud."""
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import (
+    DatabaseError,
+    DatabaseConflictError,
+)
+from app.models.auth_models import RefreshToken
+
+# -----------------------------
+# Refresh Token CRUD Operations
+# -----------------------------
+
+
+async def get_refresh_token(db: AsyncSession, token_id: UUID) -> Optional[RefreshToken]:
+    """Retrieve a refresh token row by its id (jti)."""
+    return await db.scalar(select(RefreshToken).where(RefreshToken.id == token_id).limit(1))
+
+
+async def create_refresh_token(
+    db: AsyncSession,
+    token_id: UUID,
+    user_id: UUID,
+    family_id: UUID,
+    token_hash: str,
+    expires_at: datetime,
+) -> None:
+    """Insert the first token of a new family (issued at login)."""
+    db_token = RefreshToken(
+        id=token_id,
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=token_hash,
+        revoked=False,
+        created_at=datetime.now(timezone.utc),
+        expires_at=expires_at,
+    )
+
+    try:
+        db.add(db_token)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError("Conflict occurred while creating refresh token") from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError("Unexpected database error while creating refresh token") from e
+
+
+async def rotate_refresh_token(
+    db: AsyncSession,
+    token_id: UUID,
+    token_hash: str,
+    new_token_id: UUID,
+    new_token_hash: str,
+    new_expires_at: datetime,
+) -> Optional[Row]:
+    """
+    Atomically consume a live refresh token and insert its successor.
+    See token_crud.rotate_refresh_token.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == token_id,
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked=True, replaced_by_token=new_token_id)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    try:
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            await db.rollback()
+            return None
+        db.add(RefreshToken(
+            id=new_token_id,
+            user_id=row.user_id,
+            family_id=row.family_id,
+            token_hash=new_token_hash,
+            revoked=False,
+            created_at=now,
+            expires_at=new_expires_at,
+        ))
+        await db.commit()
+        return row
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError("Conflict occurred while rotating refresh token") from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError("Unexpected database error while rotating refresh token") from e
+
+
+async def revoke_token_family(db: AsyncSession, family_id: UUID) -> List[UUID]:
+    """Revoke every live token in a family. Returns the revoked ids."""
+    return await _revoke(db, RefreshToken.family_id == family_id, "revoking token family")
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: UUID) -> List[UUID]:
+    """Revoke every live token issued to a user. Returns the revoked ids."""
+    return await _revoke(db, RefreshToken.user_id == user_id, "revoking user tokens")
+
+
+async def _revoke(db: AsyncSession, condition, action: str) -> List[UUID]:
+    stmt = (
+        update(RefreshToken)
+        .where(condition, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+        .returning(RefreshToken.id)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        revoked_ids = list((await db.execute(stmt)).scalars())
+        await db.commit()
+        return revoked_ids
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError(f"Unexpected database error while {action}") from e
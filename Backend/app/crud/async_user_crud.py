@@ -0,0 +1,217 @@
+# app/crud/async_user_crud.py
+"""Async (AsyncSession) counterparts of app.crud.user_crud, used by request handlers."""
+from typing import Optional, Dict, List, Tuple, Any
+from uuid import UUID
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import (
+    DatabaseError,
+    DatabaseConflictError,
+    DatabaseNotFoundError,
+)
+from app.models.user_models import User, UserProfile, UserRole, Status
+from app.crud import async_auth_crud
+from app.crud.user_crud import (
+    bounded_count_statement,
+    list_users_statement,
+    table_estimate_statement,
+    user_list_conditions,
+    user_validators_statement,
+    user_with_profile_statement,
+)
+from app.crud.returning import async_insert_returning, async_update_returning, column_values
+
+# -----------------------------
+# User CRUD Operations
+# -----------------------------
+
+
+async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """Retrieve a user by their UUID (active only)."""
+    return await db.scalar(select(User).where(User.id == user_id).limit(1))
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Retrieve a user by email, return None if not found."""
+    return await db.scalar(select(User).where(User.email == email).limit(1))
+
+
+async def get_user_by_phone(db: AsyncSession, phone_number: str) -> Optional[User]:
+    """Retrieve a user by phone number."""
+    return await db.scalar(select(User).where(User.phone_number == phone_number).limit(1))
+
+
+async def get_user_with_profile(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """Retrieve a user and its profile with one query."""
+    return (await db.execute(user_with_profile_statement(user_id))).scalar_one_or_none()
+
+
+async def get_user_validators(db: AsyncSession, user_id: UUID):
+    """(updated_at, profile version, profile last_updated_at) of a user, or None if it does not exist."""
+    return (await db.execute(user_validators_statement(user_id))).one_or_none()
+
+
+async def create_user(
+    db: AsyncSession,
+    username: str,
+    email: str,
+    phone_number: Optional[str],
+    password_hash: str,
+    role: UserRole = UserRole.user,
+) -> User:
+    """Create a new user record."""
+    db_user = User(
+        username=username,
+        email=email,
+        phone_number=phone_number,
+        password_hash=password_hash,
+        status="active",
+        role=role,
+        is_verified=False,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+        last_login_at=None,
+        failed_login_attempts=0,
+        lockout_until=None,
+        password_changed_at=None,
+        onboarding_completed=False,
+    )
+
+    return await async_insert_returning(db, db_user, "creating user")
+
+
+async def create_user_with_profile(
+    db: AsyncSession,
+    username: str,
+    email: str,
+    phone_number: Optional[str],
+    password_hash: str,
+    role: UserRole = UserRole.user,
+    profile_create=None,
+) -> User:
+    """
+    Create a user and their profile in one transaction (one flush, no refresh).
+    Uniqueness of email and phone number is enforced by the database; a
+    violation raises DatabaseConflictError naming the field.
+    Returns the user with `profile` populated.
+    """
+    now = datetime.now(timezone.utc)
+    db_user = User(
+        username=username,
+        email=email,
+        phone_number=phone_number,
+        password_hash=password_hash,
+        status=Status.active,
+        role=role,
+        is_verified=False,
+        created_at=now,
+        updated_at=now,
+        last_login_at=None,
+        failed_login_attempts=0,
+        lockout_until=None,
+        password_changed_at=None,
+        onboarding_completed=False,
+    )
+    profile_data = profile_create.model_dump(exclude_unset=True) if profile_create else {}
+    db_user.profile = UserProfile(**{"last_updated_at": now, **profile_data})
+
+    try:
+        db.add(db_user)
+        await db.commit()
+        return db_user
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError(_registration_conflict(e)) from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError("Unexpected database error while creating user") from e
+
+
+def _registration_conflict(e: IntegrityError) -> str:
+    """Name the unique column a registration collided on (SQLite and Postgres messages)."""
+    message = str(e.orig)
+    if "phone_number" in message:
+        return "Phone number already registered"
+    if "email" in message:
+        return "Email already registered"
+    return "User already exists"
+
+
+async def update_user(db: AsyncSession, db_user: User, updates: Dict) -> User:
+    """Update user fields (excluding password) with one UPDATE ... RETURNING."""
+    return await async_update_returning(db, db_user, column_values(db_user, updates), "updating user")
+
+
+async def update_user_password(db: AsyncSession, db_user: User, password_hash: str) -> User:
+    """Update user password hash."""
+    values = {
+        "password_hash": password_hash,
+        "password_changed_at": datetime.now(timezone.utc),
+    }
+    return await async_update_returning(db, db_user, values, "updating password")
+
+
+async def update_last_login(db: AsyncSession, db_user: User) -> User:
+    """Update user's last login timestamp (buffered; see async_auth_crud.update_last_login)."""
+    return await async_auth_crud.update_last_login(db, db_user)
+
+
+async def status_update(db: AsyncSession, db_user: User, status: str) -> User:
+    """Update user status (active, banned, suspended, deactivated)."""
+    if not db_user:
+        raise DatabaseNotFoundError("User not found")
+
+    if status not in ["active", "banned", "suspended", "deactivated"]:
+        raise ValueError("Invalid status value")
+
+    return await async_update_returning(db, db_user, {"status": status}, "updating user status")
+
+
+async def delete_user(
+    db: AsyncSession, db_user: User, hard_delete: bool = False
+) -> bool:
+    """Delete user (hard or soft)."""
+    if not db_user:
+        raise DatabaseNotFoundError("User not found")
+
+    if hard_delete:
+        try:
+            await db.delete(db_user)
+            await db.commit()
+            return True
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise DatabaseError("Unexpected database error while deleting user") from e
+    else:
+        await status_update(db, db_user, "deactivated")
+        return True
+
+
+# -----------------------------
+# Listing (keyset pagination)
+# -----------------------------
+
+
+async def list_users(
+    db: AsyncSession,
+    limit: int,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[User]:
+    """Return up to `limit` users after the keyset position `after` (see user_crud.list_users)."""
+    return list(await db.scalars(list_users_statement(limit, after, filters)))
+
+
+async def estimate_user_count(db: AsyncSession, filters: Optional[Dict[str, Any]] = None, cap: int = 10000) -> int:
+    """Estimated number of users matching filters (see user_crud.estimate_user_count)."""
+    conditions = user_list_conditions(filters)
+    if not conditions:
+        stmt = table_estimate_statement(db.get_bind().dialect.name)
+        estimate = await db.scalar(stmt) if stmt is not None else None
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+    return await db.scalar(bounded_count_statement(conditions, cap))
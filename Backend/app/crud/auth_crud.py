@@ -1,9 +1,13 @@
 # app/crud/auth_crud.py
 from typing import Optional
-from datetime import datetime, timezone
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import case, func, update
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.exceptions import (
     DatabaseError,
@@ -11,6 +15,8 @@ from app.core.exceptions import (
     DatabaseNotFoundError,
 )
 from app.models.user_models import User
+from app.core.write_behind import user_touch_buffer
+from app.crud.returning import update_returning
 
 # -----------------------------
 # Auth CRUD Operations
@@ -18,120 +24,117 @@ from app.models.user_models import User
 
 
 def update_last_login(db: Session, db_user: User) -> User:
-    """Update user's last login timestamp."""
+    """
+    Update user's last login timestamp via the write-behind buffer.
+    The value is visible on db_user immediately and persisted on the next flush.
+    """
     if not db_user:
         raise DatabaseNotFoundError("User not found")
     
-    db_user.last_login_at = datetime.now(timezone.utc)
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating last login") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while updating last login") from e
+    now = datetime.now(timezone.utc)
+    user_touch_buffer.touch(db_user.id, last_login_at=now)
+    # Reflect the new value without marking the instance dirty
+    set_committed_value(db_user, "last_login_at", now)
+    return db_user
 
 
 def increment_failed_attempts(db: Session, db_user: User) -> User:
-    """Increment user's failed login attempts counter."""
+    """Increment user's failed login attempts counter (in SQL, no read-modify-write)."""
     if not db_user:
         raise DatabaseNotFoundError("User not found")
-    
-    db_user.failed_login_attempts += 1
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while incrementing failed attempts") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while incrementing failed attempts") from e
+
+    values = {"failed_login_attempts": func.coalesce(User.failed_login_attempts, 0) + 1}
+    return update_returning(db, db_user, values, "incrementing failed attempts")
 
 
 def reset_failed_attempts(db: Session, db_user: User) -> User:
     """Reset user's failed login attempts counter to zero."""
     if not db_user:
         raise DatabaseNotFoundError("User not found")
-    
-    db_user.failed_login_attempts = 0
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while resetting failed attempts") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while resetting failed attempts") from e
+
+    return update_returning(db, db_user, {"failed_login_attempts": 0}, "resetting failed attempts")
 
 
 def set_lockout_until(db: Session, db_user: User, until: datetime) -> User:
     """Set user lockout until specified datetime."""
     if not db_user:
         raise DatabaseNotFoundError("User not found")
-    
-    db_user.lockout_until = until
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while setting lockout time") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while setting lockout time") from e
+
+    return update_returning(db, db_user, {"lockout_until": until}, "setting lockout time")
 
 
 def clear_lockout(db: Session, db_user: User) -> User:
     """Clear user lockout by setting lockout_until to None."""
     if not db_user:
         raise DatabaseNotFoundError("User not found")
-    
-    db_user.lockout_until = None
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while clearing lockout") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while clearing lockout") from e
+
+    return update_returning(db, db_user, {"lockout_until": None}, "clearing lockout")
 
 
 def update_password_changed_at(db: Session, db_user: User) -> User:
     """Update user's password changed timestamp."""
     if not db_user:
         raise DatabaseNotFoundError("User not found")
-    
-    db_user.password_changed_at = datetime.now(timezone.utc)
-    
+
+    values = {"password_changed_at": datetime.now(timezone.utc)}
+    return update_returning(db, db_user, values, "updating password timestamp")
+
+
+def record_login_outcome(
+    db: Session,
+    user_id: UUID,
+    success: bool,
+    max_failed_attempts: int = 5,
+    lockout_minutes: int = 15,
+) -> Row:
+    """
+    Record a login attempt as a single atomic UPDATE ... RETURNING.
+    - Success: reset the failed-attempts counter, clear lockout, stamp last_login_at.
+    - Failure: increment the counter in SQL (no read-modify-write) and set
+      lockout_until once the counter reaches max_failed_attempts.
+    Returns the row (failed_login_attempts, lockout_until, last_login_at, updated_at).
+    """
+    now = datetime.now(timezone.utc)
+
+    if success:
+        values = {
+            "failed_login_attempts": 0,
+            "lockout_until": None,
+            "last_login_at": now,
+        }
+    else:
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        values = {
+            "failed_login_attempts": attempts,
+            "lockout_until": case(
+                (attempts >= max_failed_attempts, now + timedelta(minutes=lockout_minutes)),
+                else_=User.lockout_until,
+            ),
+        }
+
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(**values)
+        .returning(
+            User.failed_login_attempts,
+            User.lockout_until,
+            User.last_login_at,
+            User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
     try:
-        db.add(db_user)
+        row = db.execute(stmt).one_or_none()
+        if row is None:
+            db.rollback()
+            raise DatabaseNotFoundError("User not found")
         db.commit()
-        db.refresh(db_user)
-        return db_user
+        return row
     except IntegrityError as e:
         db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating password timestamp") from e
+        raise DatabaseConflictError("Conflict occurred while recording login outcome") from e
     except SQLAlchemyError as e:
         db.rollback()
-        raise DatabaseError("Unexpected database error while updating password timestamp") from e
\ No newline at end of file
+        raise DatabaseError("Unexpected database error while recording login outcome") from e
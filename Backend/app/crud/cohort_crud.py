@@ -0,0 +1,168 @@
+# app/crud/cohort_crud.py
+"""
+Clinician cohort queries over the trigger-maintained profile_health_terms.
+
+A cohort is a set of required (kind, term) pairs, e.g. condition "anxiety"
+AND medication "citalopram". The first pair drives a range scan of the
+(kind, term, profile_id) primary key in profile_id order; every further pair
+is a primary-key probe for the same profile, so a page stops reading as soon
+as it is full. No profile's JSON is parsed at query time.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session, aliased
+
+from app.models.user_models import (
+    HEALTH_TERM_KINDS,
+    ProfileHealthTerm,
+    Status,
+    User,
+    UserProfile,
+    health_terms_insert,
+)
+
+MAX_COHORT_TERMS = 8
+
+Requirement = Tuple[str, str]
+
+
+def normalize_term(term: str) -> str:
+    """Terms are stored trimmed and lowercased (see health_terms_insert)."""
+    return term.strip().lower()
+
+
+def cohort_requirements(conditions: Sequence[str] = (), medications: Sequence[str] = ()) -> List[Requirement]:
+    """Deduplicated, normalized (kind, term) pairs; blank terms are dropped."""
+    pairs = [("condition", normalize_term(term)) for term in conditions]
+    pairs += [("medication", normalize_term(term)) for term in medications]
+    return list(dict.fromkeys(pair for pair in pairs if pair[1]))
+
+
+def _visible_conditions(include_hidden: bool) -> list:
+    """Active accounts only; unless include_hidden, only profiles whose show_profile is not false."""
+    conditions = [User.status == Status.active]
+    if not include_hidden:
+        conditions.append(func.coalesce(UserProfile.privacy_settings["show_profile"].as_boolean(), True))
+    return conditions
+
+
+def _cohort_select(requirements: List[Requirement], columns=None, after: Optional[UUID] = None):
+    """
+    (profile_id column, select) over profiles holding every requirement;
+    selects `columns` (default: the profile_id) in profile_id order.
+    """
+    first, *rest = [aliased(ProfileHealthTerm) for _ in requirements]
+    stmt = select(*(columns or [first.profile_id])).select_from(first)
+    for alias, (kind, term) in zip(rest, requirements[1:]):
+        stmt = stmt.join(alias, (alias.profile_id == first.profile_id) & (alias.kind == kind) & (alias.term == term))
+    kind, term = requirements[0]
+    stmt = stmt.where(first.kind == kind, first.term == term)
+    if after is not None:
+        stmt = stmt.where(first.profile_id > after)
+    return first.profile_id, stmt
+
+
+def cohort_statement(
+    requirements: List[Requirement],
+    limit: int,
+    after: Optional[UUID] = None,
+    include_hidden: bool = False,
+):
+    """Profiles matching every requirement, ordered by id, starting strictly after `after`."""
+    profile_id, stmt = _cohort_select(requirements, [UserProfile], after)
+    return (
+        stmt.join(UserProfile, UserProfile.id == profile_id)
+        .join(User, User.id == profile_id)
+        .where(*_visible_conditions(include_hidden))
+        .order_by(profile_id)
+        .limit(limit)
+    )
+
+
+def facet_statement(
+    kind: str,
+    requirements: Optional[List[Requirement]] = None,
+    limit: int = 50,
+    include_hidden: bool = False,
+):
+    """
+    (term, count) for terms of `kind`, most common first, counted over the
+    cohort given by requirements (or over all profiles when there are none).
+    """
+    facet = aliased(ProfileHealthTerm)
+    count = func.count().label("count")
+    stmt = (
+        select(facet.term, count)
+        .join(User, User.id == facet.profile_id)
+        .where(facet.kind == kind, User.status == Status.active)
+    )
+    if not include_hidden:
+        stmt = stmt.join(UserProfile, UserProfile.id == facet.profile_id).where(*_visible_conditions(False))
+    if requirements:
+        _, ids = _cohort_select(requirements)
+        stmt = stmt.where(facet.profile_id.in_(ids))
+    return stmt.group_by(facet.term).order_by(count.desc(), facet.term).limit(limit)
+
+
+def find_cohort(
+    db: Session,
+    requirements: List[Requirement],
+    limit: int = 50,
+    after: Optional[UUID] = None,
+    include_hidden: bool = False,
+) -> List[UserProfile]:
+    """Return up to `limit` profiles holding every requirement, after profile id `after`."""
+    if not requirements:
+        return []
+    return list(db.scalars(cohort_statement(requirements, limit, after, include_hidden)))
+
+
+def facet_counts(
+    db: Session,
+    kind: str,
+    requirements: Optional[List[Requirement]] = None,
+    limit: int = 50,
+    include_hidden: bool = False,
+) -> Dict[str, int]:
+    """Per-term profile counts for `kind` within the cohort, most common first."""
+    if kind not in HEALTH_TERM_KINDS:
+        raise ValueError(f"Unknown facet kind: {kind}")
+    return dict(db.execute(facet_statement(kind, requirements, limit, include_hidden)).all())
+
+
+def _non_empty_array(dialect_name: str, column):
+    if dialect_name == "sqlite":
+        # json_array_length is 0 for JSON null and scalars
+        return func.json_array_length(column) > 0
+    return (func.json_typeof(column) == "array") & (func.json_array_length(column) > 0)
+
+
+def health_terms_incomplete(db: Session) -> bool:
+    """
+    True if some profile lists conditions or medications but has no
+    profile_health_terms rows (profiles from before the triggers).
+    """
+    dialect_name = db.get_bind().dialect.name
+    missing = (
+        select(UserProfile.id)
+        .outerjoin(ProfileHealthTerm, ProfileHealthTerm.profile_id == UserProfile.id)
+        .where(
+            ProfileHealthTerm.profile_id.is_(None),
+            _non_empty_array(dialect_name, UserProfile.conditions)
+            | _non_empty_array(dialect_name, UserProfile.medications),
+        )
+        .limit(1)
+    )
+    return db.scalar(missing) is not None
+
+
+def rebuild_health_terms(db: Session) -> None:
+    """
+    Recompute every profile's rows from user_profiles, e.g. for profiles
+    that existed before the triggers were created.
+    """
+    db.execute(text("DELETE FROM profile_health_terms"))
+    db.execute(text(health_terms_insert(db.get_bind().dialect.name, "p.id")))
+    db.commit()
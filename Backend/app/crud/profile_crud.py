@@ -1,7 +1,10 @@
 # app/crud/profile_crud.py
-from typing import Dict, Optional
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import JSON, String, Text, case, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -9,8 +12,10 @@ from app.core.exceptions import (
     DatabaseError,
     DatabaseConflictError,
     DatabaseNotFoundError,
+    DatabaseStaleVersionError,
 )
 from app.models.user_models import UserProfile
+from app.crud.returning import insert_returning, update_returning, column_values
 
 # -----------------------------
 # Profile CRUD Operations
@@ -22,6 +27,16 @@ def get_profile_by_user_id(db: Session, user_id: UUID) -> Optional[UserProfile]:
     return db.query(UserProfile).filter(UserProfile.id == user_id).first()
 
 
+def profile_validators_statement(user_id: UUID):
+    """(version, last_updated_at) of one profile: a conditional GET needs nothing else."""
+    return select(UserProfile.version, UserProfile.last_updated_at).where(UserProfile.id == user_id)
+
+
+def get_profile_validators(db: Session, user_id: UUID):
+    """Row of profile_validators_statement, or None if there is no profile."""
+    return db.execute(profile_validators_statement(user_id)).one_or_none()
+
+
 def create_profile(db: Session, user_id: UUID, profile_create) -> UserProfile:
     """
     Create a new user profile.
@@ -31,93 +46,317 @@ def create_profile(db: Session, user_id: UUID, profile_create) -> UserProfile:
     db_profile = UserProfile(
         id=user_id, **profile_create.model_dump(exclude_unset=True)
     )
-    
-    try:
-        db.add(db_profile)
-        db.commit()
-        db.refresh(db_profile)
-        return db_profile
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while creating profile") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while creating profile") from e
+    return insert_returning(db, db_profile, "creating profile")
+
 
+def version_conditions(expected_versions: Optional[List[int]]) -> list:
+    """WHERE clause for an If-Match precondition (None: unconditional)."""
+    return [] if expected_versions is None else [UserProfile.version.in_(expected_versions)]
 
-def update_profile(db: Session, db_profile: UserProfile, profile_update) -> UserProfile:
+
+def update_profile(
+    db: Session, db_profile: UserProfile, profile_update, expected_versions: Optional[List[int]] = None
+) -> UserProfile:
     """
-    Update profile fields from schema.
+    Update profile fields from schema with one UPDATE ... RETURNING.
     profile_update: Pydantic schema (ProfileUpdate).
-    Updates profile fields from schema.
     """
-    
-    update_data = profile_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if hasattr(db_profile, key):
-            setattr(db_profile, key, value)
-
-    try:
-        db.add(db_profile)
-        db.commit()
-        db.refresh(db_profile)
-        return db_profile
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating profile") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while updating profile") from e
+    update_data = column_values(db_profile, profile_update.model_dump(exclude_unset=True))
+    update_data["version"] = UserProfile.version + 1
+    return update_returning(
+        db, db_profile, update_data, "updating profile", version_conditions(expected_versions)
+    )
 
 
-def update_profile_privacy(db: Session, db_profile: UserProfile, privacy_settings: Dict[str, bool]) -> UserProfile:
+def update_profile_privacy(
+    db: Session, db_profile: UserProfile, privacy_settings: Dict[str, bool], expected_versions: Optional[List[int]] = None
+) -> UserProfile:
     """Update profile privacy settings."""
+    return update_returning(
+        db, db_profile, {"privacy_settings": privacy_settings, "version": UserProfile.version + 1},
+        "updating profile privacy", version_conditions(expected_versions)
+    )
+
+
+def delete_profile(db: Session, db_profile: UserProfile, hard_delete: bool = False) -> bool:
+    """
+    Delete profile (hard or soft).
+    - Hard delete: removes the row.
+    - Soft delete: anonymizes/clears PII while keeping the row (one UPDATE).
+    """
+    if not hard_delete:
+        # Soft delete: anonymize PII fields
+        pii_fields = [
+            "full_name",
+            "date_of_birth",
+            "gender",
+            "location",
+            "timezone",
+            "crisis_contact"
+        ]
+        values = {field: None for field in pii_fields}
+        values["privacy_settings"] = {"show_profile": False}
+        values["version"] = UserProfile.version + 1
+        update_returning(db, db_profile, values, "deleting profile")
+        return True
 
-    db_profile.privacy_settings = privacy_settings
-    
     try:
-        db.add(db_profile)
+        db.delete(db_profile)
         db.commit()
-        db.refresh(db_profile)
-        return db_profile
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating profile privacy") from e
+        return True
     except SQLAlchemyError as e:
         db.rollback()
-        raise DatabaseError("Unexpected database error while updating profile privacy") from e
+        raise DatabaseError("Unexpected database error while deleting profile") from e
 
 
-def delete_profile(db: Session, db_profile: UserProfile, hard_delete: bool = False) -> bool:
+# -----------------------------
+# In-database JSON patches
+# -----------------------------
+
+# JSON document columns and the document a patch starts from when the column is empty
+JSON_DOCUMENT_FIELDS = {
+    "primary_pillar_weights": "{}",
+    "medications": "[]",
+    "conditions": "[]",
+    "privacy_settings": "{}",
+}
+SCALAR_PATCH_FIELDS = frozenset({
+    "full_name", "date_of_birth", "gender", "location", "timezone", "crisis_contact", "preferred_language",
+})
+MAX_PATCH_OPERATIONS = 32
+PATCH_FORMATS = ("merge", "json")  # RFC 7396 merge patch, RFC 6902 JSON patch
+
+
+def _json_literal(dialect_name: str, value: Any):
+    """A JSON value as a document expression of the dialect."""
+    document = literal(json.dumps(value), String)
+    return cast(document, JSONB) if dialect_name == "postgresql" else func.json(document)
+
+
+def _base_document(dialect_name: str, field: str):
+    """The column as a document expression; NULL / JSON null / scalars start from the empty document."""
+    column = UserProfile.__table__.c[field]
+    empty = JSON_DOCUMENT_FIELDS[field]
+    if dialect_name == "postgresql":
+        return case(
+            (func.json_typeof(column).in_(["object", "array"]), cast(column, JSONB)),
+            else_=cast(literal(empty, String), JSONB),
+        )
+    return case(
+        (func.json_type(column).in_(["object", "array"]), column),
+        else_=func.json(literal(empty, String)),
+    )
+
+
+def _stored(dialect_name: str, document):
+    """Document expression -> value for the JSON column."""
+    return cast(document, JSON) if dialect_name == "postgresql" else document
+
+
+def merge_patch_values(dialect_name: str, patch: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Delete profile (hard or soft).
-    - Hard delete: removes the row.
-    - Soft delete: anonymizes/clears PII while keeping the row.
+    SET values applying an RFC 7396 merge patch to a profile inside the
+    UPDATE: JSON document members are merged by the database (SQLite
+    json_patch, Postgres json_merge_patch), so concurrent patches of
+    different members do not overwrite each other. Scalar fields are set,
+    null clears a field. Raises ValueError for fields that cannot be patched.
     """
+    values = {}
+    for field, value in patch.items():
+        if field in SCALAR_PATCH_FIELDS:
+            values[field] = value
+        elif field not in JSON_DOCUMENT_FIELDS:
+            raise ValueError(f"Field cannot be patched: {field}")
+        elif isinstance(value, dict):
+            merge = func.json_merge_patch if dialect_name == "postgresql" else func.json_patch
+            values[field] = _stored(
+                dialect_name, merge(_base_document(dialect_name, field), _json_literal(dialect_name, value))
+            )
+        else:
+            # Non-object patches replace the document (RFC 7396)
+            values[field] = value
+    return values
 
-    try:
-        if hard_delete:
-            db.delete(db_profile)
+
+def _pointer(path: Any) -> List[str]:
+    """RFC 6901 JSON pointer -> reference tokens."""
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _sqlite_path(tokens: List[str]) -> str:
+    """Reference tokens -> SQLite JSON path; numeric tokens index arrays, "-" appends."""
+    path = "$"
+    for token in tokens:
+        if token == "-":
+            path += "[#]"
+        elif token.isdigit():
+            path += f"[{token}]"
+        elif '"' in token:
+            raise ValueError(f"Unsupported member name: {token!r}")
+        else:
+            path += f'."{token}"'
+    return path
+
+
+def _apply_operation(dialect_name: str, document, op: str, tokens: List[str], value: Any):
+    """
+    (new document, precondition) for one JSON patch operation on a document
+    expression. The precondition is evaluated against the document before
+    the operation: the parent must exist for add, the target for replace /
+    remove.
+    """
+    parent, last = tokens[:-1], tokens[-1]
+    if op == "add" and last.isdigit():
+        raise ValueError("Inserting at an array index is not supported; append with '-'")
+    if last == "-" and op != "add":
+        raise ValueError(f"'-' is only valid for add, not {op}")
+    if "-" in parent:
+        raise ValueError("'-' may only be the last reference token")
+
+    if dialect_name == "postgresql":
+        path = literal(tokens, ARRAY(Text))
+        parent_path = literal(parent, ARRAY(Text))
+        if op == "add" and last == "-":
+            # Insert after the last element (an empty array just gains one)
+            last_element = literal(parent + ["-1"], ARRAY(Text))
+            condition = func.jsonb_typeof(document.op("#>")(parent_path)) == "array"
+            return func.jsonb_insert(document, last_element, _json_literal(dialect_name, value), True), condition
+        if op == "add":
+            condition = func.jsonb_typeof(document.op("#>")(parent_path)) == "object"
+            return func.jsonb_set(document, path, _json_literal(dialect_name, value), True), condition
+        condition = document.op("#>")(path).is_not(None)
+        if op == "replace":
+            return func.jsonb_set(document, path, _json_literal(dialect_name, value), False), condition
+        return document.op("#-")(path), condition
+
+    path = _sqlite_path(tokens)
+    parent_path = _sqlite_path(parent)
+    if op == "add":
+        condition = func.json_type(document, parent_path) == ("array" if last == "-" else "object")
+        return func.json_set(document, path, _json_literal(dialect_name, value)), condition
+    condition = func.json_type(document, path).is_not(None)
+    if op == "replace":
+        return func.json_replace(document, path, _json_literal(dialect_name, value)), condition
+    return func.json_remove(document, path), condition
+
+
+def json_patch_values(dialect_name: str, operations: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], list]:
+    """
+    (SET values, WHERE conditions) applying an RFC 6902 JSON patch to a
+    profile inside one UPDATE. The first reference token names the field;
+    deeper paths address members of the JSON document columns. Supports
+    add, replace and remove; numeric tokens are array indexes and arrays
+    grow by appending ("/-"). Operations apply in order; if any target is
+    missing the conditions fail and nothing is written.
+    Raises ValueError for malformed or unsupported operations.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("A JSON patch is a non-empty array of operations")
+    if len(operations) > MAX_PATCH_OPERATIONS:
+        raise ValueError(f"At most {MAX_PATCH_OPERATIONS} operations per patch")
+
+    values, documents, conditions = {}, {}, []
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise ValueError("A JSON patch operation must be an object")
+        op = operation.get("op")
+        if op not in ("add", "replace", "remove"):
+            raise ValueError(f"Unsupported JSON patch operation: {op!r}")
+        if op != "remove" and "value" not in operation:
+            raise ValueError(f"{op} requires a value")
+        field, *tokens = _pointer(operation.get("path"))
+        value = operation.get("value")
+
+        if field in SCALAR_PATCH_FIELDS:
+            if tokens:
+                raise ValueError(f"{field} is not a JSON document")
+            values[field] = None if op == "remove" else value
+        elif field not in JSON_DOCUMENT_FIELDS:
+            raise ValueError(f"Field cannot be patched: {field}")
+        elif not tokens:
+            # Whole document: later operations on the field start from the new value
+            documents[field] = _json_literal(dialect_name, None if op == "remove" else value)
         else:
-            # Soft delete: anonymize PII fields
-            pii_fields = [
-                "full_name", 
-                "date_of_birth", 
-                "gender", 
-                "location", 
-                "timezone", 
-                "crisis_contact"
-            ]
-            
-            for field in pii_fields:
-                if hasattr(db_profile, field):
-                    setattr(db_profile, field, None)
-
-            db_profile.privacy_settings = {"show_profile": False}
-            db.add(db_profile)
+            document = documents.get(field)
+            if document is None:
+                document = _base_document(dialect_name, field)
+            documents[field], condition = _apply_operation(dialect_name, document, op, tokens, value)
+            conditions.append(condition)
+
+    for field, document in documents.items():
+        values[field] = _stored(dialect_name, document)
+    return values, conditions
+
+
+def patch_values(dialect_name: str, patch_format: str, patch: Any) -> Tuple[Dict[str, Any], list]:
+    """(SET values, WHERE conditions) for a "merge" (RFC 7396) or "json" (RFC 6902) patch."""
+    if patch_format == "merge":
+        if not isinstance(patch, dict) or not patch:
+            raise ValueError("A merge patch is a non-empty JSON object")
+        return merge_patch_values(dialect_name, patch), []
+    return json_patch_values(dialect_name, patch)
+
+
+def patch_profile_statement(
+    user_id: UUID,
+    values: Dict[str, Any],
+    conditions: list,
+    expected_versions: Optional[List[int]] = None,
+):
+    """One UPDATE ... RETURNING applying patch values, guarded by the conditions and If-Match versions."""
+    return (
+        update(UserProfile)
+        .where(UserProfile.id == user_id, *conditions, *version_conditions(expected_versions))
+        .values(**values, version=UserProfile.version + 1)
+        .returning(UserProfile)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
 
+
+def raise_patch_failure(current_version: Optional[int], expected_versions: Optional[List[int]]) -> None:
+    """Explain a patch that updated no row, given the row's current version (None: no profile)."""
+    if current_version is None:
+        raise DatabaseNotFoundError("Profile not found")
+    if expected_versions is not None and current_version not in expected_versions:
+        raise DatabaseStaleVersionError(f"Profile is at version {current_version}")
+    raise DatabaseConflictError("JSON patch target does not exist")
+
+
+def patch_profile(
+    db: Session,
+    user_id: UUID,
+    patch_format: str,
+    patch: Any,
+    expected_versions: Optional[List[int]] = None,
+    validate: Optional[Callable[[UserProfile], None]] = None,
+) -> UserProfile:
+    """
+    Apply a merge or JSON patch to a profile with one UPDATE ... RETURNING,
+    no prior read. `validate` sees the patched profile before commit; an
+    exception from it rolls the patch back. Raises ValueError (malformed
+    patch), DatabaseNotFoundError, DatabaseStaleVersionError (If-Match
+    failed) or DatabaseConflictError (a patch target is missing).
+    """
+    values, conditions = patch_values(db.get_bind().dialect.name, patch_format, patch)
+    try:
+        profile = db.scalar(patch_profile_statement(user_id, values, conditions, expected_versions))
+        if profile is None:
+            db.rollback()
+            raise_patch_failure(
+                db.scalar(select(UserProfile.version).where(UserProfile.id == user_id)), expected_versions
+            )
+        if validate is not None:
+            validate(profile)
         db.commit()
-        return True
+        return profile
+    except IntegrityError as e:
+        db.rollback()
+        raise DatabaseConflictError("Conflict occurred while patching profile") from e
     except SQLAlchemyError as e:
         db.rollback()
-        raise DatabaseError("Unexpected database error while deleting profile") from e
\ No newline at end of file
+        raise DatabaseError("Unexpected database error while patching profile") from e
+    except Exception:
+        db.rollback()
+        raise
@@ -0,0 +1,125 @@
+# app/crud/returning.py
+"""
+Single-statement write helpers shared by the CRUD modules.
+
+update_returning issues one UPDATE ... RETURNING for an ORM instance and
+copies the returned row onto it as committed state, so the object is current
+without the post-commit refresh SELECT. insert_returning adds and commits a
+new instance: Python-side column defaults are already on the object and the
+ORM fetches any server-generated values through INSERT ... RETURNING
+(eager_defaults="auto").
+
+Both rely on sessions created with expire_on_commit=False (app.core.config)
+so attributes stay loaded after commit, and on RETURNING support in the
+database (SQLite 3.35+, Postgres).
+"""
+
+from typing import Any, Dict, Sequence, TypeVar
+
+from sqlalchemy import inspect, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.exceptions import (
+    DatabaseError,
+    DatabaseConflictError,
+    DatabaseNotFoundError,
+)
+
+T = TypeVar("T")
+
+
+def _update_statement(obj, values: Dict[str, Any], conditions: Sequence = ()):
+    mapper = inspect(obj).mapper
+    identity = mapper.primary_key_from_instance(obj)
+    return (
+        update(mapper.class_)
+        .where(*[column == value for column, value in zip(mapper.primary_key, identity)], *conditions)
+        .values(**values)
+        .returning(*mapper.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _apply_row(obj, row) -> None:
+    """Set the returned values as committed state (no dirty flags, no reload)."""
+    for key, value in zip(inspect(obj).mapper.columns.keys(), row):
+        set_committed_value(obj, key, value)
+
+
+def column_values(obj, updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only keys that are mapped columns of obj (drops e.g. 'password', relationships)."""
+    columns = inspect(obj).mapper.columns
+    return {key: value for key, value in updates.items() if key in columns}
+
+
+def update_returning(db: Session, obj: T, values: Dict[str, Any], action: str, conditions: Sequence = ()) -> T:
+    """
+    UPDATE obj's row with values in one statement, commit, and refresh obj from RETURNING.
+    Extra `conditions` make the write conditional (e.g. on a version); if they
+    do not hold, nothing is written and DatabaseNotFoundError is raised.
+    """
+    try:
+        row = db.execute(_update_statement(obj, values, conditions)).one_or_none()
+        if row is None:
+            db.rollback()
+            raise DatabaseNotFoundError(f"Row not found while {action}")
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise DatabaseConflictError(f"Conflict occurred while {action}") from e
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError(f"Unexpected database error while {action}") from e
+    _apply_row(obj, row)
+    return obj
+
+
+def insert_returning(db: Session, obj: T, action: str) -> T:
+    """INSERT obj in one statement and commit; obj stays loaded."""
+    try:
+        db.add(obj)
+        db.commit()
+        return obj
+    except IntegrityError as e:
+        db.rollback()
+        raise DatabaseConflictError(f"Conflict occurred while {action}") from e
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError(f"Unexpected database error while {action}") from e
+
+
+async def async_update_returning(
+    db: AsyncSession, obj: T, values: Dict[str, Any], action: str, conditions: Sequence = ()
+) -> T:
+    """Async counterpart of update_returning."""
+    try:
+        row = (await db.execute(_update_statement(obj, values, conditions))).one_or_none()
+        if row is None:
+            await db.rollback()
+            raise DatabaseNotFoundError(f"Row not found while {action}")
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError(f"Conflict occurred while {action}") from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError(f"Unexpected database error while {action}") from e
+    _apply_row(obj, row)
+    return obj
+
+
+async def async_insert_returning(db: AsyncSession, obj: T, action: str) -> T:
+    """Async counterpart of insert_returning."""
+    try:
+        db.add(obj)
+        await db.commit()
+        return obj
+    except IntegrityError as e:
+        await db.rollback()
+        raise DatabaseConflictError(f"Conflict occurred while {action}") from e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseError(f"Unexpected database error while {action}") from e
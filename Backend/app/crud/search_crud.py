@@ -0,0 +1,277 @@
+# app/crud/search_crud.py
+"""
+User / profile search over the trigger-maintained user_search_documents.
+
+SQLite matches through the FTS5 trigram index (user_search_fts), Postgres
+through pg_trgm GIN indexes. A trigram index matches any substring of at
+least three characters, which covers prefix matching.
+
+Fuzzy matching scores a document by the share of a term's trigrams it
+contains (pg_trgm word_similarity on Postgres), averaged over the terms,
+and keeps documents scoring at least the minimum similarity. A swap of two
+neighbouring letters breaks up to four trigrams, which leaves a short term
+with few or none ("usre1" shares no trigram with "user1"), so terms shorter
+than TRANSPOSITION_MAX_LENGTH are also scored as each of their adjacent
+transpositions and the best variant counts.
+
+Both kinds of match are ranked inside the query and only then limited, so
+the best matches of a common term are never cut off.
+"""
+from typing import List
+
+from sqlalchemy import Integer, and_, column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.user_models import User, UserProfile, UserSearchDocument, search_document_upsert
+
+MIN_TERM_LENGTH = 3
+MAX_TERMS = 8
+# Above pg_trgm's default word_similarity_threshold (0.6): a five-character term with its
+# last character changed keeps 2/3 of its trigrams ("user1" -> "user2") and should not match
+MIN_SIMILARITY = 0.7
+MAX_CANDIDATES = 1000
+# From this length one transposition still leaves (L - 6) / (L - 2) >= 0.6 of the trigrams
+TRANSPOSITION_MAX_LENGTH = 12
+
+user_search_fts = table("user_search_fts", column("rowid"))
+
+
+def search_terms(query: str) -> List[str]:
+    """Lowercased whitespace-separated terms long enough for the trigram index."""
+    terms = [term for term in query.lower().split() if len(term) >= MIN_TERM_LENGTH]
+    return list(dict.fromkeys(terms))[:MAX_TERMS]
+
+
+def _trigrams(term: str) -> List[str]:
+    return list(dict.fromkeys(term[i:i + 3] for i in range(len(term) - 2)))
+
+
+def term_variants(term: str) -> List[str]:
+    """The term and, if it is short, each swap of two neighbouring characters."""
+    variants = [term]
+    if len(term) < TRANSPOSITION_MAX_LENGTH:
+        for i in range(len(term) - 1):
+            variant = term[:i] + term[i + 1] + term[i] + term[i + 2:]
+            if variant not in variants:
+                variants.append(variant)
+    return variants
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def fts_query(terms: List[str], fuzzy: bool, include_private: bool) -> str:
+    """
+    FTS5 MATCH expression: every term as a substring, or (fuzzy) any trigram
+    of a term or any transposition of a term as a substring.
+    """
+    if fuzzy:
+        grams = dict.fromkeys(gram for term in terms for gram in _trigrams(term))
+        transpositions = dict.fromkeys(variant for term in terms for variant in term_variants(term)[1:])
+        expression = " OR ".join(_fts_phrase(phrase) for phrase in [*grams, *transpositions])
+    else:
+        expression = " AND ".join(_fts_phrase(term) for term in terms)
+    if include_private:
+        return expression
+    return "{public_text} : (" + expression + ")"
+
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _greatest(dialect_name: str, expressions: list):
+    if len(expressions) == 1:
+        return expressions[0]
+    # SQLite's multi-argument max() is scalar
+    return func.max(*expressions) if dialect_name == "sqlite" else func.greatest(*expressions)
+
+
+def _sqlite_similarity(terms: List[str], document):
+    """Mean over terms of the best share of a variant's trigrams found in document."""
+    scores = []
+    for term in terms:
+        variant_scores = []
+        for variant in term_variants(term):
+            grams = _trigrams(variant)
+            # LIKE is case-insensitive like the trigram index (instr would need lower() per call)
+            shared = sum(document.like(_like_pattern(gram), escape="\\").cast(Integer) for gram in grams)
+            variant_scores.append(shared * 1.0 / len(grams))
+        scores.append(_greatest("sqlite", variant_scores))
+    return sum(scores) / len(terms)
+
+
+def _ranked_documents(
+    dialect_name: str,
+    terms: List[str],
+    fuzzy: bool,
+    include_private: bool,
+    limit: int,
+    candidates: int,
+    min_similarity: float,
+):
+    """
+    (user_id, rank, length) of the best matching documents, best first
+    (lowest rank, then shortest).
+
+    Substring matches contain every term, so they rank by document length
+    (shorter = more specific). Fuzzy matches rank by similarity, then length.
+    On SQLite, a fuzzy query over common trigrams matches most documents;
+    only the `candidates` best of them by bm25 (which favours documents with
+    many of the query's trigrams) are scored for similarity.
+    """
+    doc = UserSearchDocument
+    length = func.length(doc.public_text)
+    document = doc.public_text
+    if include_private:
+        length = length + func.length(doc.private_text)
+        document = doc.public_text + " " + doc.private_text
+
+    if dialect_name == "sqlite":
+        match = text("user_search_fts MATCH :match").bindparams(match=fts_query(terms, fuzzy, include_private))
+        if not fuzzy:
+            matched = select(user_search_fts.c.rowid).where(match).subquery()
+            return (
+                select(doc.user_id, length.label("rank"), length.label("length"))
+                .join(matched, matched.c.rowid == doc.id)
+                .order_by(length)
+                .limit(limit)
+            )
+        bm25 = literal_column("bm25(user_search_fts, 2.0, 1.0)")
+        matched = select(user_search_fts.c.rowid).where(match).order_by(bm25).limit(candidates).subquery()
+        # LIMIT keeps SQLite from flattening the subquery, which would compute similarity three times
+        scored = (
+            select(doc.user_id, _sqlite_similarity(terms, document).label("similarity"), length.label("length"))
+            .join(matched, matched.c.rowid == doc.id)
+            .limit(candidates)
+            .subquery()
+        )
+        rank = -scored.c.similarity
+        return (
+            select(scored.c.user_id, rank.label("rank"), scored.c.length)
+            .where(scored.c.similarity >= min_similarity)
+            .order_by(rank, scored.c.length)
+            .limit(limit)
+        )
+
+    columns = [doc.public_text, doc.private_text] if include_private else [doc.public_text]
+    if not fuzzy:
+        condition = and_(*[
+            or_(*[col.ilike(_like_pattern(term), escape="\\") for col in columns]) for term in terms
+        ])
+        return (
+            select(doc.user_id, length.label("rank"), length.label("length"))
+            .where(condition)
+            .order_by(length)
+            .limit(limit)
+        )
+
+    # One query string per transposition of one term; `<%` is answered from the GIN indexes
+    queries = [" ".join(terms)] + [
+        " ".join(terms[:i] + [variant] + terms[i + 1:])
+        for i, term in enumerate(terms)
+        for variant in term_variants(term)[1:]
+    ]
+    pairs = [(literal(query), col) for query in queries for col in columns]
+    similarity = _greatest(dialect_name, [func.word_similarity(query, col) for query, col in pairs])
+    return (
+        select(doc.user_id, (-similarity).label("rank"), length.label("length"))
+        .where(or_(*[query.op("<%")(col) for query, col in pairs]), similarity >= min_similarity)
+        .order_by(-similarity, length)
+        .limit(limit)
+    )
+
+
+def search_statement(
+    entity,
+    dialect_name: str,
+    terms: List[str],
+    fuzzy: bool,
+    include_private: bool,
+    limit: int,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+):
+    """
+    Select `entity` (User or UserProfile) rows matching terms, best first.
+    Without include_private only public_text is matched, i.e. active
+    accounts and fields their privacy settings show; admins match everything.
+    """
+    ranked = _ranked_documents(dialect_name, terms, fuzzy, include_private, limit, candidates, min_similarity).subquery()
+    return select(entity).join(ranked, ranked.c.user_id == entity.id).order_by(ranked.c.rank, ranked.c.length)
+
+
+def search(
+    db: Session,
+    entity,
+    query: str,
+    limit: int = 20,
+    fuzzy: bool = True,
+    include_private: bool = False,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+) -> list:
+    """
+    Substring/prefix matches first; if fewer than `limit` and fuzzy is set,
+    fill up with trigram-overlap matches.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect_name = db.get_bind().dialect.name
+    results = list(db.scalars(
+        search_statement(entity, dialect_name, terms, False, include_private, limit, candidates, min_similarity)
+    ))
+    if fuzzy and len(results) < limit:
+        seen = {row.id for row in results}
+        fuzzy_matches = search_statement(entity, dialect_name, terms, True, include_private, limit, candidates, min_similarity)
+        for row in db.scalars(fuzzy_matches):
+            if row.id not in seen and len(results) < limit:
+                results.append(row)
+    return results
+
+
+def search_users(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    fuzzy: bool = True,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+) -> List[User]:
+    """Admin user search over username, email, full_name and location."""
+    return search(db, User, query, limit, fuzzy, include_private=True, candidates=candidates, min_similarity=min_similarity)
+
+
+def search_profiles(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    fuzzy: bool = True,
+    include_private: bool = False,
+    candidates: int = MAX_CANDIDATES,
+    min_similarity: float = MIN_SIMILARITY,
+) -> List[UserProfile]:
+    """Profile search; only public text (active accounts, visible fields) unless include_private."""
+    return search(db, UserProfile, query, limit, fuzzy, include_private, candidates=candidates, min_similarity=min_similarity)
+
+
+def search_index_incomplete(db: Session) -> bool:
+    """True if some user has no search document (rows from before the search triggers)."""
+    missing = (
+        select(User.id)
+        .outerjoin(UserSearchDocument, UserSearchDocument.user_id == User.id)
+        .where(UserSearchDocument.id.is_(None))
+        .limit(1)
+    )
+    return db.scalar(missing) is not None
+
+
+def rebuild_search_index(db: Session) -> None:
+    """
+    Recompute every search document from users / user_profiles, e.g. for rows
+    that existed before the search triggers were created.
+    """
+    db.execute(text(search_document_upsert(db.get_bind().dialect.name, "u.id")))
+    db.commit()
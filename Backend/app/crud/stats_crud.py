@@ -0,0 +1,103 @@
+# app/crud/stats_crud.py
+"""
+User statistics from the trigger-maintained user_stats counters.
+
+Reading the overview is one grouped scan of a table with a few hundred
+rows (counters x shards), independent of the number of users.
+reconcile_user_stats recomputes
+every counter from users / user_profiles under a lock, repairing drift
+(e.g. rows written before the triggers existed), and folds the shards back
+into shard 0.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlalchemy import Row, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.user_models import User, UserProfile, UserStat
+
+
+# One row per counter: (key, value, reconciled_at), summed over the shards
+USER_STATS_TOTALS = (
+    select(
+        UserStat.key,
+        func.sum(UserStat.value).label("value"),
+        func.max(UserStat.reconciled_at).label("reconciled_at"),
+    )
+    .group_by(UserStat.key)
+    .order_by(UserStat.key)
+)
+
+
+def get_user_stats(db: Session) -> List[Row]:
+    """All counters, one row each (summed over the shards)."""
+    return list(db.execute(USER_STATS_TOTALS))
+
+
+def _lock_counters(db: Session, now: datetime) -> None:
+    """Block trigger writes until commit so the recount and the counters agree."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE user_stats IN EXCLUSIVE MODE"))
+    else:
+        # Any write takes SQLite's database-wide write lock
+        db.execute(update(UserStat).values(reconciled_at=now))
+
+
+def actual_user_stats(db: Session) -> Dict[str, int]:
+    """
+    Counter values computed from the source tables (two grouped scans).
+    Enum keys use the stored enum names, as the triggers do.
+    """
+    counts: Counter = Counter()
+    users = select(
+        User.role, User.status, User.is_verified, User.onboarding_completed, func.count()
+    ).group_by(User.role, User.status, User.is_verified, User.onboarding_completed)
+    for role, status, is_verified, onboarding_completed, n in db.execute(users):
+        counts["total"] += n
+        if role is not None:
+            counts[f"role:{role.name}"] += n
+        if status is not None:
+            counts[f"status:{status.name}"] += n
+        if is_verified:
+            counts["verified"] += n
+        if onboarding_completed:
+            counts["onboarding_completed"] += n
+    profiles = select(func.count(), func.count(UserProfile.full_name)).select_from(UserProfile)
+    counts["profiles"], counts["profiles_with_content"] = db.execute(profiles).one()
+    return dict(counts)
+
+
+def reconcile_user_stats(db: Session) -> Dict[str, int]:
+    """
+    Overwrite every counter with its real count and commit.
+    Returns the drift that was corrected (real - counter) per key.
+    """
+    now = datetime.now(timezone.utc)
+    _lock_counters(db, now)
+    before = {stat.key: stat.value for stat in get_user_stats(db)}
+    actual = actual_user_stats(db)
+    keys = sorted(before.keys() | actual.keys())
+    rows = [{"key": key, "shard": 0, "value": actual.get(key, 0), "reconciled_at": now} for key in keys]
+    if rows:
+        db.execute(delete(UserStat).where(UserStat.shard != 0))
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(UserStat).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[UserStat.key, UserStat.shard],
+            set_={"value": stmt.excluded.value, "reconciled_at": stmt.excluded.reconciled_at},
+        ))
+    db.commit()
+    return {
+        key: actual.get(key, 0) - before.get(key, 0)
+        for key in keys
+        if actual.get(key, 0) != before.get(key, 0)
+    }
+
+
+def user_stats_empty(db: Session) -> bool:
+    """True before the first reconciliation (fresh table)."""
+    return db.scalar(select(UserStat.key).limit(1)) is None
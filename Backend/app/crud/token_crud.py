@@ -0,0 +1,169 @@
+# app/crud/token_crud.py
+from typing import Iterator, List, Optional
+from uuid import UUID
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import (
+    DatabaseError,
+    DatabaseConflictError,
+)
+from app.models.auth_models import RefreshToken
+
+# -----------------------------
+# Refresh Token CRUD Operations
+# -----------------------------
+
+
+def get_refresh_token(db: Session, token_id: UUID) -> Optional[RefreshToken]:
+    """Retrieve a refresh token row by its id (jti)."""
+    return db.query(RefreshToken).filter(RefreshToken.id == token_id).first()
+
+
+def create_refresh_token(
+    db: Session,
+    token_id: UUID,
+    user_id: UUID,
+    family_id: UUID,
+    token_hash: str,
+    expires_at: datetime,
+) -> None:
+    """Insert the first token of a new family (issued at login)."""
+    db_token = RefreshToken(
+        id=token_id,
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=token_hash,
+        revoked=False,
+        created_at=datetime.now(timezone.utc),
+        expires_at=expires_at,
+    )
+
+    try:
+        db.add(db_token)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise DatabaseConflictError("Conflict occurred while creating refresh token") from e
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError("Unexpected database error while creating refresh token") from e
+
+
+def rotate_refresh_token(
+    db: Session,
+    token_id: UUID,
+    token_hash: str,
+    new_token_id: UUID,
+    new_token_hash: str,
+    new_expires_at: datetime,
+) -> Optional[Row]:
+    """
+    Atomically consume a live refresh token and insert its successor.
+    The consuming UPDATE only matches an unrevoked, unexpired row with the
+    expected hash, so two concurrent refreshes cannot both succeed.
+    Returns (user_id, family_id) on success, or None if the token was not
+    live (revoked, expired, unknown) — callers treat that as possible reuse.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == token_id,
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked=True, replaced_by_token=new_token_id)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    try:
+        row = db.execute(stmt).one_or_none()
+        if row is None:
+            db.rollback()
+            return None
+        db.add(RefreshToken(
+            id=new_token_id,
+            user_id=row.user_id,
+            family_id=row.family_id,
+            token_hash=new_token_hash,
+            revoked=False,
+            created_at=now,
+            expires_at=new_expires_at,
+        ))
+        db.commit()
+        return row
+    except IntegrityError as e:
+        db.rollback()
+        raise DatabaseConflictError("Conflict occurred while rotating refresh token") from e
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError("Unexpected database error while rotating refresh token") from e
+
+
+def revoke_token_family(db: Session, family_id: UUID) -> List[UUID]:
+    """Revoke every live token in a family. Returns the revoked ids."""
+    return _revoke(db, RefreshToken.family_id == family_id, "revoking token family")
+
+
+def revoke_user_tokens(db: Session, user_id: UUID) -> List[UUID]:
+    """Revoke every live token issued to a user. Returns the revoked ids."""
+    return _revoke(db, RefreshToken.user_id == user_id, "revoking user tokens")
+
+
+def _revoke(db: Session, condition, action: str) -> List[UUID]:
+    stmt = (
+        update(RefreshToken)
+        .where(condition, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+        .returning(RefreshToken.id)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        revoked_ids = list(db.execute(stmt).scalars())
+        db.commit()
+        return revoked_ids
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError(f"Unexpected database error while {action}") from e
+
+
+def purge_expired_refresh_tokens(db: Session, batch_size: int = 1000) -> int:
+    """Delete expired rows in batches of batch_size (one commit per batch). Returns rows deleted."""
+    now = datetime.now(timezone.utc)
+    expired_ids = (
+        select(RefreshToken.id)
+        .where(RefreshToken.expires_at <= now)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    stmt = delete(RefreshToken).where(RefreshToken.id.in_(expired_ids)).execution_options(synchronize_session=False)
+
+    total = 0
+    try:
+        while True:
+            deleted = db.execute(stmt).rowcount
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError("Unexpected database error while purging refresh tokens") from e
+
+
+def iter_revoked_token_ids(db: Session, batch_size: int = 1000) -> Iterator[UUID]:
+    """Stream ids of revoked, not-yet-expired tokens (used to rebuild the revocation filter)."""
+    now = datetime.now(timezone.utc)
+    stmt = (
+        select(RefreshToken.id)
+        .where(RefreshToken.revoked.is_(True), RefreshToken.expires_at > now)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.execute(stmt).scalars()
@@ -1,17 +1,21 @@
 # app/crud/user_crud.py
-from typing import Optional, Dict, List
+from typing import Iterator, Optional, Dict, List, Tuple, Any
 from uuid import UUID
 from datetime import datetime, timezone
 
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.exceptions import (
     DatabaseError,
-    DatabaseConflictError,
     DatabaseNotFoundError,
 )
-from app.models.user_models import User, UserProfile, UserRole
+from app.models.user_models import User, UserProfile, UserRole, Status
+from app.crud import auth_crud
+from app.crud.returning import column_values, insert_returning, update_returning
 
 # -----------------------------
 # User CRUD Operations
@@ -33,6 +37,35 @@ def get_user_by_phone(db: Session, phone_number: str) -> Optional[User]:
     return db.query(User).filter(User.phone_number == phone_number).first()
 
 
+def user_with_profile_statement(user_id: UUID):
+    """The user with its profile loaded through User.profile in the same SELECT (LEFT OUTER JOIN)."""
+    return select(User).options(joinedload(User.profile)).where(User.id == user_id)
+
+
+def get_user_with_profile(db: Session, user_id: UUID) -> Optional[User]:
+    """Retrieve a user and its profile with one query."""
+    return db.execute(user_with_profile_statement(user_id)).scalar_one_or_none()
+
+
+def user_validators_statement(user_id: UUID):
+    """
+    (users.updated_at, user_profiles.version, user_profiles.last_updated_at)
+    for one user: two primary-key lookups and no wide columns, enough to
+    answer a conditional GET of the user with profile without loading it.
+    """
+    return (
+        select(User.updated_at, UserProfile.version, UserProfile.last_updated_at)
+        .select_from(User)
+        .outerjoin(UserProfile, UserProfile.id == User.id)
+        .where(User.id == user_id)
+    )
+
+
+def get_user_validators(db: Session, user_id: UUID):
+    """Row of user_validators_statement, or None if the user does not exist."""
+    return db.execute(user_validators_statement(user_id)).one_or_none()
+
+
 def create_user(
     db: Session,
     username: str,
@@ -58,75 +91,27 @@ def create_user(
         password_changed_at=None,
         onboarding_completed=False,
     )
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while creating user") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while creating user") from e
 
+    return insert_returning(db, db_user, "creating user")
 
-def update_user(db: Session, db_user: User, updates: Dict) -> User:
-    """Update user fields (excluding password)."""
-    
-    for field, value in updates.items():
-        if hasattr(db_user, field):
-            setattr(db_user, field, value)
 
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating user") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while updating user") from e
+def update_user(db: Session, db_user: User, updates: Dict) -> User:
+    """Update user fields (excluding password) with one UPDATE ... RETURNING."""
+    return update_returning(db, db_user, column_values(db_user, updates), "updating user")
 
 
 def update_user_password(db: Session, db_user: User, password_hash: str) -> User:
     """Update user password hash."""
-    
-    db_user.password_hash = password_hash
-    db_user.password_changed_at = datetime.now(timezone.utc)
-
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating password") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while updating password") from e
+    values = {
+        "password_hash": password_hash,
+        "password_changed_at": datetime.now(timezone.utc),
+    }
+    return update_returning(db, db_user, values, "updating password")
 
 
 def update_last_login(db: Session, db_user: User) -> User:
-    """Update user's last login timestamp."""
-    
-    db_user.last_login_at = datetime.now(timezone.utc)
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating last login") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while updating last login") from e
+    """Update user's last login timestamp (buffered; see auth_crud.update_last_login)."""
+    return auth_crud.update_last_login(db, db_user)
 
 
 def status_update(db: Session, db_user: User, status: str) -> User:
@@ -137,19 +122,7 @@ def status_update(db: Session, db_user: User, status: str) -> User:
     if status not in ["active", "banned", "suspended", "deactivated"]:
         raise ValueError("Invalid status value")
 
-    db_user.status = status
-    
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except IntegrityError as e:
-        db.rollback()
-        raise DatabaseConflictError("Conflict occurred while updating user status") from e
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise DatabaseError("Unexpected database error while updating user status") from e
+    return update_returning(db, db_user, {"status": status}, "updating user status")
 
 
 def delete_user(
@@ -169,4 +142,206 @@ def delete_user(
             raise DatabaseError("Unexpected database error while deleting user") from e
     else:
         status_update(db, db_user, "deactivated")
-        return True
\ No newline at end of file
+        return True
+
+# -----------------------------
+# Listing (keyset pagination)
+# -----------------------------
+
+
+def user_list_conditions(filters: Optional[Dict[str, Any]]) -> list:
+    """
+    WHERE clauses for the admin listing.
+    Supported filters: role, status, is_verified, onboarding_completed, email_domain.
+    """
+    filters = filters or {}
+    conditions = []
+    if filters.get("role") is not None:
+        conditions.append(User.role == UserRole(filters["role"]))
+    if filters.get("status") is not None:
+        conditions.append(User.status == Status(filters["status"]))
+    if filters.get("is_verified") is not None:
+        conditions.append(User.is_verified == filters["is_verified"])
+    if filters.get("onboarding_completed") is not None:
+        conditions.append(User.onboarding_completed == filters["onboarding_completed"])
+    if filters.get("email_domain"):
+        conditions.append(User.email.iendswith("@" + filters["email_domain"], autoescape=True))
+    return conditions
+
+
+def list_users_statement(
+    limit: int,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+):
+    """
+    Newest-first page of users strictly after the (created_at, id) key `after`.
+    Served by the (created_at, id) composite indexes, so page depth does not
+    affect cost the way OFFSET does.
+    """
+    stmt = select(User).where(*user_list_conditions(filters))
+    if after is not None:
+        stmt = stmt.where(tuple_(User.created_at, User.id) < tuple_(*after))
+    return stmt.order_by(User.created_at.desc(), User.id.desc()).limit(limit)
+
+
+def list_users(
+    db: Session,
+    limit: int,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[User]:
+    """Return up to `limit` users after the keyset position `after`."""
+    return list(db.scalars(list_users_statement(limit, after, filters)))
+
+
+def table_estimate_statement(dialect_name: str):
+    """Planner/rowid based row estimate for the users table, or None if unsupported."""
+    if dialect_name == "postgresql":
+        return text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)").bindparams(
+            name=User.__tablename__
+        )
+    if dialect_name == "sqlite":
+        return text(f"SELECT max(rowid) FROM {User.__tablename__}")
+    return None
+
+
+def bounded_count_statement(conditions: list, cap: int):
+    """COUNT over at most `cap` matching rows: exact below the cap, `cap` above it."""
+    return select(func.count()).select_from(
+        select(User.id).where(*conditions).limit(cap).subquery()
+    )
+
+
+def estimate_user_count(db: Session, filters: Optional[Dict[str, Any]] = None, cap: int = 10000) -> int:
+    """
+    Estimated number of users matching filters without a full COUNT(*).
+    Unfiltered: table statistics (Postgres reltuples, SQLite max(rowid)).
+    Filtered: a count bounded by `cap`.
+    """
+    conditions = user_list_conditions(filters)
+    if not conditions:
+        stmt = table_estimate_statement(db.get_bind().dialect.name)
+        estimate = db.scalar(stmt) if stmt is not None else None
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+    return db.scalar(bounded_count_statement(conditions, cap))
+
+
+# -----------------------------
+# Bulk updates (set-based, chunked)
+# -----------------------------
+
+
+def bulk_update_statement(user_ids: List[UUID], values: Dict[str, Any], now: datetime):
+    """
+    One UPDATE ... WHERE id IN (...) for a chunk of ids, returning the ids
+    that actually changed. Rows already holding every value are skipped, so
+    repeating a bulk operation is idempotent and writes nothing twice.
+    """
+    changed = or_(*[getattr(User, key).is_distinct_from(value) for key, value in values.items()])
+    return (
+        update(User)
+        .where(User.id.in_(user_ids), changed)
+        .values(**values, updated_at=now)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def iter_bulk_update_users(
+    db: Session,
+    user_ids: List[UUID],
+    values: Dict[str, Any],
+    chunk_size: int = 1000,
+) -> Iterator[Tuple[int, List[UUID]]]:
+    """
+    Apply values to user_ids in chunks of chunk_size, committing each chunk.
+    Yields (ids processed in the chunk, ids changed) after every commit.
+    Chunks already committed stay committed if a later one fails.
+    """
+    now = datetime.now(timezone.utc)
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        try:
+            changed = list(db.scalars(bulk_update_statement(chunk, values, now)))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise DatabaseError("Unexpected database error during bulk user update") from e
+        yield len(chunk), changed
+
+
+# -----------------------------
+# Bulk import (batched executemany)
+# -----------------------------
+
+
+def registered_identities(db: Session, emails: List[str], phone_numbers: List[str]) -> Tuple[set, set]:
+    """Emails and phone numbers among the given ones that are already registered."""
+    emails_taken = set(db.scalars(select(User.email).where(User.email.in_(emails)))) if emails else set()
+    phones_taken = (
+        set(db.scalars(select(User.phone_number).where(User.phone_number.in_(phone_numbers))))
+        if phone_numbers else set()
+    )
+    return emails_taken, phones_taken
+
+
+def insert_users_batch(db: Session, users: List[Dict[str, Any]], profiles: List[Dict[str, Any]]) -> set:
+    """
+    Insert users and their profiles with one executemany each and commit.
+    Users colliding with an existing email / phone number (including within
+    the batch) are skipped via ON CONFLICT DO NOTHING rather than failing the
+    batch; their profiles are not inserted. Returns the ids actually inserted.
+    """
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    try:
+        inserted = set(db.scalars(
+            dialect_insert(User).on_conflict_do_nothing().returning(User.id), users
+        ))
+        profiles = [profile for profile in profiles if profile["id"] in inserted]
+        if profiles:
+            db.execute(insert(UserProfile), profiles)
+        db.commit()
+        return inserted
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise DatabaseError("Unexpected database error during bulk user import") from e
+
+
+# -----------------------------
+# Export (streamed, keyset-resumable)
+# -----------------------------
+
+# Never exported
+EXPORT_EXCLUDED_COLUMNS = frozenset({"password_hash"})
+
+
+def export_columns() -> list:
+    """users columns (minus secrets) then user_profiles columns, labelled uniquely."""
+    user_columns = [column for column in User.__table__.columns if column.key not in EXPORT_EXCLUDED_COLUMNS]
+    profile_columns = [
+        column.label(f"profile_{column.key}") for column in UserProfile.__table__.columns if column.key != "id"
+    ]
+    return user_columns + profile_columns
+
+
+def export_users_statement(
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[UUID] = None,
+    yield_per: int = 1000,
+):
+    """
+    Users LEFT JOIN profiles as plain rows (no ORM identity map) in id order,
+    starting strictly after `after`, fetched yield_per rows at a time through
+    a server-side cursor where the driver supports one.
+    """
+    stmt = (
+        select(*export_columns())
+        .select_from(User)
+        .outerjoin(UserProfile, UserProfile.id == User.id)
+        .where(*user_list_conditions(filters))
+    )
+    if after is not None:
+        stmt = stmt.where(User.id > after)
+    return stmt.order_by(User.id).execution_options(yield_per=yield_per, stream_results=True)
@@ -1,35 +1,8 @@
 # app/database/connection.py
-import os
 import importlib
-from typing import Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
-
-# Choose engine options depending on driver
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite needs check_same_thread when used with multiple threads (FastAPI dev server)
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    # For postgres/mysql/etc.
-    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def get_db() -> Generator[Session, None, None]:
-    """
-    FastAPI dependency that yields a SQLAlchemy Session and closes it afterwards.
-    Usage:
-        db: Session = Depends(get_db)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# One engine for the whole app, built by the factory in app.core.database
+from app.core.config import engine, SessionLocal, get_db  # noqa: F401
 
 
 def create_tables() -> None:
@@ -0,0 +1,71 @@
+# app/database/migrations.py
+"""
+Startup schema upgrade for databases created by an earlier version.
+
+Base.metadata.create_all only creates tables that do not exist yet: a
+column or index added to an existing table (user_profiles.version, the
+keyset indexes on users) never reaches a database created before it, and
+neither does DDL hooked to the table's "after_create" event (the Postgres
+json_merge_patch function). upgrade_schema runs create_all and then
+applies those changes idempotently, so it is safe on every start.
+
+Tables that are new to an existing database (search documents, health
+terms, user stats) get their triggers from create_all, but rows written
+before the upgrade are only indexed by the seed jobs in
+app.services.maintenance_service.
+
+user_stats from before the counters were sharded (no "shard" column) is
+dropped with its triggers and recreated; the counters are derived data and
+seed_user_stats recounts them at startup.
+"""
+
+import logging
+
+from sqlalchemy import DDL, Engine, inspect, text
+
+from app.core.config import Base
+from app.models import auth_models, user_models  # noqa: F401  (register tables on Base.metadata)
+
+logger = logging.getLogger(__name__)
+
+# (table, column, column DDL) added to tables that already existed; the DDL
+# carries a default so existing rows are backfilled by ADD COLUMN itself
+ADDED_COLUMNS = [
+    ("user_profiles", "version", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+
+# SQLite user_stats triggers, created IF NOT EXISTS: an old body would survive a recreate
+SQLITE_USER_STATS_TRIGGERS = [
+    f"{table}_stats_{event_name}" for table in ("users", "user_profiles") for event_name in ("ai", "au", "ad")
+]
+
+
+def _reshard_user_stats(conn) -> None:
+    """Recreate an unsharded user_stats table (and its triggers)."""
+    if "shard" in {column["name"] for column in inspect(conn).get_columns("user_stats")}:
+        return
+    logger.info("Recreating user_stats with sharded counters")
+    if conn.dialect.name == "sqlite":
+        for trigger in SQLITE_USER_STATS_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    user_models.UserStat.__table__.drop(conn)
+    user_models.UserStat.__table__.create(conn)
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Create missing tables, then add missing columns, indexes and functions."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        _reshard_user_stats(conn)
+        inspector = inspect(conn)
+        for table, column, ddl in ADDED_COLUMNS:
+            if column not in {existing["name"] for existing in inspector.get_columns(table)}:
+                logger.info("Adding column %s.%s", table, column)
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                # CREATE INDEX IF NOT EXISTS
+                index.create(conn, checkfirst=True)
+        if conn.dialect.name == "postgresql":
+            conn.execute(DDL(user_models.POSTGRES_JSON_MERGE_PATCH_DDL))
@@ -1,11 +1,22 @@
+import uuid
+from datetime import datetime, timezone
 
-# class RefreshToken(Base):
-#     __tablename__ = "refresh_tokens"
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.config import Base
 
-#     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-#     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-#     token_hash = Column(String(255), nullable=False)
-#     revoked = Column(Boolean, default=False)
-#     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-#     expires_at = Column(DateTime, nullable=False)
-#     replaced_by_token = Column(UUID(as_uuid=True), nullable=True)  # points to new token if rotated
\ No newline at end of file
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # ---- Identity ----
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # the token's "jti" claim
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # all rotations of one login share a family
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)  # sha256 hex of the raw token
+
+    # ---- Lifecycle ----
+    revoked = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=False, index=True)
+    replaced_by_token = Column(UUID(as_uuid=True), nullable=True)  # points to new token if rotated
@@ -1,20 +1,20 @@
 import uuid
 from datetime import datetime, timezone
 import enum
-from sqlalchemy import Integer  
+from sqlalchemy import Integer, BigInteger
 
-from sqlalchemy import Column, String, Date, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Date, Boolean, DateTime, ForeignKey, JSON, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum as SqlEnum
 from app.core.config import Base
 
-class UserRole(enum.Enum):
+class UserRole(str, enum.Enum):
     user = "user"
     clinician = "clinician"
     admin = "admin"
 
-class Status(enum.Enum):
+class Status(str, enum.Enum):
     active = "active"
     banned = "banned"
     suspended = "suspended"
@@ -48,6 +48,13 @@ class User(Base):
 
     profile = relationship("UserProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
+    # ---- Keyset pagination: newest first, optionally narrowed by role/status ----
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        Index("ix_users_status_created_at_id", "status", "created_at", "id"),
+    )
+
 class UserProfile(Base):
     __tablename__ = "user_profiles"
 
@@ -72,6 +79,369 @@ class UserProfile(Base):
 
     # ---- Metadata ----
     last_updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped by every profile write; served as the ETag
 
     # ---- Relationship to User ----
     user = relationship("User", back_populates="profile", uselist=False)
+
+
+# RFC 7396 merge-patch over jsonb for profile_crud.merge_patch_values (SQLite has json_patch built in)
+POSTGRES_JSON_MERGE_PATCH_DDL = (
+    "CREATE OR REPLACE FUNCTION json_merge_patch(target jsonb, patch jsonb) RETURNS jsonb AS $$ "
+    "DECLARE item record; "
+    "BEGIN "
+    "IF patch IS NULL OR jsonb_typeof(patch) <> 'object' THEN RETURN patch; END IF; "
+    "IF target IS NULL OR jsonb_typeof(target) <> 'object' THEN target := '{}'::jsonb; END IF; "
+    "FOR item IN SELECT key, value FROM jsonb_each(patch) LOOP "
+    "IF jsonb_typeof(item.value) = 'null' THEN target := target - item.key; "
+    "ELSE target := jsonb_set(target, ARRAY[item.key], json_merge_patch(target -> item.key, item.value)); "
+    "END IF; "
+    "END LOOP; "
+    "RETURN target; "
+    "END $$ LANGUAGE plpgsql IMMUTABLE"
+)
+event.listen(
+    UserProfile.__table__, "after_create", DDL(POSTGRES_JSON_MERGE_PATCH_DDL).execute_if(dialect="postgresql")
+)
+
+
+class UserSearchDocument(Base):
+    """
+    Search text per user, maintained by database triggers on users and
+    user_profiles (see _SEARCH_DDL below); never written by the application.
+
+    public_text holds what any signed-in user may match on: the username of
+    an active account, plus full_name and location unless
+    privacy_settings.show_profile is false (the same rule as
+    ProfileService._apply_privacy_filter). private_text holds the email and
+    everything hidden from public_text, and is only searched for admins.
+    """
+    __tablename__ = "user_search_documents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
+    public_text = Column(String, nullable=False, default="")
+    private_text = Column(String, nullable=False, default="")
+
+
+# ---- Search index DDL (per dialect) ----
+# SQLite: FTS5 trigram index over user_search_documents (external content).
+# Postgres: pg_trgm GIN indexes on the two text columns.
+# Both: triggers that rebuild a user's document whenever a searchable
+# column of users / user_profiles changes.
+
+def search_document_upsert(dialect_name: str, user_id: str) -> str:
+    """
+    SQL that (re)builds the search document(s) for users matching
+    `u.id = <user_id>`; used by the triggers and by
+    search_crud.rebuild_search_index.
+    """
+    if dialect_name == "sqlite":
+        visible = "coalesce(json_extract(p.privacy_settings, '$.show_profile'), 1)"
+    else:
+        visible = "coalesce((p.privacy_settings ->> 'show_profile')::boolean, true)"
+    active = "coalesce(u.status, 'active') = 'active'"
+    hideable = "' ' || coalesce(p.full_name, '') || ' ' || coalesce(p.location, '')"
+    return (
+        "INSERT INTO user_search_documents (user_id, public_text, private_text) "
+        "SELECT u.id, "
+        f"CASE WHEN {active} THEN trim(coalesce(u.username, '') || "
+        f"CASE WHEN {visible} THEN {hideable} ELSE '' END) ELSE '' END, "
+        f"trim(coalesce(u.email, '') || CASE WHEN {active} THEN '' ELSE ' ' || coalesce(u.username, '') END || "
+        f"CASE WHEN {active} AND {visible} THEN '' ELSE {hideable} END) "
+        "FROM users u LEFT JOIN user_profiles p ON p.id = u.id "
+        f"WHERE u.id = {user_id} "
+        "ON CONFLICT (user_id) DO UPDATE SET "
+        "public_text = excluded.public_text, private_text = excluded.private_text;"
+    )
+
+
+_SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS user_search_fts USING fts5("
+    "public_text, private_text, content='user_search_documents', content_rowid='id', tokenize='trigram')",
+    # Keep the FTS index in step with its content table
+    "CREATE TRIGGER IF NOT EXISTS user_search_documents_ai AFTER INSERT ON user_search_documents BEGIN "
+    "INSERT INTO user_search_fts (rowid, public_text, private_text) VALUES (new.id, new.public_text, new.private_text); END",
+    "CREATE TRIGGER IF NOT EXISTS user_search_documents_ad AFTER DELETE ON user_search_documents BEGIN "
+    "INSERT INTO user_search_fts (user_search_fts, rowid, public_text, private_text) "
+    "VALUES ('delete', old.id, old.public_text, old.private_text); END",
+    "CREATE TRIGGER IF NOT EXISTS user_search_documents_au AFTER UPDATE ON user_search_documents BEGIN "
+    "INSERT INTO user_search_fts (user_search_fts, rowid, public_text, private_text) "
+    "VALUES ('delete', old.id, old.public_text, old.private_text); "
+    "INSERT INTO user_search_fts (rowid, public_text, private_text) VALUES (new.id, new.public_text, new.private_text); END",
+    # Source tables -> documents (SQLite does not enforce ON DELETE CASCADE by default)
+    "CREATE TRIGGER IF NOT EXISTS users_search_ai AFTER INSERT ON users BEGIN "
+    + search_document_upsert("sqlite", "new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS users_search_au AFTER UPDATE OF username, email, status ON users BEGIN "
+    + search_document_upsert("sqlite", "new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS users_search_ad AFTER DELETE ON users BEGIN "
+    "DELETE FROM user_search_documents WHERE user_id = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_search_ai AFTER INSERT ON user_profiles BEGIN "
+    + search_document_upsert("sqlite", "new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_search_au AFTER UPDATE OF full_name, location, privacy_settings "
+    "ON user_profiles BEGIN " + search_document_upsert("sqlite", "new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_search_ad AFTER DELETE ON user_profiles BEGIN "
+    + search_document_upsert("sqlite", "old.id") + " END",
+]
+
+_POSTGRES_SEARCH_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_user_search_documents_public_trgm "
+    "ON user_search_documents USING gin (public_text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_user_search_documents_private_trgm "
+    "ON user_search_documents USING gin (private_text gin_trgm_ops)",
+    "CREATE OR REPLACE FUNCTION user_search_refresh() RETURNS trigger AS $$ "
+    "DECLARE uid uuid; "
+    "BEGIN "
+    "IF TG_OP = 'DELETE' THEN uid := OLD.id; ELSE uid := NEW.id; END IF; "
+    + search_document_upsert("postgresql", "uid") +
+    " RETURN NULL; "
+    "END $$ LANGUAGE plpgsql",
+    "DROP TRIGGER IF EXISTS users_search_sync ON users",
+    "CREATE TRIGGER users_search_sync AFTER INSERT OR UPDATE OF username, email, status ON users "
+    "FOR EACH ROW EXECUTE FUNCTION user_search_refresh()",
+    "DROP TRIGGER IF EXISTS user_profiles_search_sync ON user_profiles",
+    "CREATE TRIGGER user_profiles_search_sync AFTER INSERT OR UPDATE OF full_name, location, privacy_settings "
+    "OR DELETE ON user_profiles FOR EACH ROW EXECUTE FUNCTION user_search_refresh()",
+]
+
+event.listen(
+    UserSearchDocument.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(UserSearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _POSTGRES_SEARCH_DDL:
+    event.listen(UserSearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    UserSearchDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS user_search_fts").execute_if(dialect="sqlite"),
+)
+
+
+class ProfileHealthTerm(Base):
+    """
+    One row per (condition or medication name, profile), normalized to
+    lowercase, maintained by database triggers on user_profiles (see
+    _HEALTH_TERM_DDL below); never written by the application.
+
+    The primary key (kind, term, profile_id) is the cohort index: "profiles
+    with condition X" is a range scan returning profile ids in order, and
+    per-condition counts are a GROUP BY over the same index.
+    """
+    __tablename__ = "profile_health_terms"
+
+    kind = Column(String(20), primary_key=True)        # "condition" | "medication"
+    term = Column(String(255), primary_key=True)
+    profile_id = Column(UUID(as_uuid=True), ForeignKey("user_profiles.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_profile_health_terms_profile_id", "profile_id"),
+    )
+
+
+HEALTH_TERM_KINDS = ("condition", "medication")
+
+
+def health_terms_insert(dialect_name: str, profile_id: str) -> str:
+    """
+    SQL that inserts the normalized condition and medication-name rows for
+    profiles matching `p.id = <profile_id>`; used by the triggers and by
+    cohort_crud.rebuild_health_terms. conditions is a list of strings,
+    medications a list of {"name": ...} objects (bare strings are accepted).
+    """
+    if dialect_name == "sqlite":
+        return (
+            "INSERT OR IGNORE INTO profile_health_terms (kind, term, profile_id) "
+            "SELECT kind, term, id FROM ("
+            "SELECT 'condition' AS kind, lower(trim(j.value)) AS term, p.id AS id "
+            "FROM user_profiles p, json_each(CASE WHEN json_valid(p.conditions) THEN p.conditions END) j "
+            f"WHERE p.id = {profile_id} AND j.type = 'text' "
+            "UNION "
+            "SELECT 'medication', lower(trim(CASE WHEN j.type = 'text' THEN j.value "
+            "ELSE json_extract(j.value, '$.name') END)), p.id "
+            "FROM user_profiles p, json_each(CASE WHEN json_valid(p.medications) THEN p.medications END) j "
+            f"WHERE p.id = {profile_id} AND j.type IN ('text', 'object')"
+            ") WHERE term IS NOT NULL AND term <> '';"
+        )
+    array = "CASE WHEN json_typeof({0}) = 'array' THEN {0} ELSE '[]'::json END"
+    return (
+        "INSERT INTO profile_health_terms (kind, term, profile_id) "
+        "SELECT DISTINCT kind, term, id FROM ("
+        "SELECT 'condition' AS kind, lower(btrim(e #>> '{}')) AS term, p.id AS id "
+        f"FROM user_profiles p, json_array_elements({array.format('p.conditions')}) e "
+        f"WHERE p.id = {profile_id} AND json_typeof(e) = 'string' "
+        "UNION ALL "
+        "SELECT 'medication', lower(btrim(CASE WHEN json_typeof(e) = 'string' THEN e #>> '{}' "
+        "ELSE e ->> 'name' END)), p.id "
+        f"FROM user_profiles p, json_array_elements({array.format('p.medications')}) e "
+        f"WHERE p.id = {profile_id} AND json_typeof(e) IN ('string', 'object')"
+        ") t WHERE term IS NOT NULL AND term <> '' "
+        "ON CONFLICT DO NOTHING;"
+    )
+
+
+_SQLITE_HEALTH_TERM_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_terms_ai AFTER INSERT ON user_profiles BEGIN "
+    + health_terms_insert("sqlite", "new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_terms_au AFTER UPDATE OF conditions, medications "
+    "ON user_profiles BEGIN DELETE FROM profile_health_terms WHERE profile_id = old.id; "
+    + health_terms_insert("sqlite", "new.id") + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_terms_ad AFTER DELETE ON user_profiles BEGIN "
+    "DELETE FROM profile_health_terms WHERE profile_id = old.id; END",
+]
+
+_POSTGRES_HEALTH_TERM_DDL = [
+    "CREATE OR REPLACE FUNCTION profile_health_terms_refresh() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF TG_OP = 'UPDATE' THEN DELETE FROM profile_health_terms WHERE profile_id = OLD.id; END IF; "
+    + health_terms_insert("postgresql", "NEW.id") +
+    " RETURN NULL; "
+    "END $$ LANGUAGE plpgsql",
+    "DROP TRIGGER IF EXISTS user_profiles_terms_sync ON user_profiles",
+    # Deletes are covered by ON DELETE CASCADE
+    "CREATE TRIGGER user_profiles_terms_sync AFTER INSERT OR UPDATE OF conditions, medications "
+    "ON user_profiles FOR EACH ROW EXECUTE FUNCTION profile_health_terms_refresh()",
+]
+
+for _statement in _SQLITE_HEALTH_TERM_DDL:
+    event.listen(ProfileHealthTerm.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _POSTGRES_HEALTH_TERM_DDL:
+    event.listen(ProfileHealthTerm.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
+# Rows per counter on Postgres; a writing connection adds to the shard picked by its backend pid
+USER_STATS_SHARDS = 16
+
+
+class UserStat(Base):
+    """
+    Named counters over users / user_profiles ("total", "role:<role>",
+    "status:<status>", "verified", "onboarding_completed", "profiles",
+    "profiles_with_content"), kept by database triggers inside the writing
+    transaction (see _USER_STATS_DDL below) and periodically reconciled
+    against real counts by stats_crud.reconcile_user_stats.
+
+    Triggers rather than the CRUD code: users are written by the single-row
+    CRUD functions, the set-based bulk job UPDATEs, the import's multi-row
+    INSERTs and ad hoc SQL, and a counter change depends on the row's old
+    values, which an UPDATE does not return. A trigger sees old and new rows
+    for every one of those writes at no extra round trip.
+
+    Every registration adds to "total", "role:user", "status:active" and
+    "profiles". With one row per counter, concurrent registrations on
+    Postgres would queue on those row locks until each commits, so a
+    counter is split over USER_STATS_SHARDS rows (key, shard): a writer
+    updates the shard chosen by pg_backend_pid(), concurrent connections
+    mostly land on different rows, and readers sum the shards. SQLite takes
+    a database-wide write lock anyway and always uses shard 0.
+    """
+    __tablename__ = "user_stats"
+
+    key = Column(String(64), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    value = Column(BigInteger, nullable=False, default=0)
+    reconciled_at = Column(DateTime, nullable=True)
+
+
+def _user_stat_keys(row: str) -> list:
+    return [
+        "'total'",
+        f"'role:' || {row}role",
+        f"'status:' || {row}status",
+        f"CASE WHEN {row}is_verified THEN 'verified' END",
+        f"CASE WHEN {row}onboarding_completed THEN 'onboarding_completed' END",
+    ]
+
+
+def _profile_stat_keys(row: str) -> list:
+    return [
+        "'profiles'",
+        f"CASE WHEN {row}full_name IS NOT NULL THEN 'profiles_with_content' END",
+    ]
+
+
+def stats_delta_upsert(keys, sources, shard: str = "0") -> str:
+    """
+    One statement adding the net change of every counter to user_stats.
+
+    keys(row) gives the counter-key expressions for a row prefix; sources
+    are (row prefix, FROM clause, sign) triples, e.g. ("old.", "", -1) in a
+    SQLite row trigger or ("", " FROM new_rows", 1) in a Postgres statement
+    trigger; shard is the SQL expression of the shard written to. Unchanged
+    counters net to zero and are not written; keys are written in order so
+    concurrent writers lock counter rows in the same order.
+    """
+    selects = [
+        f"SELECT {key} AS key, {sign} AS delta{from_clause}"
+        for prefix, from_clause, sign in sources
+        for key in keys(prefix)
+    ]
+    return (
+        "INSERT INTO user_stats (key, shard, value) "
+        f"SELECT key, {shard}, sum(delta) FROM (" + " UNION ALL ".join(selects) + ") d "
+        "WHERE key IS NOT NULL GROUP BY key HAVING sum(delta) <> 0 ORDER BY key "
+        "ON CONFLICT (key, shard) DO UPDATE SET value = user_stats.value + excluded.value;"
+    )
+
+
+_SQLITE_USER_STATS_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS users_stats_ai AFTER INSERT ON users BEGIN "
+    + stats_delta_upsert(_user_stat_keys, [("new.", "", 1)]) + " END",
+    "CREATE TRIGGER IF NOT EXISTS users_stats_au AFTER UPDATE OF role, status, is_verified, onboarding_completed "
+    "ON users BEGIN " + stats_delta_upsert(_user_stat_keys, [("old.", "", -1), ("new.", "", 1)]) + " END",
+    "CREATE TRIGGER IF NOT EXISTS users_stats_ad AFTER DELETE ON users BEGIN "
+    + stats_delta_upsert(_user_stat_keys, [("old.", "", -1)]) + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_stats_ai AFTER INSERT ON user_profiles BEGIN "
+    + stats_delta_upsert(_profile_stat_keys, [("new.", "", 1)]) + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_stats_au AFTER UPDATE OF full_name ON user_profiles BEGIN "
+    + stats_delta_upsert(_profile_stat_keys, [("old.", "", -1), ("new.", "", 1)]) + " END",
+    "CREATE TRIGGER IF NOT EXISTS user_profiles_stats_ad AFTER DELETE ON user_profiles BEGIN "
+    + stats_delta_upsert(_profile_stat_keys, [("old.", "", -1)]) + " END",
+]
+
+
+def _postgres_stats_trigger(table: str, keys) -> list:
+    """
+    Statement-level triggers with transition tables: a bulk write of n rows
+    costs one aggregate and one upsert per touched counter, not n upserts.
+    """
+    function = f"{table}_stats_refresh"
+    shard = f"pg_backend_pid() % {USER_STATS_SHARDS}"
+    body = (
+        "IF TG_OP = 'INSERT' THEN " + stats_delta_upsert(keys, [("", " FROM new_rows", 1)], shard) + " "
+        "ELSIF TG_OP = 'UPDATE' THEN "
+        + stats_delta_upsert(keys, [("", " FROM old_rows", -1), ("", " FROM new_rows", 1)], shard) + " "
+        "ELSE " + stats_delta_upsert(keys, [("", " FROM old_rows", -1)], shard) + " END IF; "
+    )
+    statements = [
+        f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$ "
+        f"BEGIN {body}RETURN NULL; END $$ LANGUAGE plpgsql",
+    ]
+    for event_name, referencing in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ):
+        trigger = f"{table}_stats_{event_name.lower()}"
+        statements += [
+            f"DROP TRIGGER IF EXISTS {trigger} ON {table}",
+            f"CREATE TRIGGER {trigger} AFTER {event_name} ON {table} REFERENCING {referencing} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()",
+        ]
+    return statements
+
+
+_POSTGRES_USER_STATS_DDL = (
+    _postgres_stats_trigger("users", _user_stat_keys)
+    + _postgres_stats_trigger("user_profiles", _profile_stat_keys)
+)
+
+# The triggers live on users / user_profiles, so create user_stats after them
+UserStat.__table__.add_is_dependent_on(User.__table__)
+UserStat.__table__.add_is_dependent_on(UserProfile.__table__)
+for _statement in _SQLITE_USER_STATS_DDL:
+    event.listen(UserStat.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _POSTGRES_USER_STATS_DDL:
+    event.listen(UserStat.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -1,7 +1,7 @@
 from typing import Optional, List, Dict, Annotated
-from pydantic import BaseModel, EmailStr, Field, field_validator 
+from pydantic import BaseModel, EmailStr, Field, PlainSerializer, TypeAdapter, field_validator 
 from enum import Enum
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from uuid import UUID
 
 #-----------------------------
@@ -21,6 +21,19 @@ class Status(str, Enum):
     suspended = "suspended"
     deactivated = "deactivated"
 
+
+def _as_stored(value: datetime) -> datetime:
+    """Timestamps as the database stores them: naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Timestamp columns in responses. Values read back from the database are naive UTC;
+# ones just written from Python (registration, RETURNING-less writes, the login
+# touch) are aware. Both serialize the same way.
+StoredDateTime = Annotated[datetime, PlainSerializer(_as_stored, return_type=datetime)]
+
 #-----------------------------
 # User Schemas
 #-----------------------------
@@ -66,7 +79,9 @@ class UserOut(BaseModel):
     # ---- Core fields ----
     id: Annotated[UUID, Field(description="The unique identifier for the user")]
     username: Annotated[str, Field(description="The username for the user")]
-    email: Annotated[EmailStr, Field(description="The email address for the user")]
+    # Validated as EmailStr on the way in (UserCreate / UserUpdate); re-checking stored
+    # addresses with email-validator dominated building list responses
+    email: Annotated[str, Field(description="The email address for the user", json_schema_extra={"format": "email"})]
     phone_number: Annotated[Optional[str], Field(description="The phone number for the user")]
     role: Annotated[UserRole, Field(description="The role of the user")]
     
@@ -74,18 +89,25 @@ class UserOut(BaseModel):
     status: Annotated[Optional[Status], Field(default=Status.active)]
     is_verified: Annotated[bool, Field(description="Whether the user is verified")]
     onboarding_completed: Annotated[bool, Field(description="Whether the user has completed onboarding")]
-    created_at: Annotated[datetime, Field(description="The date and time the user was created")]
-    updated_at: Annotated[datetime, Field(description="The date and time the user was updated")]
+    created_at: Annotated[StoredDateTime, Field(description="The date and time the user was created")]
+    updated_at: Annotated[StoredDateTime, Field(description="The date and time the user was updated")]
     
     # ---- Security & login tracking ----
-    last_login_at: Annotated[Optional[datetime], Field(description="The date and time the user last logged in")]
+    last_login_at: Annotated[Optional[StoredDateTime], Field(description="The date and time the user last logged in")]
     failed_login_attempts: Annotated[int, Field(description="Number of consecutive failed login attempts")]
-    lockout_until: Annotated[Optional[datetime], Field(description="If set, the user is locked out until this time")]
-    password_changed_at: Annotated[Optional[datetime], Field(description="The date and time the password was last changed")]
+    lockout_until: Annotated[Optional[StoredDateTime], Field(description="If set, the user is locked out until this time")]
+    password_changed_at: Annotated[Optional[StoredDateTime], Field(description="The date and time the password was last changed")]
     
     class Config:
         from_attributes = True
 
+class UserPage(BaseModel):
+    """One page of the admin user listing (keyset pagination)."""
+    items: Annotated[List[UserOut], Field(description="Users on this page, newest first")]
+    next_cursor: Annotated[Optional[str], Field(description="Opaque cursor for the next page; null on the last page")] = None
+    estimated_total: Annotated[Optional[int], Field(description="Estimated number of matching users (planner statistics or a capped count)")] = None
+
+
 class UserOutwithPassword(UserOut):
     id: Annotated[UUID, Field(description="The unique identifier for the user")]
     password_hash: Annotated[str, Field(description="The hashed password for the user")]
@@ -162,7 +184,8 @@ class ProfileOut(BaseModel):
     privacy_settings: Annotated[Optional[Dict[str, bool]], Field(description="Privacy settings, e.g., {'show_profile': false}")]
     
     # ---- Metadata ----
-    last_updated_at: Annotated[datetime, Field(description="The date and time the profile was last updated")]   
+    last_updated_at: Annotated[StoredDateTime, Field(description="The date and time the profile was last updated")]   
+    version: Annotated[Optional[int], Field(description="Profile version, bumped by every write; the ETag of /me/profile")] = None
     
     class Config:
         from_attributes = True
@@ -176,4 +199,74 @@ class UserWithProfileOut(UserOut):
     profile: Optional[ProfileOut] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CohortPage(BaseModel):
+    """One page of a clinician cohort query (keyset pagination by profile id)."""
+    items: Annotated[List[ProfileOut], Field(description="Matching profiles on this page")]
+    next_cursor: Annotated[Optional[str], Field(description="Opaque cursor for the next page; null on the last page")] = None
+
+
+class TermFacet(BaseModel):
+    """Number of profiles carrying one condition or medication."""
+    term: Annotated[str, Field(description="Normalized (lowercase) condition or medication name")]
+    count: Annotated[int, Field(description="Number of matching profiles")]
+
+
+class UserStatsOverview(BaseModel):
+    """Admin statistics overview, served from maintained counters."""
+    total_users: Annotated[int, Field(description="All user accounts")]
+    active_users: Annotated[int, Field(description="Accounts with status active")]
+    verified_users: Annotated[int, Field(description="Accounts with a verified email")]
+    onboarding_completed: Annotated[int, Field(description="Accounts that finished onboarding")]
+    profiles: Annotated[int, Field(description="Profile rows")]
+    profiles_completed: Annotated[int, Field(description="Profiles with content (full_name set)")]
+    by_role: Annotated[Dict[str, int], Field(description="Accounts per role")]
+    by_status: Annotated[Dict[str, int], Field(description="Accounts per status")]
+    last_reconciled_at: Annotated[Optional[StoredDateTime], Field(description="When the counters were last checked against real counts")] = None
+
+
+class BulkUserIds(BaseModel):
+    """Target accounts of a bulk admin operation."""
+    user_ids: Annotated[List[UUID], Field(min_length=1, description="Accounts to change; duplicates are ignored")]
+
+
+class BulkUserUpdate(BulkUserIds):
+    """Bulk status / role / verification change; at least one field is required."""
+    status: Annotated[Optional[Status], Field(description="New account status")] = None
+    role: Annotated[Optional[UserRole], Field(description="New role")] = None
+    is_verified: Annotated[Optional[bool], Field(description="New verification flag")] = None
+
+
+class JobOut(BaseModel):
+    """Progress of a background job."""
+    job_id: Annotated[UUID, Field(description="Poll GET /users/bulk/jobs/{job_id} for progress")]
+    kind: Annotated[str, Field(description="Job type, e.g. bulk_update")]
+    status: Annotated[str, Field(description="pending, running, completed or failed")]
+    total: Annotated[int, Field(description="Items to process (an estimate until a streaming job finishes)")]
+    processed: Annotated[int, Field(description="Items processed so far")]
+    affected: Annotated[int, Field(description="Items actually changed so far")]
+    failed: Annotated[int, Field(description="Items rejected so far (see the job's error report)")] = 0
+    error: Annotated[Optional[str], Field(description="Failure reason for failed jobs")] = None
+    created_at: Annotated[datetime, Field(description="When the job was accepted")]
+    finished_at: Annotated[Optional[datetime], Field(description="When the job completed or failed")] = None
+
+    @classmethod
+    def from_job(cls, job) -> "JobOut":
+        return cls(
+            job_id=job.id, kind=job.kind, status=job.status, total=job.total,
+            processed=job.processed, affected=job.affected, failed=job.failed, error=job.error,
+            created_at=job.created_at, finished_at=job.finished_at,
+        )
+
+
+#-----------------------------
+# List adapters
+#-----------------------------
+
+# Compiled once at import: validate a list of ORM rows in one call
+# (validate_python(rows, from_attributes=True)) and serialize a list response
+# (app.core.responses.list_response) without building an adapter per request.
+USER_OUT_LIST = TypeAdapter(List[UserOut])
+PROFILE_OUT_LIST = TypeAdapter(List[ProfileOut])
+TERM_FACET_LIST = TypeAdapter(List[TermFacet])
@@ -0,0 +1,140 @@
+# app/scripts/bench_async_db.py
+"""
+Load test: concurrent user lookups on the sync vs async database path.
+
+Runs --concurrency asyncio tasks that each perform --requests primary-key
+lookups, once with the blocking Session (as the routes used to, directly on
+the event loop) and once with AsyncSession. --latency-ms adds a simulated
+network round trip to every statement, the way a remote Postgres would;
+SQLite on local disk has almost none, which hides the difference. The delay
+runs inside the driver (SQLite trace callback), so it blocks whichever thread
+executes the statement: the event loop for Session, aiosqlite's worker
+thread for AsyncSession. "loop lag" is the worst delay seen by a 1 ms ticker
+task, i.e. how long other requests would have been stalled.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_async_db --concurrency 50 --requests 20 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.util import await_only  # noqa: E402
+
+from app.core.config import Base, AsyncSessionLocal, SessionLocal, async_engine, engine  # noqa: E402
+from app.crud import async_user_crud, user_crud  # noqa: E402
+from app.models import auth_models, user_models  # noqa: E402,F401
+
+
+def add_latency(target_engine, latency_s: float, is_async: bool) -> None:
+    """Sleep in the driver on every statement to simulate a server round trip."""
+    if latency_s <= 0:
+        return
+
+    def _sleep(statement):
+        time.sleep(latency_s)
+
+    @event.listens_for(target_engine, "connect")
+    def _install(dbapi_connection, connection_record):
+        if is_async:
+            await_only(dbapi_connection.driver_connection.set_trace_callback(_sleep))
+        else:
+            dbapi_connection.set_trace_callback(_sleep)
+
+
+def seed(users: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        return [
+            user_crud.create_user(
+                db,
+                username=f"bench{i}",
+                email=f"bench{i}@example.com",
+                phone_number=None,
+                password_hash="x",
+            ).id
+            for i in range(users)
+        ]
+    finally:
+        db.close()
+
+
+async def sync_worker(user_ids, requests, latencies):
+    for i in range(requests):
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            user_crud.get_user_by_id(db, user_ids[i % len(user_ids)])
+        finally:
+            db.close()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+
+async def async_worker(user_ids, requests, latencies):
+    for i in range(requests):
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await async_user_crud.get_user_by_id(db, user_ids[i % len(user_ids)])
+        latencies.append(time.perf_counter() - start)
+
+
+async def ticker(stop: asyncio.Event, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def run(label, worker, user_ids, args):
+    latencies, lags = [], [0.0]
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(user_ids, args.requests, latencies) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<22} {len(latencies) / elapsed:>9.1f} req/s "
+        f"p50 {statistics.median(latencies) * 1e3:>8.2f} ms  p99 {p99 * 1e3:>8.2f} ms  "
+        f"loop lag {max(lags) * 1e3:>8.2f} ms"
+    )
+
+
+async def bench(args):
+    user_ids = seed(100)
+    engine.dispose()  # latency applies to connections opened from here on
+    add_latency(engine, args.latency_ms / 1000, is_async=False)
+    add_latency(async_engine.sync_engine, args.latency_ms / 1000, is_async=True)
+
+    # Warm both pools
+    await run("warmup", async_worker, user_ids, argparse.Namespace(concurrency=1, requests=1))
+    print(f"concurrency={args.concurrency} requests/task={args.requests} latency={args.latency_ms}ms")
+    await run("sync Session", sync_worker, user_ids, args)
+    await run("AsyncSession", async_worker, user_ids, args)
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
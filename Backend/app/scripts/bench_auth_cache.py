@@ -0,0 +1,99 @@
+# app/scripts/bench_auth_cache.py
+"""
+Benchmark: DB statements and latency per authenticated request.
+
+Compares the legacy auth path (verify_token + get_user_by_id, both hitting
+the users table) with the cached AuthSnapshot path used by get_current_user.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_auth_cache --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from uuid import UUID
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.config import Base, AsyncSessionLocal, async_engine, engine  # noqa: E402
+from app.core.auth_cache import auth_cache  # noqa: E402
+from app.crud.async_user_crud import create_user, get_user_by_id  # noqa: E402
+from app.services.auth_service import AuthService  # noqa: E402
+
+
+class StatementCounter:
+    """Counts statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def legacy_current_user(service: AuthService, token: str):
+    """The pre-cache path: decode, check existence, then load the user again."""
+    payload = service.verify_token(token)
+    user_id = UUID(payload["sub"])
+    await get_user_by_id(service.db, user_id)
+    return await get_user_by_id(service.db, user_id)
+
+
+async def run(label, fn, requests, counter):
+    counter.count = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        await fn()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<22} {counter.count / requests:>6.2f} queries/request "
+        f"{elapsed / requests * 1e6:>9.1f} us/request"
+    )
+
+
+async def bench(args):
+    Base.metadata.create_all(bind=engine)
+    db = AsyncSessionLocal()
+    user = await create_user(
+        db,
+        username="bench",
+        email="bench@example.com",
+        phone_number=None,
+        password_hash="x",
+    )
+    service = AuthService(db)
+    token = service.create_access_token({"sub": str(user.id), "email": user.email})
+
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    await run("before (legacy)", lambda: legacy_current_user(service, token), args.requests, counter)
+
+    async def cold():
+        auth_cache.clear()
+        await service.get_current_user_from_token(token)
+
+    await run("after (cache miss)", cold, args.requests, counter)
+    auth_cache.clear()
+    await run("after (cache hit)", lambda: service.get_current_user_from_token(token), args.requests, counter)
+
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+    await db.close()
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# app/scripts/bench_compression.py
+"""
+Benchmark: bytes on the wire vs CPU for response compression.
+
+Seeds --users rows and fetches two payloads from the application
+uncompressed: an admin list page of --limit users (one complete body) and
+the NDJSON user export, which is replayed in export_service.CHUNK_ROWS-row
+chunks with a flush after each, as CompressionMiddleware sends streaming
+responses. Every coding is run at a few levels. The configured level is marked *.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_compression --users 20000 --limit 1000
+"""
+
+import argparse
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.compression import CODECS  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.scripts.bench_response_serialization import admin_headers  # noqa: E402
+from app.scripts.bench_user_listing import seed, timed  # noqa: E402
+from app.services.export_service import CHUNK_ROWS  # noqa: E402
+from main import app  # noqa: E402
+
+LEVELS = {
+    "zstd": (1, settings.COMPRESSION_ZSTD_LEVEL, 9, 19),
+    "br": (1, settings.COMPRESSION_BROTLI_QUALITY, 6, 11),
+    "gzip": (1, settings.COMPRESSION_GZIP_LEVEL, 9),
+}
+CONFIGURED = {
+    "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    "br": settings.COMPRESSION_BROTLI_QUALITY,
+    "gzip": settings.COMPRESSION_GZIP_LEVEL,
+}
+
+
+def compress_chunks(codec, level: int, chunks) -> int:
+    """Compressed size of a body sent as chunks (one complete body is a single chunk)."""
+    compressor = codec(level)
+    size = 0
+    for i, chunk in enumerate(chunks):
+        size += len(compressor.compress(chunk, i == len(chunks) - 1))
+    return size
+
+
+def report(label: str, chunks, repeat: int) -> None:
+    total = sum(len(chunk) for chunk in chunks)
+    print(f"\n{label}: {total} bytes in {len(chunks)} chunk(s)")
+    print(f"{'coding':<8} {'level':>6} {'bytes':>10} {'ratio':>7} {'ms':>8} {'MB/s':>8}")
+    for coding, codec in CODECS.items():
+        for level in sorted(set(LEVELS[coding])):
+            size = compress_chunks(codec, level, chunks)
+            ms = timed(lambda: compress_chunks(codec, level, chunks), repeat)
+            mark = "*" if level == CONFIGURED[coding] else " "
+            print(
+                f"{coding:<8} {level:>5}{mark} {size:>10} {total / size:>6.1f}x "
+                f"{ms:>8.2f} {total / ms / 1000:>8.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    identity = {"Accept-Encoding": "identity"}
+    with TestClient(app) as client:
+        seed(args.users)
+        headers = {**admin_headers(client), **identity}
+        page = client.get(f"/api/v1/users/?limit={args.limit}", headers=headers)
+        page.raise_for_status()
+        export = client.get("/api/v1/users/export?format=ndjson", headers=headers)
+        export.raise_for_status()
+
+    lines = export.content.splitlines(keepends=True)
+    export_chunks = [b"".join(lines[i:i + CHUNK_ROWS]) for i in range(0, len(lines), CHUNK_ROWS)]
+
+    report(f"GET /users/?limit={args.limit}", [page.content], args.repeat)
+    report("GET /users/export?format=ndjson (streamed)", export_chunks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# app/scripts/bench_jwt.py
+"""
+Microbenchmark: per-request access-token decode cost.
+
+Compares python-jose (if installed), a plain PyJWT decode, and the
+TokenCodec verified-claims cache hit path used by verify_token.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_jwt --iterations 20000
+"""
+
+import argparse
+import time
+import uuid
+import warnings
+
+import jwt
+
+from app.core.config import settings
+from app.core.tokens import access_token_codec
+
+warnings.filterwarnings("ignore", module="jwt")
+
+
+def bench(label: str, fn, iterations: int) -> None:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - start) / iterations
+    print(f"{label:<30} {per_call * 1e6:>8.2f} us/decode")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = access_token_codec.encode({"sub": str(uuid.uuid4()), "email": "bench@example.com"})
+    algorithms = [settings.ALGORITHM]
+
+    try:
+        from jose import jwt as jose_jwt
+    except ImportError:
+        print(f"{'python-jose':<30} not installed")
+    else:
+        bench("python-jose decode", lambda: jose_jwt.decode(token, settings.SECRET_KEY, algorithms=algorithms), args.iterations)
+
+    bench("pyjwt decode", lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=algorithms), args.iterations)
+    bench("TokenCodec (cache hit)", lambda: access_token_codec.decode(token), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
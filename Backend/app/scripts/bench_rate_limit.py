@@ -0,0 +1,82 @@
+# app/scripts/bench_rate_limit.py
+"""
+Microbenchmark: rate limiter cost per check with many distinct keys.
+
+The legacy dict-rebuilding RateLimiter (tests/deps.py) is O(total keys) per
+check, so it is measured at a small key count and extrapolated; the sharded
+MemoryBackend algorithms are measured at the full key count.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_rate_limit --keys 1000000
+"""
+
+import argparse
+import time
+
+from app.core.rate_limit import (
+    MemoryBackend,
+    RateLimiter,
+    SlidingWindowCounter,
+    TokenBucket,
+)
+
+
+class LegacyRateLimiter:
+    """Copy of the fixed-window sketch that rebuilds its dict on every check."""
+
+    def __init__(self, max_requests: int = 100, window_seconds: int = 3600):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.requests = {}
+
+    def is_allowed(self, key: str) -> bool:
+        now = time.time()
+        self.requests = {
+            k: v for k, v in self.requests.items()
+            if now - v['first_request'] < self.window_seconds
+        }
+        if key not in self.requests:
+            self.requests[key] = {'count': 1, 'first_request': now}
+            return True
+        if self.requests[key]['count'] >= self.max_requests:
+            return False
+        self.requests[key]['count'] += 1
+        return True
+
+
+def bench(label: str, check, keys: int) -> float:
+    start = time.perf_counter()
+    for i in range(keys):
+        check(f"203.0.113.{i}")
+    per_check = (time.perf_counter() - start) / keys
+    print(f"{label:<34} {keys:>9} keys {per_check * 1e6:>10.2f} us/check")
+    return per_check
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--legacy-keys", type=int, default=5_000)
+    args = parser.parse_args()
+
+    legacy = LegacyRateLimiter()
+    per_check = bench("legacy fixed window (O(n))", legacy.is_allowed, args.legacy_keys)
+    # Average dict size during the legacy run is keys/2; cost scales linearly
+    extrapolated = per_check * args.keys / args.legacy_keys
+    print(f"{'legacy extrapolated':<34} {args.keys:>9} keys {extrapolated * 1e6:>10.2f} us/check")
+
+    for name, algorithm in (
+        ("sliding window counter (memory)", SlidingWindowCounter(10, 60)),
+        ("token bucket (memory)", TokenBucket(10, 60)),
+    ):
+        backend = MemoryBackend()
+        limiter = RateLimiter("bench", algorithm, backend)
+        bench(name, limiter.hit, args.keys)
+        start = time.perf_counter()
+        for _ in range(backend.shards):
+            backend.sweep(time.time() + 3600)
+        print(f"{'  full sweep of expired keys':<34} {args.keys:>9} keys {(time.perf_counter() - start) * 1e3:>10.2f} ms total")
+
+
+if __name__ == "__main__":
+    main()
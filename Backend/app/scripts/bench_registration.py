@@ -0,0 +1,108 @@
+# app/scripts/bench_registration.py
+"""
+Benchmark: registrations per second, excluding password hashing.
+
+Compares the previous registration path (SELECT by email, SELECT by phone,
+INSERT user + commit + refresh, INSERT profile + commit + refresh, then
+model -> dict -> model) with async_user_crud.create_user_with_profile (one
+transaction, one flush, uniqueness left to the database). A precomputed hash
+is used so bcrypt cost does not dominate.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_registration --users 2000 --concurrency 1
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.config import Base, AsyncSessionLocal, async_engine, engine  # noqa: E402
+from app.crud import async_profile_crud, async_user_crud  # noqa: E402
+from app.models import auth_models, user_models  # noqa: E402,F401
+from app.schemas.user_schema import ProfileCreate, ProfileOut, UserOut, UserWithProfileOut  # noqa: E402
+
+PASSWORD_HASH = "$2b$12$" + "x" * 53
+
+
+class StatementCounter:
+    """Counts statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def legacy_register(db, i: int, prefix: str):
+    email, phone = f"{prefix}{i}@example.com", f"{prefix}{i:09d}"
+    if await async_user_crud.get_user_by_email(db, email):
+        raise RuntimeError("duplicate email")
+    if await async_user_crud.get_user_by_phone(db, phone):
+        raise RuntimeError("duplicate phone")
+    user = await async_user_crud.create_user(db, f"{prefix}{i}", email, phone, PASSWORD_HASH)
+    profile = await async_profile_crud.create_profile(db, user_id=user.id, profile_create=ProfileCreate())
+    user_dict = UserOut.model_validate(user).model_dump()
+    user_dict["profile"] = ProfileOut.model_validate(profile).model_dump()
+    return UserWithProfileOut(**user_dict)
+
+
+async def single_transaction_register(db, i: int, prefix: str):
+    user = await async_user_crud.create_user_with_profile(
+        db,
+        username=f"{prefix}{i}",
+        email=f"{prefix}{i}@example.com",
+        phone_number=f"{prefix}{i:09d}",
+        password_hash=PASSWORD_HASH,
+        profile_create=ProfileCreate(),
+    )
+    return UserWithProfileOut.model_validate(user)
+
+
+async def run(label, register, prefix, args, counter):
+    counter.count = 0
+    queue = iter(range(args.users))
+
+    async def worker():
+        for i in queue:
+            async with AsyncSessionLocal() as db:
+                await register(db, i, prefix)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<22} {args.users / elapsed:>9.1f} registrations/s "
+        f"{counter.count / args.users:>5.1f} statements/registration"
+    )
+
+
+async def bench(args):
+    Base.metadata.create_all(bind=engine)
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    await run("before (6+ statements)", legacy_register, "1", args, counter)
+    await run("after (one transaction)", single_transaction_register, "2", args, counter)
+
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# app/scripts/bench_response_serialization.py
+"""
+Benchmark: share of serialization in the admin user listing's latency.
+
+Seeds --users rows, then times GET /users/?limit=--limit end to end through
+the application, and separately the two serialization stages of that
+response on the same rows:
+
+- building the models: UserOut.model_validate per row vs one call of the
+  precompiled USER_OUT_LIST adapter,
+- writing the body: FastAPI's response_model path (validate the UserPage
+  again, then dump it) vs model_response, which only dumps it.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_response_serialization --users 20000 --limit 1000
+"""
+
+import argparse
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import update  # noqa: E402
+
+from app.core.config import SessionLocal  # noqa: E402
+from app.core.responses import model_response  # noqa: E402
+from app.crud import user_crud  # noqa: E402
+from app.models.user_models import User, UserRole  # noqa: E402
+from app.schemas.user_schema import USER_OUT_LIST, UserOut, UserPage  # noqa: E402
+from app.scripts.bench_user_listing import seed, timed  # noqa: E402
+from main import app  # noqa: E402
+
+PASSWORD = "Bench-Passw0rd"
+
+
+def admin_headers(client: TestClient) -> dict:
+    email = "benchadmin@example.com"
+    client.post(
+        "/api/v1/users/register",
+        json={"username": "benchadmin", "email": email, "phone_number": None, "password": PASSWORD},
+    ).raise_for_status()
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.email == email).values(role=UserRole.admin))
+        db.commit()
+    response = client.post("/api/v1/users/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        seed(args.users)
+        headers = admin_headers(client)
+        url = f"/api/v1/users/?limit={args.limit}"
+        client.get(url, headers=headers).raise_for_status()  # warm caches
+        request_ms = timed(lambda: client.get(url, headers=headers), args.repeat)
+
+    with SessionLocal() as db:
+        rows = user_crud.list_users(db, args.limit)
+    page_adapter = TypeAdapter(UserPage)  # what FastAPI compiles for response_model=UserPage
+    page = UserPage(items=USER_OUT_LIST.validate_python(rows, from_attributes=True))
+
+    stages = [
+        ("models: model_validate per row", lambda: [UserOut.model_validate(row) for row in rows]),
+        ("models: USER_OUT_LIST adapter", lambda: USER_OUT_LIST.validate_python(rows, from_attributes=True)),
+        ("body: response_model re-validate + dump",
+         lambda: page_adapter.dump_json(page_adapter.validate_python(page, from_attributes=True))),
+        ("body: model_response", lambda: model_response(page)),
+    ]
+    print(f"GET /users/?limit={args.limit}: {request_ms:.2f} ms per request ({len(page.items)} items)")
+    print(f"{'stage':<42} {'ms':>8} {'share':>7}")
+    for label, fn in stages:
+        ms = timed(fn, args.repeat)
+        print(f"{label:<42} {ms:>8.2f} {ms / request_ms:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# app/scripts/bench_search.py
+"""
+Benchmark: profile search latency (p50/p95/p99), indexed vs ILIKE scan.
+
+Seeds --users users with profiles through the normal tables (the search
+triggers build the index as rows arrive), then runs --queries random
+searches: typeahead prefixes, full names, two-term queries and misspellings.
+The baseline is the v2 draft's `ilike('%q%')` over username, full_name and
+location joined to users.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_search --users 1000000 --queries 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+
+from sqlalchemy import insert, or_, select  # noqa: E402
+
+from app.core.config import Base, SessionLocal, engine  # noqa: E402
+from app.crud import search_crud  # noqa: E402
+from app.models import auth_models  # noqa: E402,F401
+from app.models.user_models import Status, User, UserProfile, UserRole  # noqa: E402
+
+BATCH = 10000
+FIRST = ["john", "maria", "wei", "aisha", "carlos", "olga", "kenji", "fatima", "liam", "priya", "noah", "elena"]
+LAST = ["smith", "garcia", "chen", "khan", "silva", "ivanova", "tanaka", "haddad", "murphy", "patel", "muller", "rossi"]
+CITIES = ["berlin", "madrid", "shanghai", "lagos", "lisbon", "moscow", "osaka", "cairo", "dublin", "mumbai", "toronto", "rome"]
+
+
+def seed(n: int) -> None:
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        for start in range(0, n, BATCH):
+            users, profiles = [], []
+            for i in range(start, min(start + BATCH, n)):
+                user_id = uuid.uuid4()
+                first, last = rng.choice(FIRST), rng.choice(LAST)
+                users.append({
+                    "id": user_id, "username": f"{first}{i}", "email": f"{first}.{last}{i}@example.com",
+                    "password_hash": "x", "role": UserRole.user, "status": Status.active,
+                    "is_verified": False, "onboarding_completed": False,
+                    "created_at": now, "updated_at": now, "failed_login_attempts": 0,
+                })
+                profiles.append({
+                    "id": user_id, "full_name": f"{first.title()} {last.title()}",
+                    "location": rng.choice(CITIES).title(), "last_updated_at": now,
+                    "privacy_settings": {"show_profile": rng.random() > 0.1},
+                })
+            conn.execute(insert(User), users)
+            conn.execute(insert(UserProfile), profiles)
+
+
+def queries(count: int):
+    rng = random.Random(2)
+    for _ in range(count):
+        kind = rng.randrange(4)
+        first, last, city = rng.choice(FIRST), rng.choice(LAST), rng.choice(CITIES)
+        if kind == 0:
+            yield first[:3]                                # typeahead prefix
+        elif kind == 1:
+            yield f"{first} {last}"                        # full name
+        elif kind == 2:
+            yield f"{last} {city}"                         # name + place
+        else:
+            pos = rng.randrange(len(last) - 1)            # transposition typo
+            yield last[:pos] + last[pos + 1] + last[pos] + last[pos + 2:]
+
+
+def ilike_search(db, q: str, limit: int):
+    pattern = f"%{q}%"
+    stmt = (
+        select(UserProfile).join(User, User.id == UserProfile.id)
+        .where(User.status == Status.active, or_(
+            UserProfile.full_name.ilike(pattern), UserProfile.location.ilike(pattern), User.username.ilike(pattern),
+        ))
+        .order_by(UserProfile.last_updated_at.desc())
+        .limit(limit)
+    )
+    return list(db.scalars(stmt))
+
+
+def measure(label: str, fn, qs, limit: int) -> None:
+    db = SessionLocal()
+    samples = []
+    for q in qs:
+        start = time.perf_counter()
+        fn(db, q, limit)
+        samples.append((time.perf_counter() - start) * 1000)
+        db.expunge_all()
+    db.close()
+    samples.sort()
+    pct = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))]  # noqa: E731
+    print(
+        f"{label:<22} p50 {pct(0.50):>8.2f} ms  p95 {pct(0.95):>8.2f} ms  "
+        f"p99 {pct(0.99):>8.2f} ms  mean {statistics.mean(samples):>8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-baseline", action="store_true", help="Skip the (slow) ILIKE scan")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    seed(args.users)
+    print(f"seeded {args.users} users + profiles (index built by triggers) in {time.perf_counter() - start:.1f}s")
+
+    qs = list(queries(args.queries))
+    measure("indexed (public)", search_crud.search_profiles, qs, args.limit)
+    measure(
+        "indexed (admin)",
+        lambda db, q, limit: search_crud.search_profiles(db, q, limit, include_private=True),
+        qs, args.limit,
+    )
+    if not args.skip_baseline:
+        measure("ilike scan (v2)", ilike_search, qs[: max(1, len(qs) // 10)], args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# app/scripts/bench_session_hold.py
+"""
+Benchmark: database round trips and pool connection hold per request.
+
+Runs each endpoint --requests times with the request session from
+get_async_db (one transaction per handler, closed when the handler
+returns) and with a session that commits after every read (via a
+dependency override), and reports per request:
+pool checkouts, SQL statements, transactions ended (COMMIT / ROLLBACK,
+each a round trip; on Postgres each transaction also costs a BEGIN),
+milliseconds of connection hold and the request latency.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_session_hold --users 2000 --requests 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker  # noqa: E402
+
+from app.core.config import async_engine, get_async_db  # noqa: E402
+from app.core.database import pool_stats  # noqa: E402
+from app.scripts.bench_response_serialization import admin_headers  # noqa: E402
+from app.scripts.bench_user_listing import seed  # noqa: E402
+from main import app  # noqa: E402
+
+ENDPOINTS = [
+    ("GET /me", "/api/v1/users/me", {}),
+    ("GET /me (If-None-Match)", "/api/v1/users/me", {"If-None-Match": "{etag}"}),
+    ("GET /me/profile", "/api/v1/users/me/profile", {}),
+    ("GET /?limit=1000", "/api/v1/users/?limit=1000", {}),
+    ("GET /?limit=0 (422)", "/api/v1/users/?limit=0", {}),
+]
+
+
+class CommitAfterReadSession(AsyncSession):
+    """Ends the transaction after every read (scalars() goes through execute())."""
+
+    async def execute(self, *args, **kwargs):
+        result = await super().execute(*args, **kwargs)
+        await self.commit()
+        return result
+
+    async def scalar(self, *args, **kwargs):
+        result = await super().scalar(*args, **kwargs)
+        await self.commit()
+        return result
+
+    async def get(self, *args, **kwargs):
+        result = await super().get(*args, **kwargs)
+        await self.commit()
+        return result
+
+
+CommitAfterReadSessionLocal = async_sessionmaker(
+    async_engine, class_=CommitAfterReadSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def commit_after_read_db():
+    db = CommitAfterReadSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+class RoundTrips:
+    """Statements and transaction ends on the async engine."""
+
+    def __init__(self):
+        self.statements = 0
+        self.transactions = 0
+        sync_engine = async_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._statement)
+        event.listen(sync_engine, "commit", self._transaction)
+        event.listen(sync_engine, "rollback", self._transaction)
+
+    def _statement(self, *args):
+        self.statements += 1
+
+    def _transaction(self, *args):
+        self.transactions += 1
+
+    def totals(self):
+        hold = pool_stats()["async"]["checkout_hold"]
+        return hold["count"], hold["count"] * hold["avg_ms"], self.statements, self.transactions
+
+
+def run(client: TestClient, headers: dict, requests: int, round_trips: RoundTrips) -> None:
+    print(
+        f"{'endpoint':<26} {'checkouts':>9} {'stmts':>6} {'txns':>5} "
+        f"{'hold ms':>8} {'request ms':>10} {'held':>6}"
+    )
+    for label, path, extra in ENDPOINTS:
+        # Current ETag: buffered login/touch writes may have bumped it since the last run
+        etag = client.get("/api/v1/users/me", headers=headers).headers["etag"]
+        request_headers = {**headers, **{key: value.format(etag=etag) for key, value in extra.items()}}
+        client.get(path, headers=request_headers)  # warm caches
+        start_totals = round_trips.totals()
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(path, headers=request_headers)
+        request_ms = (time.perf_counter() - start) * 1000 / requests
+        checkouts, hold_ms, statements, transactions = (
+            (end - begin) / requests for begin, end in zip(start_totals, round_trips.totals())
+        )
+        print(
+            f"{label:<26} {checkouts:>9.1f} {statements:>6.1f} {transactions:>5.1f} "
+            f"{hold_ms:>8.2f} {request_ms:>10.2f} {hold_ms / request_ms:>6.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        seed(args.users)
+        headers = admin_headers(client)
+        round_trips = RoundTrips()
+
+        print("commit after each read")
+        app.dependency_overrides[get_async_db] = commit_after_read_db
+        try:
+            run(client, headers, args.requests, round_trips)
+        finally:
+            app.dependency_overrides.pop(get_async_db)
+
+        print("\none transaction per handler (get_async_db)")
+        run(client, headers, args.requests, round_trips)
+
+
+if __name__ == "__main__":
+    main()
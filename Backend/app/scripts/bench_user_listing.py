@@ -0,0 +1,102 @@
+# app/scripts/bench_user_listing.py
+"""
+Benchmark: admin user listing cost by page depth, OFFSET vs keyset.
+
+Seeds --users rows with a bulk INSERT, then times fetching one page at
+increasing depths: with OFFSET (the v2 draft's approach, which reads and
+discards every skipped row) and with a (created_at, id) keyset cursor, which
+starts an index range scan at the cursor.
+
+Usage (from Backend/):
+    python -m app.scripts.bench_user_listing --users 1000000 --limit 100
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core.config import Base, SessionLocal, engine  # noqa: E402
+from app.crud import user_crud  # noqa: E402
+from app.models import auth_models  # noqa: E402,F401
+from app.models.user_models import Status, User, UserRole  # noqa: E402
+
+BATCH = 10000
+
+
+def seed(n: int) -> None:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        for start in range(0, n, BATCH):
+            conn.execute(insert(User), [
+                {
+                    "id": uuid.uuid4(),
+                    "username": f"user{i}",
+                    "email": f"user{i}@example{i % 50}.com",
+                    "password_hash": "x",
+                    "role": UserRole.user,
+                    "status": Status.active,
+                    "is_verified": i % 2 == 0,
+                    "onboarding_completed": False,
+                    "created_at": base + timedelta(seconds=i // 3),
+                    "updated_at": base,
+                    "failed_login_attempts": 0,
+                }
+                for i in range(start, min(start + BATCH, n))
+            ])
+
+
+def timed(fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed(args.users)
+
+    db = SessionLocal()
+    order = (User.created_at.desc(), User.id.desc())
+    print(f"{'depth':>10} {'offset ms':>10} {'keyset ms':>10}")
+    depth = 0
+    while depth < args.users:
+        # Keyset position of the row just before the page at this depth
+        after = None
+        if depth:
+            row = db.execute(
+                select(User.created_at, User.id).order_by(*order).offset(depth - 1).limit(1)
+            ).one()
+            after = (row.created_at, row.id)
+
+        offset_ms = timed(lambda: list(db.scalars(select(User).order_by(*order).offset(depth).limit(args.limit))))
+        keyset_ms = timed(lambda: user_crud.list_users(db, args.limit, after))
+        print(f"{depth:>10} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+        db.expunge_all()
+        depth = depth * 10 if depth else args.limit * 10
+
+    estimate_ms = timed(lambda: user_crud.estimate_user_count(db))
+    filtered_ms = timed(lambda: user_crud.estimate_user_count(db, {"is_verified": True}))
+    print(f"estimated_total: {estimate_ms:.2f} ms unfiltered, {filtered_ms:.2f} ms filtered (capped)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
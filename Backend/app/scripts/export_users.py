@@ -0,0 +1,56 @@
+# app/scripts/export_users.py
+"""
+Export users with their profiles as NDJSON or CSV, outside the API.
+
+Uses the same statement and serializer as GET /api/v1/users/export: rows
+are read through a server-side cursor --yield-per at a time and written as
+they arrive, so memory stays flat for any table size. Rows are in id order;
+resume an interrupted export with --after <last id written> (and --append).
+
+Usage (from Backend/):
+    python -m app.scripts.export_users --format csv --output users.csv
+    python -m app.scripts.export_users --after 0b9c... --output users.ndjson --append
+"""
+
+import argparse
+import sys
+import uuid
+
+from app.core.config import SessionLocal, settings
+from app.crud import user_crud
+from app.models import auth_models  # noqa: F401
+from app.models.user_models import Status, UserRole
+from app.services import export_service
+
+
+def export(out, fmt: str, after, filters, include_sensitive: bool, yield_per: int, header: bool) -> None:
+    with SessionLocal() as db:
+        rows = db.execute(user_crud.export_users_statement(filters, after, yield_per))
+        for chunk in export_service.iter_export(rows, fmt, include_sensitive, header):
+            out.write(chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(export_service.EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    parser.add_argument("--append", action="store_true", help="append to --output instead of truncating")
+    parser.add_argument("--after", type=uuid.UUID, help="resume after this user id")
+    parser.add_argument("--role", choices=[role.value for role in UserRole])
+    parser.add_argument("--status", choices=[status.value for status in Status])
+    parser.add_argument("--email-domain")
+    parser.add_argument("--include-sensitive", action="store_true", help="include contact and health fields")
+    parser.add_argument("--yield-per", type=int, default=settings.EXPORT_YIELD_PER)
+    args = parser.parse_args()
+
+    filters = {"role": args.role, "status": args.status, "email_domain": args.email_domain}
+    options = (args.format, args.after, filters, args.include_sensitive, args.yield_per)
+    if args.output:
+        with open(args.output, "ab" if args.append else "wb") as out:
+            export(out, *options, header=not args.append)
+    else:
+        export(sys.stdout.buffer, *options, header=True)
+
+
+if __name__ == "__main__":
+    main()
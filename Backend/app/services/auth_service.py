@@ -1,16 +1,24 @@
 # app/services/auth_service.py
 from __future__ import annotations
 from typing import Optional, Tuple, Union, Dict, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta, timezone
+import hashlib
 import logging
 
-from jose import jwt, JWTError
-from jwt.exceptions import PyJWTError, ExpiredSignatureError, InvalidSignatureError
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.auth_cache import auth_cache, AuthSnapshot
+from app.core.hashing import password_hasher, pwd_context
+from app.core.rate_limit import auth_account_limiter
+from app.core.revocation import revocation_filter
+from app.core.tokens import (
+    access_token_codec,
+    refresh_token_codec,
+    ExpiredSignatureError,
+    InvalidTokenError,
+)
 from app.core.exceptions import (
     ServiceError,
     NotFoundError,
@@ -19,81 +27,91 @@ from app.core.exceptions import (
     DatabaseError,
 )
 from app.models.user_models import User
-from app.crud.user_crud import get_user_by_email, get_user_by_id
-from app.crud.auth_crud import (
+from app.crud.async_user_crud import get_user_by_email, get_user_by_id, update_user_password
+from app.crud import async_token_crud
+from app.crud.async_auth_crud import (
+    record_login_outcome,
     update_last_login,
-    increment_failed_attempts,
-    reset_failed_attempts,
-    set_lockout_until,
-    clear_lockout,
-    update_password_changed_at,
 )
-from app.schemas.user_schema import UserOut, UserOutwithPassword
+from app.schemas.user_schema import Status, UserOut, UserOutwithPassword
 
 logger = logging.getLogger(__name__)
 
-# -----------------------------
-# Security Setup
-# -----------------------------
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _token_hash(token: str) -> str:
+    """SHA-256 hex digest stored instead of the raw refresh token."""
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 # -----------------------------
 # Auth Service
 # -----------------------------
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def login(self, email: str, password: str) -> Dict[str, Any]:
+    async def login(self, email: str, password: str) -> Dict[str, Any]:
         """
         Authenticate user and return tokens.
         Returns: Dict containing access_token, refresh_token, token_type, and user info
         """
-        user = get_user_by_email(self.db, email=email)
+        user = await get_user_by_email(self.db, email=email)
         if not user:
             raise UnauthorizedError("Invalid email or password")
 
         # Check account lockout
         now = datetime.now(timezone.utc)
-        if user.lockout_until and user.lockout_until > now:
+        lockout_until = user.lockout_until
+        if lockout_until and lockout_until.tzinfo is None:
+            # If stored as naive, assume it's UTC
+            lockout_until = lockout_until.replace(tzinfo=timezone.utc)
+        if lockout_until and lockout_until > now:
             raise UnauthorizedError("Account is locked. Try again later.")
 
-        # Verify password
-        if not self.verify_password(password, user.password_hash):
-            try:
-                increment_failed_attempts(self.db, user)
-                if user.failed_login_attempts >= 5:  # configurable threshold
-                    lockout_time = now + timedelta(minutes=15)
-                    set_lockout_until(self.db, user, lockout_time)
-            except DatabaseError as e:
-                logger.error("Failed to update login attempts: %s", e)
-            raise UnauthorizedError("Invalid email or password")
+        # Snapshot the response before the outcome UPDATE commits (avoids a re-SELECT)
+        user_out = UserOut.model_validate(user)
+        # End the read transaction: its pool connection is not held through bcrypt
+        await self.db.commit()
+        password_ok = await self.verify_password_async(password, user.password_hash)
 
-        # Successful login: reset failed attempts and update last login
         try:
-            reset_failed_attempts(self.db, user)
-            update_last_login(self.db, user)
+            if password_ok and not user_out.failed_login_attempts and user_out.lockout_until is None:
+                # Clean success: only last_login_at changes, coalesced by the write-behind buffer
+                await update_last_login(self.db, user)
+                user_out = user_out.model_copy(update={"last_login_at": user.last_login_at})
+            else:
+                # Record the outcome as one atomic UPDATE (counter, lockout, last login)
+                outcome = await record_login_outcome(
+                    self.db,
+                    user_out.id,
+                    success=password_ok,
+                    max_failed_attempts=settings.LOGIN_MAX_FAILED_ATTEMPTS,
+                    lockout_minutes=settings.LOGIN_LOCKOUT_MINUTES,
+                )
+                user_out = user_out.model_copy(update=outcome._asdict())
         except DatabaseError as e:
-            logger.error("Failed to update login status: %s", e)
+            logger.error("Failed to record login outcome: %s", e)
+
+        if not password_ok:
+            raise UnauthorizedError("Invalid email or password")
 
         # Issue tokens
         payload = {
-            "sub": str(user.id), 
-            "email": user.email
+            "sub": str(user_out.id), 
+            "email": user_out.email
             } 
         
         access_token = self.create_access_token(payload)
-        refresh_token = self.create_refresh_token(payload)
+        refresh_token = await self.issue_refresh_token(user_out.id, user_out.email)
         
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer",
-            "user": UserOut.model_validate(user)
+            "user": user_out
         }
     
-    def validate_token_issue_time(self, token_payload: Dict[str, Any], user: User, token_issue_time: datetime) -> bool:
+    def validate_token_issue_time(self, token_payload: Dict[str, Any], user: Union[User, AuthSnapshot], token_issue_time: datetime) -> bool:
         """Validate token issue time against user's password change time."""
         if user.password_changed_at:
             # Ensure both datetimes are timezone-aware
@@ -106,57 +124,95 @@ class AuthService:
                 return False
         return True
     
-    def refresh_token(self, refresh_token: str) -> Dict[str, str]:
+    async def refresh_token(self, refresh_token: str) -> Dict[str, str]:
         """
-        Refresh access token using refresh token.
-        Returns: Dict containing new access_token (and optionally new refresh_token if rotating).
+        Rotate a refresh token: consume it and issue a new access + refresh pair.
+        Presenting an already-rotated token is treated as theft and revokes the
+        whole token family.
+        Returns: Dict containing new access_token and refresh_token.
         """
         try:
-            payload = jwt.decode(
-                refresh_token,
-                settings.REFRESH_SECRET_KEY,   # <-- match the create_refresh_token secret
-                algorithms=[settings.ALGORITHM]
-            )
-            if payload.get("type") != "refresh":
-                raise UnauthorizedError("Invalid refresh token")
+            payload = refresh_token_codec.decode(refresh_token)
         except ExpiredSignatureError:
             raise UnauthorizedError("Refresh token has expired")
-        except (JWTError, PyJWTError):
-            raise UnauthorizedError("Invalid refresh token 2")
+        except InvalidTokenError:
+            raise UnauthorizedError("Invalid refresh token")
 
         user_id = payload.get("sub")
-        if not user_id:
+        if not user_id or not payload.get("jti"):
             raise UnauthorizedError("Invalid refresh token")
 
+        # Per-account limit, keyed on the verified subject only
+        await auth_account_limiter.enforce_async(f"refresh:{user_id}")
+
         try:
             user_uuid = UUID(user_id)
+            token_id = UUID(payload["jti"])
         except ValueError:
-            raise ValidationError("Invalid user ID in token")
+            raise ValidationError("Malformed refresh token claims")
 
-        user = get_user_by_id(self.db, user_uuid)
-        if not user:
-            raise NotFoundError("User not found")
+        # Fast path: a negative from the filter means "definitely not revoked"
+        if revocation_filter.might_contain(token_id):
+            await self._reject_if_revoked(token_id, user_uuid)
 
+        # User must still exist and must not have changed password since issue
+        snapshot = await self._get_auth_snapshot(user_uuid)
         token_iat = payload.get("iat")
-        if not token_iat:
-            raise UnauthorizedError("Token revoked due to password change")
-        
-        if not self.validate_token_issue_time(payload, user, token_issue_time=datetime.fromtimestamp(token_iat, tz=timezone.utc)):
+        if not token_iat or not self.validate_token_issue_time(
+            payload, snapshot, token_issue_time=datetime.fromtimestamp(token_iat, tz=timezone.utc)
+        ):
             raise UnauthorizedError("Token revoked due to password change")
-        
-        # Issue new tokens
-        new_payload = {"sub": str(user.id), "email": user.email}
-        access_token = self.create_access_token(new_payload)
 
-        # Optionally rotate refresh token:
-        # refresh_token = self.create_refresh_token(new_payload)
+        new_token_id = uuid4()
+        new_refresh_token, new_expires_at = self._encode_refresh_token(
+            user_uuid, payload.get("email"), new_token_id, payload.get("fam")
+        )
+        try:
+            rotated = await async_token_crud.rotate_refresh_token(
+                self.db,
+                token_id=token_id,
+                token_hash=_token_hash(refresh_token),
+                new_token_id=new_token_id,
+                new_token_hash=_token_hash(new_refresh_token),
+                new_expires_at=new_expires_at,
+            )
+        except DatabaseError as e:
+            logger.error("Failed to rotate refresh token for user %s: %s", user_id, e)
+            raise ServiceError("Failed to refresh token") from e
+
+        if rotated is None:
+            # Lost a race or replayed from another worker whose filter we have not seen
+            await self._reject_if_revoked(token_id, user_uuid)
+            raise UnauthorizedError("Invalid refresh token")
+        revocation_filter.add(token_id)
 
+        access_token = self.create_access_token({"sub": user_id, "email": payload.get("email")})
         return {
             "access_token": access_token,
-            # "refresh_token": refresh_token  # if rotating
+            "refresh_token": new_refresh_token,
         }
 
-    def change_password(self, user_id: Union[str, UUID], new_password: str) -> UserOut:
+    async def revoke_user_refresh_tokens(self, user_id: UUID) -> None:
+        """Revoke every refresh token of a user (e.g. after a password change)."""
+        revoked_ids = await async_token_crud.revoke_user_tokens(self.db, user_id)
+        revocation_filter.add_many(revoked_ids)
+
+    async def _reject_if_revoked(self, token_id: UUID, user_id: UUID) -> None:
+        """Raise if the stored token is revoked; a rotated token being replayed revokes its family."""
+        stored = await async_token_crud.get_refresh_token(self.db, token_id)
+        if stored is None or not stored.revoked:
+            return
+        if stored.replaced_by_token is None:
+            raise UnauthorizedError("Refresh token has been revoked")
+
+        logger.warning("Refresh token reuse detected for user %s; revoking family %s", user_id, stored.family_id)
+        try:
+            revocation_filter.add_many(await async_token_crud.revoke_token_family(self.db, stored.family_id))
+        except DatabaseError as e:
+            logger.error("Failed to revoke token family %s: %s", stored.family_id, e)
+        raise UnauthorizedError("Refresh token reuse detected")
+
+    async def change_password(self, user_id: Union[str, UUID], new_password: str) -> UserOut:
         """Change user password and invalidate existing tokens."""
         # Ensure UUID type
         if isinstance(user_id, str):
@@ -167,15 +223,18 @@ class AuthService:
         else:
             user_uuid = user_id
 
-        user = get_user_by_id(self.db, user_uuid)
+        user = await get_user_by_id(self.db, user_uuid)
         if not user:
             raise NotFoundError("User not found")
 
+        # Hash new password off the event loop, without holding the read transaction's connection
+        await self.db.commit()
+        hashed_pw = await self.hash_password_async(new_password)
+
         try:
-            # Hash new password and update
-            hashed_pw = self.hash_password(new_password)
-            user.password_hash = hashed_pw
-            update_password_changed_at(self.db, user)
+            await update_user_password(self.db, user, hashed_pw)
+            auth_cache.invalidate(user.id)
+            await self.revoke_user_refresh_tokens(user.id)
             return UserOut.model_validate(user)
         except DatabaseError as e:
             logger.error("Failed to change password for user %s: %s", user_id, e)
@@ -184,26 +243,27 @@ class AuthService:
     def verify_token(self, token: str) -> Dict[str, Any]:
         """
         Verify and decode JWT token.
+        Repeated tokens are answered from the verified-claims cache.
         Returns: Token payload
         """
         try:
-            payload = jwt.decode(
-                token, 
-                settings.SECRET_KEY, 
-                algorithms=[settings.ALGORITHM]
-            )
-            user_id_str = payload.get("sub")
-            
-            if not get_user_by_id(self.db, UUID(user_id_str)):
-                raise UnauthorizedError("Invalid authentication token")
-            return payload
+            payload = access_token_codec.decode(token)
         except ExpiredSignatureError:
             raise UnauthorizedError("Token has expired")
-        except (JWTError, PyJWTError):
+        except InvalidTokenError:
             raise UnauthorizedError("Invalid token")
 
-    def get_current_user_from_token(self, token: str) -> UserOut:
-        """Get current user from JWT token."""
+        if not payload.get("sub"):
+            raise UnauthorizedError("Invalid authentication token")
+        return payload
+
+    async def get_current_user_from_token(self, token: str) -> AuthSnapshot:
+        """
+        Get current user's auth snapshot from JWT token.
+        Served from the in-process auth cache when possible, so the common
+        authenticated request does not touch the database. Accounts that are
+        not active (suspended, banned, deactivated) are rejected.
+        """
         payload = self.verify_token(token)
         user_id_str = payload.get("sub")
 
@@ -212,13 +272,29 @@ class AuthService:
         except ValueError:
             raise ValidationError("Malformed user ID in token")
 
-        user = get_user_by_id(self.db, user_id)
-        if not user:
-            raise NotFoundError("User not found")
+        snapshot = await self._get_auth_snapshot(user_id)
 
-        return UserOut.model_validate(user)
+        token_iat = payload.get("iat")
+        if not token_iat or not self.validate_token_issue_time(
+            payload, snapshot, token_issue_time=datetime.fromtimestamp(token_iat, tz=timezone.utc)
+        ):
+            raise UnauthorizedError("Token revoked due to password change")
+        if snapshot.status not in (None, Status.active):
+            raise UnauthorizedError("Account is not active")
+
+        return snapshot
 
-    def get_current_user_with_password_from_token(self, token: str) -> UserOutwithPassword:
+    async def _get_auth_snapshot(self, user_id: UUID) -> AuthSnapshot:
+        """Auth snapshot from the cache, loading (one SELECT) on miss."""
+        snapshot = auth_cache.get(user_id)
+        if snapshot is None:
+            user = await get_user_by_id(self.db, user_id)
+            if not user:
+                raise UnauthorizedError("Invalid authentication token")
+            snapshot = auth_cache.put(user)
+        return snapshot
+
+    async def get_current_user_with_password_from_token(self, token: str) -> UserOutwithPassword:
         """Get current user with password hash from JWT token."""
         payload = self.verify_token(token)
         user_id_str = payload.get("sub")
@@ -228,7 +304,7 @@ class AuthService:
         except ValueError:
             raise ValidationError("Malformed user ID in token")
 
-        user = get_user_by_id(self.db, user_id)
+        user = await get_user_by_id(self.db, user_id)
         if not user:
             raise NotFoundError("User not found")
 
@@ -242,27 +318,49 @@ class AuthService:
         expires_delta: Optional[timedelta] = None
     ) -> str:
         """Create JWT access token."""
-        to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-        to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        return access_token_codec.encode(data, expires_delta)
 
     def create_refresh_token(
         self, 
         data: Dict[str, Any], 
         expires_delta: Optional[timedelta] = None
     ) -> str:
-        """Create JWT refresh token."""
-        to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + (
-            expires_delta or timedelta(days=7)
+        """Create JWT refresh token (not persisted; see issue_refresh_token)."""
+        return refresh_token_codec.encode(data, expires_delta)
+
+    async def issue_refresh_token(self, user_id: UUID, email: str) -> str:
+        """Create and persist the first refresh token of a new token family."""
+        token_id = uuid4()
+        family_id = uuid4()
+        token, expires_at = self._encode_refresh_token(user_id, email, token_id, str(family_id))
+        try:
+            await async_token_crud.create_refresh_token(
+                self.db,
+                token_id=token_id,
+                user_id=user_id,
+                family_id=family_id,
+                token_hash=_token_hash(token),
+                expires_at=expires_at,
+            )
+        except DatabaseError as e:
+            logger.error("Failed to store refresh token for user %s: %s", user_id, e)
+            raise ServiceError("Failed to issue refresh token") from e
+        return token
+
+    def _encode_refresh_token(
+        self,
+        user_id: UUID,
+        email: Optional[str],
+        token_id: UUID,
+        family_id: Optional[str],
+    ) -> Tuple[str, datetime]:
+        expires_delta = refresh_token_codec.default_expires
+        expires_at = datetime.now(timezone.utc) + expires_delta
+        token = self.create_refresh_token(
+            {"sub": str(user_id), "email": email, "jti": str(token_id), "fam": family_id},
+            expires_delta,
         )
-        to_encode.update({
-            "exp": expire,
-            "iat": datetime.now(timezone.utc),
-            "type": "refresh",
-        })
-        return jwt.encode(to_encode, settings.REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM)
+        return token, expires_at
 
     @staticmethod
     def verify_password(plain_password: str, password_hash: str) -> bool:
@@ -273,3 +371,13 @@ class AuthService:
     def hash_password(password: str) -> str:
         """Hash password using bcrypt."""
         return pwd_context.hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, password_hash: str) -> bool:
+        """Verify password against hash on the bounded hashing executor."""
+        return await password_hasher.verify(plain_password, password_hash)
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash password using bcrypt on the bounded hashing executor."""
+        return await password_hasher.hash(password)
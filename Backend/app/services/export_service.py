@@ -0,0 +1,145 @@
+# app/services/export_service.py
+"""
+Streaming user / profile export as NDJSON or CSV.
+
+Rows come from user_crud.export_users_statement (plain column rows through a
+server-side cursor, yield_per at a time) and are serialized one by one into
+byte chunks, so memory stays flat however many users are exported. Rows are
+in id order: an interrupted export resumes with after=<last id received>.
+
+Projection is privacy-aware. password_hash is never exported. Unless
+include_sensitive is set, contact and health fields are dropped, and the
+personal fields of profiles hidden with privacy_settings.show_profile=false
+are nulled (the rule ProfileService._apply_privacy_filter applies).
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import JSON, Date, DateTime, Uuid
+from sqlalchemy import Enum as SqlEnum
+
+from app.core.config import AsyncSessionLocal
+from app.crud import user_crud
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+SENSITIVE_FIELDS = frozenset({
+    "phone_number", "failed_login_attempts", "lockout_until", "password_changed_at",
+    "profile_date_of_birth", "profile_medications", "profile_conditions", "profile_crisis_contact",
+})
+HIDDEN_PROFILE_FIELDS = (
+    "profile_full_name", "profile_date_of_birth", "profile_gender", "profile_location", "profile_timezone",
+)
+CHUNK_ROWS = 500
+
+
+def _converter(column, fmt: str) -> Optional[Callable[[Any], Any]]:
+    """Value -> JSON/CSV-ready value for one column type, or None to pass through."""
+    type_ = column.type
+    if isinstance(type_, (Uuid, SqlEnum)):
+        return str if isinstance(type_, Uuid) else (lambda value: value.value)
+    if isinstance(type_, (DateTime, Date)):
+        return lambda value: value.isoformat()
+    if isinstance(type_, JSON) and fmt == "csv":
+        return json.dumps
+    return None
+
+
+class _Projection:
+    """
+    Maps result rows of user_crud.export_columns() to export values by
+    position, with converters chosen once per column rather than per value.
+    """
+
+    def __init__(self, fmt: str, include_sensitive: bool):
+        columns = user_crud.export_columns()
+        keys = [column.key for column in columns]
+        kept = [i for i, key in enumerate(keys) if include_sensitive or key not in SENSITIVE_FIELDS]
+        self.fields = [keys[i] for i in kept]
+        self._steps = [(i, _converter(columns[i], fmt)) for i in kept]
+        self._privacy_index = None if include_sensitive else keys.index("profile_privacy_settings")
+        self._hidden = [j for j, name in enumerate(self.fields) if name in HIDDEN_PROFILE_FIELDS]
+
+    def values(self, row) -> List[Any]:
+        """Export values for one row, in `fields` order (privacy rules applied)."""
+        values = []
+        for i, convert in self._steps:
+            value = row[i]
+            values.append(value if convert is None or value is None else convert(value))
+        if self._privacy_index is not None:
+            privacy = row[self._privacy_index]
+            if isinstance(privacy, dict) and privacy.get("show_profile") is False:
+                for j in self._hidden:
+                    values[j] = None
+        return values
+
+
+class _Encoder:
+    """Serializes rows into byte chunks of up to CHUNK_ROWS rows."""
+
+    def __init__(self, fmt: str, include_sensitive: bool, header: bool = True):
+        self._projection = _Projection(fmt, include_sensitive)
+        self._fields = self._projection.fields
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer) if fmt == "csv" else None
+        self._dumps = json.JSONEncoder(separators=(",", ":")).encode
+        self._rows = 0
+        if self._csv is not None and header:
+            self._csv.writerow(self._fields)
+
+    def add(self, row) -> Optional[bytes]:
+        values = self._projection.values(row)
+        if self._csv is not None:
+            self._csv.writerow(values)
+        else:
+            self._buffer.write(self._dumps(dict(zip(self._fields, values))))
+            self._buffer.write("\n")
+        self._rows += 1
+        return self.flush() if self._rows >= CHUNK_ROWS else None
+
+    def flush(self) -> Optional[bytes]:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._rows = 0
+        return data.encode() if data else None
+
+
+def iter_export(rows: Iterable, fmt: str, include_sensitive: bool = False, header: bool = True) -> Iterator[bytes]:
+    """Serialize result rows into byte chunks (sync; used by the CLI). header=False omits the CSV header."""
+    encoder = _Encoder(fmt, include_sensitive, header)
+    for row in rows:
+        chunk = encoder.add(row)
+        if chunk:
+            yield chunk
+    chunk = encoder.flush()
+    if chunk:
+        yield chunk
+
+
+async def stream_export(
+    fmt: str,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[UUID] = None,
+    include_sensitive: bool = False,
+    yield_per: int = 1000,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize the export into byte chunks for a StreamingResponse. Opens its
+    own session: the response body is produced after the request's
+    dependencies may already have been torn down.
+    """
+    encoder = _Encoder(fmt, include_sensitive)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(user_crud.export_users_statement(filters, after, yield_per))
+        async for row in result:
+            chunk = encoder.add(row)
+            if chunk:
+                yield chunk
+    chunk = encoder.flush()
+    if chunk:
+        yield chunk
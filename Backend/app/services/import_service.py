@@ -0,0 +1,239 @@
+# app/services/import_service.py
+"""
+Streaming bulk user import (CSV or NDJSON).
+
+The upload is spooled to a temporary file as it arrives, then imported by a
+background job (app.core.jobs) in batches of BULK_IMPORT_BATCH_SIZE rows:
+
+1. each row is validated with UserCreate / ProfileCreate; invalid rows go to
+   the error report,
+2. rows whose email / phone number is already taken are reported without
+   spending a bcrypt hash on them,
+3. the remaining passwords are hashed in parallel on a job-private thread
+   pool (bcrypt releases the GIL, see app.core.hashing), separate from the
+   login hasher so an import cannot queue logins behind it,
+4. users and profiles are inserted with one executemany each
+   (user_crud.insert_users_batch) and committed.
+
+Only one batch is held in memory and the error report is written to disk as
+NDJSON, so memory use does not depend on the file size. A bad row never
+aborts the file; a database failure fails the job with earlier batches kept.
+
+Columns / keys: username, email, phone_number, password, optional role, and
+any ProfileCreate field. In CSV, list/dict profile fields are JSON strings.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+import uuid
+
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.config import SessionLocal, settings
+from app.core.exceptions import ValidationError
+from app.core.hashing import hash_password
+from app.core.jobs import Job
+from app.crud import user_crud
+from app.models.user_models import Status, UserRole
+from app.schemas.user_schema import ProfileCreate, UserCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+USER_FIELDS = frozenset(UserCreate.model_fields) | {"role"}
+PROFILE_FIELDS = frozenset(ProfileCreate.model_fields)
+JSON_PROFILE_FIELDS = frozenset({"primary_pillar_weights", "medications", "conditions", "privacy_settings"})
+
+
+class RowError(Exception):
+    """A row that cannot be imported; messages end up in the error report."""
+
+    def __init__(self, messages: List[str]):
+        super().__init__("; ".join(messages))
+        self.messages = messages
+
+
+async def spool_upload(chunks: AsyncIterator[bytes], max_bytes: int) -> Tuple[str, int]:
+    """
+    Write the request body to a temporary file chunk by chunk.
+    Returns (path, line count); the caller owns the file.
+    """
+    fd, path = tempfile.mkstemp(prefix="harmony-import-", suffix=".upload")
+    size = lines = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValidationError(f"Import file exceeds {max_bytes} bytes")
+                lines += chunk.count(b"\n")
+                f.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, lines
+
+
+def iter_records(path: str, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(row number, dict or RowError) for every data row of the file."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield number, {key: value for key, value in row.items() if key and value not in (None, "")}
+            return
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, RowError([f"invalid JSON: {e.msg}"])
+                continue
+            yield number, record if isinstance(record, dict) else RowError(["row must be a JSON object"])
+
+
+def _validation_messages(e: PydanticValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()]
+
+
+def parse_record(record: Dict[str, Any]) -> Tuple[UserCreate, UserRole, ProfileCreate]:
+    """Validate one row with the registration schemas; raises RowError."""
+    unknown = set(record) - USER_FIELDS - PROFILE_FIELDS
+    if unknown:
+        raise RowError([f"unknown field(s): {', '.join(sorted(unknown))}"])
+
+    profile_data = {key: value for key, value in record.items() if key in PROFILE_FIELDS}
+    for key in JSON_PROFILE_FIELDS & profile_data.keys():
+        if isinstance(profile_data[key], str):
+            try:
+                profile_data[key] = json.loads(profile_data[key])
+            except json.JSONDecodeError:
+                raise RowError([f"{key}: must be JSON"])
+
+    user_data = {key: value for key, value in record.items() if key in USER_FIELDS and key != "role"}
+    user_data.setdefault("phone_number", None)
+    messages = []
+    try:
+        user_in = UserCreate.model_validate(user_data)
+    except PydanticValidationError as e:
+        messages += _validation_messages(e)
+    try:
+        profile_in = ProfileCreate.model_validate(profile_data)
+    except PydanticValidationError as e:
+        messages += _validation_messages(e)
+    try:
+        role = UserRole(record.get("role", UserRole.user.value))
+    except ValueError:
+        messages.append(f"role: must be one of {', '.join(role.value for role in UserRole)}")
+    if messages:
+        raise RowError(messages)
+    return user_in, role, profile_in
+
+
+class _ReportWriter:
+    """Appends one NDJSON line per rejected row."""
+
+    def __init__(self, job: Job):
+        self.job = job
+        self._file = None
+
+    def write(self, number: int, messages: List[str], email: Any = None) -> None:
+        if self._file is None:
+            fd, self.job.report_path = tempfile.mkstemp(prefix="harmony-import-errors-", suffix=".ndjson")
+            self._file = io.open(fd, "w", encoding="utf-8")
+        entry = {"row": number, "errors": messages}
+        if email:
+            entry["email"] = email
+        self._file.write(json.dumps(entry) + "\n")
+        self.job.failed += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def _import_batch(db, pool: ThreadPoolExecutor, batch: list, report: _ReportWriter, job: Job) -> None:
+    """Check, hash and insert one batch of (row number, UserCreate, role, ProfileCreate)."""
+    emails_taken, phones_taken = user_crud.registered_identities(
+        db,
+        [user_in.email for _, user_in, _, _ in batch],
+        [user_in.phone_number for _, user_in, _, _ in batch if user_in.phone_number],
+    )
+    fresh = []
+    for number, user_in, role, profile_in in batch:
+        if user_in.email in emails_taken:
+            report.write(number, ["email: already registered"], user_in.email)
+        elif user_in.phone_number and user_in.phone_number in phones_taken:
+            report.write(number, ["phone_number: already registered"], user_in.email)
+        else:
+            fresh.append((number, user_in, role, profile_in))
+    if not fresh:
+        return
+
+    hashes = pool.map(hash_password, [user_in.password for _, user_in, _, _ in fresh])
+
+    now = datetime.now(timezone.utc)
+    users, profiles, numbers = [], [], {}
+    for (number, user_in, role, profile_in), password_hash in zip(fresh, hashes):
+        user_id = uuid.uuid4()
+        numbers[user_id] = (number, user_in.email)
+        users.append({
+            "id": user_id,
+            "username": user_in.username,
+            "email": user_in.email,
+            "phone_number": user_in.phone_number,
+            "password_hash": password_hash,
+            "role": role,
+            "status": Status.active,
+            "is_verified": False,
+            "onboarding_completed": False,
+            "created_at": now,
+            "updated_at": now,
+            "failed_login_attempts": 0,
+        })
+        profiles.append({"id": user_id, "last_updated_at": now, **profile_in.model_dump(exclude_unset=True)})
+
+    inserted = user_crud.insert_users_batch(db, users, profiles)
+    job.affected += len(inserted)
+    # Lost a race with a concurrent registration, or duplicated within the batch
+    for user_id in numbers.keys() - inserted:
+        number, email = numbers[user_id]
+        report.write(number, ["email or phone_number: already registered"], email)
+
+
+def run_user_import(job: Job, path: str, fmt: str) -> None:
+    """Job body (worker thread, sync session): import the spooled file, then delete it."""
+    db = SessionLocal()
+    report = _ReportWriter(job)
+    pool = ThreadPoolExecutor(max_workers=settings.BULK_IMPORT_HASH_WORKERS, thread_name_prefix="import-hash")
+    try:
+        batch = []
+        for number, record in iter_records(path, fmt):
+            job.processed += 1
+            try:
+                if isinstance(record, RowError):
+                    raise record
+                batch.append((number, *parse_record(record)))
+            except RowError as e:
+                report.write(number, e.messages, record.get("email") if isinstance(record, dict) else None)
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                _import_batch(db, pool, batch, report, job)
+                batch = []
+        if batch:
+            _import_batch(db, pool, batch, report, job)
+        job.total = job.processed
+    finally:
+        pool.shutdown(cancel_futures=True)
+        report.close()
+        db.close()
+        os.unlink(path)
+    logger.info(
+        "Import job %s: %d rows, %d imported, %d rejected", job.id, job.processed, job.affected, job.failed
+    )
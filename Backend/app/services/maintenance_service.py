@@ -0,0 +1,107 @@
+# app/services/maintenance_service.py
+"""
+Periodic maintenance jobs. Each job opens its own session; they are
+scheduled from the application lifespan in main.py.
+"""
+
+import logging
+
+from app.core.background import PeriodicTask
+from app.core.config import SessionLocal, settings
+from app.core.revocation import revocation_filter
+from app.core.write_behind import user_touch_buffer
+from app.crud import cohort_crud, search_crud, stats_crud, token_crud
+
+logger = logging.getLogger(__name__)
+
+
+def purge_refresh_tokens() -> int:
+    """Delete expired refresh tokens in batches, then rebuild the revocation filter."""
+    db = SessionLocal()
+    try:
+        purged = token_crud.purge_expired_refresh_tokens(
+            db, batch_size=settings.REFRESH_TOKEN_PURGE_BATCH_SIZE
+        )
+        revocation_filter.rebuild(token_crud.iter_revoked_token_ids(db))
+        if purged:
+            logger.info("Purged %d expired refresh tokens", purged)
+        return purged
+    finally:
+        db.close()
+
+
+def load_revocation_filter() -> None:
+    """Seed the revocation filter from the database (called at startup)."""
+    db = SessionLocal()
+    try:
+        revocation_filter.rebuild(token_crud.iter_revoked_token_ids(db))
+    finally:
+        db.close()
+
+
+def flush_touch_buffer() -> int:
+    """Flush coalesced users touch columns (last_login_at, updated_at)."""
+    return user_touch_buffer.flush()
+
+
+def reconcile_user_stats() -> dict:
+    """Check the user_stats counters against real counts and repair drift."""
+    db = SessionLocal()
+    try:
+        drift = stats_crud.reconcile_user_stats(db)
+        if drift:
+            logger.warning("Corrected user stats drift: %s", drift)
+        return drift
+    finally:
+        db.close()
+
+
+def seed_user_stats() -> None:
+    """Fill the counters on first start (called at startup; cheap afterwards)."""
+    db = SessionLocal()
+    try:
+        if stats_crud.user_stats_empty(db):
+            stats_crud.reconcile_user_stats(db)
+    finally:
+        db.close()
+
+
+def seed_search_index() -> None:
+    """Index users that predate the search triggers (called at startup; cheap afterwards)."""
+    db = SessionLocal()
+    try:
+        if search_crud.search_index_incomplete(db):
+            logger.info("Building the user search index")
+            search_crud.rebuild_search_index(db)
+    finally:
+        db.close()
+
+
+def seed_health_terms() -> None:
+    """Index the conditions / medications of profiles that predate the cohort triggers (called at startup)."""
+    db = SessionLocal()
+    try:
+        if cohort_crud.health_terms_incomplete(db):
+            logger.info("Building the cohort health terms")
+            cohort_crud.rebuild_health_terms(db)
+    finally:
+        db.close()
+
+
+touch_buffer_flush_task = PeriodicTask(
+    "touch-buffer-flush",
+    settings.WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+    flush_touch_buffer,
+)
+
+refresh_token_purge_task = PeriodicTask(
+    "refresh-token-purge",
+    settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS,
+    purge_refresh_tokens,
+)
+
+user_stats_reconcile_task = PeriodicTask(
+    "user-stats-reconcile",
+    settings.USER_STATS_RECONCILE_INTERVAL_SECONDS,
+    reconcile_user_stats,
+)
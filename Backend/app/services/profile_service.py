@@ -1,17 +1,21 @@
 # app/services/profile_service.py
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime
 from uuid import UUID
 import logging
 
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_models import User, UserRole
 from app.schemas.user_schema import (
     ProfileCreate,
     ProfileUpdate,
     ProfileOut,
+    CohortPage,
+    TermFacet,
 )
 from app.core.exceptions import (
     ServiceError,
@@ -19,22 +23,45 @@ from app.core.exceptions import (
     ConflictError,
     PermissionError,
     ValidationError,
+    PreconditionFailedError,
     DatabaseConflictError,
     DatabaseError,
+    DatabaseNotFoundError,
+    DatabaseStaleVersionError,
 )
-from app.crud import user_crud, profile_crud
+from app.crud import async_user_crud, async_profile_crud, async_search_crud, async_cohort_crud
+from app.crud.profile_crud import PATCH_FORMATS, SCALAR_PATCH_FIELDS
+from app.crud.search_crud import MIN_TERM_LENGTH, search_terms
+from app.crud.cohort_crud import MAX_COHORT_TERMS, cohort_requirements
+from app.core.config import settings
+from app.core.etag import if_match_versions, version_etag
+from app.core.pagination import decode_id_cursor, encode_id_cursor
 
 logger = logging.getLogger(__name__)
 
+# Cleared when a profile's owner sets show_profile to false (id and metadata stay)
+HIDDEN_PROFILE_FIELDS = (
+    "full_name",
+    "date_of_birth",
+    "gender",
+    "location",
+    "timezone",
+    "primary_pillar_weights",
+    "medications",
+    "conditions",
+    "crisis_contact",
+    "preferred_language",
+)
+
 
 # -----------------------------
 # Profile Service
 # -----------------------------
 class ProfileService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_profile(
+    async def create_profile(
         self, 
         user_id: UUID, 
         profile_in: ProfileCreate, 
@@ -47,17 +74,17 @@ class ProfileService:
                 raise PermissionError("Not authorized to create profile for this user")
 
         # Check if user exists
-        user = user_crud.get_user_by_id(self.db, user_id)
+        user = await async_user_crud.get_user_by_id(self.db, user_id)
         if not user:
             raise NotFoundError("User not found")
 
         # Check if profile already exists with content
-        existing_profile = profile_crud.get_profile_by_user_id(self.db, user_id)
+        existing_profile = await async_profile_crud.get_profile_by_user_id(self.db, user_id)
         if existing_profile and existing_profile.full_name is not None:
             raise ConflictError("Profile already exists")
 
         try:
-            profile = profile_crud.create_profile(
+            profile = await async_profile_crud.create_profile(
                 self.db, 
                 user_id=user_id, 
                 profile_create=profile_in
@@ -73,13 +100,13 @@ class ProfileService:
             logger.exception("Unexpected error during profile creation: %s", e)
             raise ServiceError("Unexpected error during profile creation") from e
 
-    def get_profile(
+    async def get_profile(
         self, 
         user_id: UUID, 
         requesting_user: Optional[User] = None
     ) -> ProfileOut:
         """Get user profile with privacy filtering."""
-        profile = profile_crud.get_profile_by_user_id(self.db, user_id)
+        profile = await async_profile_crud.get_profile_by_user_id(self.db, user_id)
         if not profile:
             raise NotFoundError("Profile not found")
 
@@ -87,32 +114,48 @@ class ProfileService:
         filtered_profile = self._apply_privacy_filter(profile, requesting_user)
         return filtered_profile
 
-    def update_profile(
+    async def get_profile_validators(self, user_id: UUID) -> Optional[Tuple[str, Optional[datetime]]]:
+        """(ETag, Last-Modified) of a profile without loading it; None if there is no profile."""
+        row = await async_profile_crud.get_profile_validators(self.db, user_id)
+        return self.profile_validators(row) if row is not None else None
+
+    @staticmethod
+    def profile_validators(profile) -> Tuple[str, Optional[datetime]]:
+        """(ETag, Last-Modified) of a profile (row, ORM object or ProfileOut)."""
+        return version_etag(profile.version), profile.last_updated_at
+
+    async def update_profile(
         self, 
         user_id: UUID, 
         profile_in: ProfileUpdate, 
-        requesting_user: Optional[User] = None
+        requesting_user: Optional[User] = None,
+        if_match: Optional[str] = None
     ) -> ProfileOut:
-        """Update user profile."""
+        """Update user profile; with if_match (an If-Match header) only if the version still matches."""
         # Permission checks
         if requesting_user and requesting_user.id != user_id:
             if requesting_user.role != UserRole.admin:
                 raise PermissionError("Not authorized to update this profile")
 
-        profile = profile_crud.get_profile_by_user_id(self.db, user_id)
+        profile = await async_profile_crud.get_profile_by_user_id(self.db, user_id)
         if not profile:
             raise NotFoundError("Profile not found")
+        expected_versions = self._check_if_match(profile, if_match)
 
         # Validate profile data
         self._validate_profile_data(profile_in)
 
         try:
-            updated_profile = profile_crud.update_profile(
+            updated_profile = await async_profile_crud.update_profile(
                 self.db, 
                 db_profile=profile, 
-                profile_update=profile_in
+                profile_update=profile_in,
+                expected_versions=expected_versions
             )
             return ProfileOut.model_validate(updated_profile)
+        except DatabaseNotFoundError as e:
+            # The conditional UPDATE lost a race with another write
+            raise PreconditionFailedError("Profile was modified concurrently") from e
         except DatabaseConflictError as e:
             logger.warning("Conflict during profile update: %s", e)
             raise ConflictError("Profile update failed due to constraint") from e
@@ -123,32 +166,37 @@ class ProfileService:
             logger.exception("Unexpected error during profile update: %s", e)
             raise ServiceError("Unexpected error during profile update") from e
 
-    def update_profile_privacy(
+    async def update_profile_privacy(
         self, 
         user_id: UUID, 
         privacy_settings: Dict[str, bool], 
-        requesting_user: Optional[User] = None
+        requesting_user: Optional[User] = None,
+        if_match: Optional[str] = None
     ) -> ProfileOut:
-        """Update profile privacy settings."""
+        """Update profile privacy settings; with if_match only if the version still matches."""
         # Permission checks
         if requesting_user and requesting_user.id != user_id:
             if requesting_user.role != UserRole.admin:
                 raise PermissionError("Not authorized to update privacy settings")
 
-        profile = profile_crud.get_profile_by_user_id(self.db, user_id)
+        profile = await async_profile_crud.get_profile_by_user_id(self.db, user_id)
         if not profile:
             raise NotFoundError("Profile not found")
+        expected_versions = self._check_if_match(profile, if_match)
 
         # Validate privacy settings
         self._validate_privacy_settings(privacy_settings)
 
         try:
-            updated_profile = profile_crud.update_profile_privacy(
+            updated_profile = await async_profile_crud.update_profile_privacy(
                 self.db, 
                 db_profile=profile, 
-                privacy_settings=privacy_settings
+                privacy_settings=privacy_settings,
+                expected_versions=expected_versions
             )
             return ProfileOut.model_validate(updated_profile)
+        except DatabaseNotFoundError as e:
+            raise PreconditionFailedError("Profile was modified concurrently") from e
         except DatabaseConflictError as e:
             logger.warning("Conflict during privacy update: %s", e)
             raise ConflictError("Privacy settings update failed") from e
@@ -156,7 +204,48 @@ class ProfileService:
             logger.error("Database error during privacy update: %s", e)
             raise ServiceError("Privacy settings update failed") from e
 
-    def delete_profile(
+    async def patch_profile(
+        self,
+        user_id: UUID,
+        patch_format: str,
+        patch: Any,
+        requesting_user: Optional[User] = None,
+        if_match: Optional[str] = None
+    ) -> ProfileOut:
+        """
+        Apply a JSON merge patch ("merge", RFC 7396) or JSON patch ("json",
+        RFC 6902) to a profile in one UPDATE, without reading it first. JSON
+        document fields are patched member-wise by the database, so
+        concurrent edits of different members both apply; if_match makes
+        the patch conditional on the profile version. The patched profile
+        is validated before commit.
+        """
+        if requesting_user and requesting_user.id != user_id:
+            if requesting_user.role != UserRole.admin:
+                raise PermissionError("Not authorized to update this profile")
+        if patch_format not in PATCH_FORMATS:
+            raise ValidationError(f"Unsupported patch format: {patch_format}")
+
+        expected_versions = if_match_versions(if_match)
+        patch = self._coerce_patch_scalars(patch_format, patch)
+        try:
+            profile = await async_profile_crud.patch_profile(
+                self.db, user_id, patch_format, patch, expected_versions, self._validate_patched_profile
+            )
+            return ProfileOut.model_validate(profile)
+        except ValueError as e:
+            raise ValidationError(str(e)) from e
+        except DatabaseNotFoundError as e:
+            raise NotFoundError("Profile not found") from e
+        except DatabaseStaleVersionError as e:
+            raise PreconditionFailedError("Profile was modified; fetch it again and retry") from e
+        except DatabaseConflictError as e:
+            raise ConflictError(str(e)) from e
+        except DatabaseError as e:
+            logger.error("Database error during profile patch: %s", e)
+            raise ServiceError("Profile patch failed") from e
+
+    async def delete_profile(
         self, 
         user_id: UUID, 
         hard_delete: bool = False, 
@@ -168,12 +257,12 @@ class ProfileService:
             if requesting_user.role != UserRole.admin:
                 raise PermissionError("Not authorized to delete this profile")
 
-        profile = profile_crud.get_profile_by_user_id(self.db, user_id)
+        profile = await async_profile_crud.get_profile_by_user_id(self.db, user_id)
         if not profile:
             raise NotFoundError("Profile not found")
 
         try:
-            return profile_crud.delete_profile(self.db, profile, hard_delete)
+            return await async_profile_crud.delete_profile(self.db, profile, hard_delete)
         except DatabaseError as e:
             logger.error("Database error during profile deletion: %s", e)
             raise ServiceError("Failed to delete profile") from e
@@ -181,6 +270,113 @@ class ProfileService:
             logger.exception("Unexpected error during profile deletion: %s", e)
             raise ServiceError("Failed to delete profile") from e
 
+    async def search_profiles(
+        self,
+        query: str,
+        limit: int = 20,
+        fuzzy: bool = True,
+        requesting_user: Optional[User] = None
+    ) -> List[ProfileOut]:
+        """
+        Search active users' profiles by username, full name or location.
+        Non-admins only match text that _apply_privacy_filter would show
+        them, and results go through the same filter.
+        """
+        if requesting_user is None:
+            raise PermissionError("Authentication required")
+
+        if not search_terms(query):
+            raise ValidationError(f"Search query needs a term of at least {MIN_TERM_LENGTH} characters")
+
+        try:
+            profiles = await async_search_crud.search_profiles(
+                self.db,
+                query,
+                limit,
+                fuzzy,
+                include_private=requesting_user.role == UserRole.admin,
+                candidates=settings.SEARCH_MAX_CANDIDATES,
+                min_similarity=settings.SEARCH_MIN_SIMILARITY,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Database error during profile search: %s", e)
+            raise ServiceError("Failed to search profiles") from e
+
+        return [self._apply_privacy_filter(profile, requesting_user) for profile in profiles]
+
+    async def find_cohort(
+        self,
+        conditions: List[str],
+        medications: List[str],
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        requesting_user: Optional[User] = None
+    ) -> CohortPage:
+        """
+        Profiles of active users with every listed condition AND medication
+        (clinicians and admins). Clinicians only see profiles whose owners
+        have not hidden them; admins see all.
+        """
+        self._check_cohort_access(requesting_user)
+        requirements = self._cohort_requirements(conditions, medications)
+        if not requirements:
+            raise ValidationError("At least one condition or medication is required")
+
+        try:
+            after = decode_id_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise ValidationError("Invalid cursor") from e
+
+        try:
+            # One extra row tells us whether another page exists
+            profiles = await async_cohort_crud.find_cohort(
+                self.db,
+                requirements,
+                limit + 1,
+                after,
+                include_hidden=requesting_user.role == UserRole.admin,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Database error during cohort query: %s", e)
+            raise ServiceError("Failed to query cohort") from e
+
+        items = profiles[:limit]
+        return CohortPage(
+            items=[self._apply_privacy_filter(profile, requesting_user) for profile in items],
+            next_cursor=encode_id_cursor(items[-1].id) if len(profiles) > limit else None,
+        )
+
+    async def cohort_facets(
+        self,
+        kind: str,
+        conditions: Optional[List[str]] = None,
+        medications: Optional[List[str]] = None,
+        limit: int = 50,
+        requesting_user: Optional[User] = None
+    ) -> List[TermFacet]:
+        """
+        Profile counts per condition (or medication name), most common first,
+        within the cohort given by conditions/medications or over everyone.
+        """
+        self._check_cohort_access(requesting_user)
+        requirements = self._cohort_requirements(conditions or [], medications or [])
+
+        try:
+            counts = await async_cohort_crud.facet_counts(
+                self.db,
+                kind,
+                requirements,
+                limit,
+                include_hidden=requesting_user.role == UserRole.admin,
+            )
+        except ValueError as e:
+            raise ValidationError(str(e)) from e
+        except SQLAlchemyError as e:
+            logger.error("Database error during cohort facet query: %s", e)
+            raise ServiceError("Failed to count cohort facets") from e
+
+        return [TermFacet(term=term, count=count) for term, count in counts.items()]
+
     # -----------------------------
     # Helper Methods
     # -----------------------------
@@ -198,7 +394,7 @@ class ProfileService:
             return ProfileOut.model_validate(profile)
 
         # Apply privacy filtering based on profile settings
-        profile_data = ProfileOut.model_validate(profile).model_dump()
+        profile_out = ProfileOut.model_validate(profile)
         
         if hasattr(profile, 'privacy_settings') and profile.privacy_settings:
             privacy_settings = profile.privacy_settings
@@ -206,20 +402,73 @@ class ProfileService:
             # Filter sensitive fields based on privacy settings
             if not privacy_settings.get("show_profile", True):
                 # Hide most profile information
-                filtered_fields = {
-                    "id": profile_data["id"],
-                    "full_name": None,
-                    "bio": None,
-                    "location": None,
-                    "date_of_birth": None,
-                    "gender": None,
-                    "timezone": None,
-                    "crisis_contact": None,
-                    "privacy_settings": {"show_profile": False}
-                }
-                return ProfileOut(**filtered_fields)
+                return profile_out.model_copy(update={
+                    **dict.fromkeys(HIDDEN_PROFILE_FIELDS),
+                    "privacy_settings": {"show_profile": False},
+                })
         
-        return ProfileOut.model_validate(profile)
+        return profile_out
+
+    def _check_if_match(self, profile, if_match: Optional[str]) -> Optional[List[int]]:
+        """Versions an If-Match header accepts; raises PreconditionFailedError if the profile is at another."""
+        expected_versions = if_match_versions(if_match)
+        if expected_versions is not None and profile.version not in expected_versions:
+            raise PreconditionFailedError("Profile was modified; fetch it again and retry")
+        return expected_versions
+
+    def _coerce_patch_scalars(self, patch_format: str, patch: Any) -> Any:
+        """Validate and convert scalar field values of a patch with ProfileCreate (e.g. dates)."""
+        if patch_format == "merge":
+            if not isinstance(patch, dict):
+                return patch
+            scalars = {key: value for key, value in patch.items() if key in SCALAR_PATCH_FIELDS}
+            return {**patch, **self._coerce_scalars(scalars)}
+
+        if not isinstance(patch, list):
+            return patch
+        coerced = []
+        for operation in patch:
+            if isinstance(operation, dict) and operation.get("value") is not None:
+                field = str(operation.get("path", ""))[1:]
+                if field in SCALAR_PATCH_FIELDS:
+                    operation = {**operation, "value": self._coerce_scalars({field: operation["value"]})[field]}
+            coerced.append(operation)
+        return coerced
+
+    def _coerce_scalars(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return ProfileCreate.model_validate(values).model_dump(include=set(values))
+        except PydanticValidationError as e:
+            raise ValidationError(self._pydantic_message(e)) from e
+
+    def _validate_patched_profile(self, profile) -> None:
+        """Reject a patch whose result is not a valid profile (runs before commit)."""
+        try:
+            ProfileOut.model_validate(profile)
+        except PydanticValidationError as e:
+            raise ValidationError(self._pydantic_message(e)) from e
+        if profile.privacy_settings is not None:
+            self._validate_privacy_settings(profile.privacy_settings)
+
+    @staticmethod
+    def _pydantic_message(e: PydanticValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+
+    def _check_cohort_access(self, requesting_user: Optional[User]) -> None:
+        """Cohort queries expose health data: clinicians and admins only."""
+        if requesting_user is None:
+            raise PermissionError("Authentication required")
+        if requesting_user.role not in (UserRole.clinician, UserRole.admin):
+            raise PermissionError("Not authorized to query cohorts")
+
+    def _cohort_requirements(self, conditions: List[str], medications: List[str]):
+        """Normalized (kind, term) pairs, bounded so a query stays a handful of index probes."""
+        requirements = cohort_requirements(conditions, medications)
+        if len(requirements) > MAX_COHORT_TERMS:
+            raise ValidationError(f"At most {MAX_COHORT_TERMS} conditions and medications per cohort")
+        return requirements
 
     def _validate_profile_data(self, profile_data: ProfileUpdate) -> None:
         """Validate profile data before update."""
@@ -1,14 +1,15 @@
 # app/services/user_service.py
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+from typing import AsyncIterator, Optional, Dict, Any, List, Tuple
+from datetime import datetime
 from uuid import UUID
 from enum import Enum
 import logging
 
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from app.models.user_models import User, UserRole
+from app.models.user_models import User, UserRole, Status
 from app.schemas.user_schema import (
     UserCreate,
     UserUpdate,
@@ -16,6 +17,11 @@ from app.schemas.user_schema import (
     ProfileCreate,
     ProfileOut,
     UserWithProfileOut,
+    UserPage,
+    UserStatsOverview,
+    BulkUserUpdate,
+    JobOut,
+    USER_OUT_LIST,
 )
 from app.core.exceptions import (
     ServiceError,
@@ -26,8 +32,15 @@ from app.core.exceptions import (
     DatabaseConflictError,
     DatabaseError,
 )
-from app.crud import user_crud, profile_crud
+from app.crud import async_user_crud, async_profile_crud, async_search_crud, async_stats_crud, user_crud
+from app.crud.search_crud import MIN_TERM_LENGTH, search_terms
+from app.core.auth_cache import auth_cache
+from app.core.config import SessionLocal, settings
+from app.core.etag import timestamp_version, version_etag
+from app.core.jobs import Job, job_registry
+from app.core.pagination import decode_cursor, encode_cursor
 from app.services.auth_service import AuthService
+from app.services import export_service, import_service
 
 logger = logging.getLogger(__name__)
 
@@ -44,52 +57,33 @@ class UserState(str, Enum):
 # User Service
 # -----------------------------
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_user(self, user_in: UserCreate) -> UserWithProfileOut:
-        """Create a new user with profile."""
-        # Check for existing email
-        if user_crud.get_user_by_email(self.db, email=user_in.email):
-            raise ConflictError("Email already registered")
-        
-        # Check for existing phone number
-        if user_in.phone_number and user_crud.get_user_by_phone(self.db, phone_number=user_in.phone_number):
-            raise ConflictError("Phone number already registered")
-
-        # Hash password
-        hashed_pw = AuthService.hash_password(user_in.password)
+    async def create_user(self, user_in: UserCreate) -> UserWithProfileOut:
+        """
+        Create a new user with an empty profile in one transaction.
+        Duplicate email / phone number are rejected by the database's unique
+        constraints rather than by pre-checking SELECTs.
+        """
+        # Hash password off the event loop
+        hashed_pw = await AuthService.hash_password_async(user_in.password)
 
         try:
-            # Create user
-            db_user = user_crud.create_user(
+            db_user = await async_user_crud.create_user_with_profile(
                 self.db,
                 email=user_in.email,
                 password_hash=hashed_pw,
                 phone_number=user_in.phone_number,
                 username=user_in.username,
                 role=getattr(user_in, "role", UserRole.user),
+                profile_create=ProfileCreate(),
             )
-
-            # Create basic profile
-            profile = profile_crud.create_profile(
-                self.db, 
-                user_id=db_user.id, 
-                profile_create=ProfileCreate()
-            )
-
-            # Build response
-            user_dict = UserOut.model_validate(db_user).model_dump()
-            user_dict["profile"] = (
-                ProfileOut.model_validate(profile).model_dump() 
-                if profile else None
-            )
-
-            return UserWithProfileOut(**user_dict)
+            return UserWithProfileOut.model_validate(db_user)
 
         except DatabaseConflictError as e:
             logger.warning("Conflict in user creation: %s", e)
-            raise ConflictError("User already exists") from e
+            raise ConflictError(str(e)) from e
         except DatabaseError as e:
             logger.error("Database error during user creation: %s", e)
             raise ServiceError("Failed to create user") from e
@@ -97,13 +91,13 @@ class UserService:
             logger.exception("Unexpected error during user creation: %s", e)
             raise ServiceError("Unexpected error while creating user") from e
 
-    def get_user_by_id(
+    async def get_user_by_id(
         self, 
         user_id: UUID, 
         requesting_user: Optional[User] = None
     ) -> UserOut:
         """Get user by ID with permission checks."""
-        user = user_crud.get_user_by_id(self.db, user_id)
+        user = await async_user_crud.get_user_by_id(self.db, user_id)
         if not user:
             raise NotFoundError("User not found")
         
@@ -117,36 +111,63 @@ class UserService:
 
         return UserOut.model_validate(user)
 
-    def get_user_with_profile(
+    async def get_user_with_profile(
         self, 
         user_id: UUID, 
         requesting_user: Optional[User] = None
     ) -> UserWithProfileOut:
-        """Get user with profile information."""
-        user_schema = self.get_user_by_id(user_id, requesting_user)
-        profile = profile_crud.get_profile_by_user_id(self.db, user_id)
-        
-        user_dict = user_schema.model_dump()
-        user_dict["profile"] = (
-            ProfileOut.model_validate(profile).model_dump() 
-            if profile else None
+        """
+        Get user with profile information: one joined SELECT and a single
+        validation pass. Permissions are checked before touching the database.
+        """
+        if requesting_user is None:
+            raise PermissionError("Authentication required")
+        if requesting_user.id != user_id and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to view this user")
+
+        user = await async_user_crud.get_user_with_profile(self.db, user_id)
+        if not user:
+            raise NotFoundError("User not found")
+        return UserWithProfileOut.model_validate(user)
+
+    async def get_user_validators(self, user_id: UUID) -> Optional[Tuple[str, Optional[datetime]]]:
+        """
+        (ETag, Last-Modified) of get_user_with_profile's representation from a
+        narrow lookup, without loading either row; None if the user does not
+        exist. Every user write moves updated_at and every profile write
+        bumps the profile version, so the ETag changes with the content.
+        """
+        row = await async_user_crud.get_user_validators(self.db, user_id)
+        return self._validators(*row) if row is not None else None
+
+    def user_with_profile_validators(self, user: UserWithProfileOut) -> Tuple[str, Optional[datetime]]:
+        """(ETag, Last-Modified) of a loaded get_user_with_profile result."""
+        profile = user.profile
+        return self._validators(
+            user.updated_at, profile.version if profile else None, profile.last_updated_at if profile else None
         )
-        
-        return UserWithProfileOut(**user_dict)
 
-    def get_user_by_email(self, email: str) -> Optional[UserOut]:
+    @staticmethod
+    def _validators(
+        updated_at: Optional[datetime], profile_version: Optional[int], profile_updated_at: Optional[datetime]
+    ) -> Tuple[str, Optional[datetime]]:
+        etag = version_etag(timestamp_version(updated_at), profile_version or 0)
+        last_modified = max((moment for moment in (updated_at, profile_updated_at) if moment), default=None)
+        return etag, last_modified
+
+    async def get_user_by_email(self, email: str) -> Optional[UserOut]:
         """Get user by email address."""
-        user = user_crud.get_user_by_email(self.db, email)
+        user = await async_user_crud.get_user_by_email(self.db, email)
         return UserOut.model_validate(user) if user else None
 
-    def update_user(
+    async def update_user(
         self, 
         user_id: UUID, 
         user_update: UserUpdate, 
         requesting_user: Optional[User] = None
     ) -> UserOut:
         """Update user information."""
-        user = user_crud.get_user_by_id(self.db, user_id)
+        user = await async_user_crud.get_user_by_id(self.db, user_id)
         if not user:
             raise NotFoundError("User not found")
         
@@ -160,7 +181,8 @@ class UserService:
 
         try:
             update_data = user_update.model_dump(exclude_unset=True)
-            updated_user = user_crud.update_user(self.db, user, update_data)
+            updated_user = await async_user_crud.update_user(self.db, user, update_data)
+            auth_cache.invalidate(user_id)
             return UserOut.model_validate(updated_user)
         except DatabaseConflictError as e:
             logger.warning("Conflict during user update: %s", e)
@@ -169,14 +191,14 @@ class UserService:
             logger.error("Database error during user update: %s", e)
             raise ServiceError("Failed to update user") from e
 
-    def update_user_status(
+    async def update_user_status(
         self, 
         user_id: UUID, 
         status: str, 
         requesting_user: Optional[User] = None
     ) -> UserOut:
         """Update user account status."""
-        user = user_crud.get_user_by_id(self.db, user_id)
+        user = await async_user_crud.get_user_by_id(self.db, user_id)
         if not user:
             raise NotFoundError("User not found")
 
@@ -188,20 +210,21 @@ class UserService:
             raise ValidationError(f"Invalid status: {status}")
 
         try:
-            updated_user = user_crud.status_update(self.db, user, status)
+            updated_user = await async_user_crud.status_update(self.db, user, status)
+            auth_cache.invalidate(user_id)
             return UserOut.model_validate(updated_user)
         except DatabaseError as e:
             logger.error("Database error during status update: %s", e)
             raise ServiceError("Failed to update user status") from e
 
-    def delete_user(
+    async def delete_user(
         self, 
         user_id: UUID, 
         hard_delete: bool = False, 
         requesting_user: Optional[User] = None
     ) -> bool:
         """Delete user account (soft or hard delete)."""
-        user = user_crud.get_user_by_id(self.db, user_id)
+        user = await async_user_crud.get_user_by_id(self.db, user_id)
         if not user:
             raise NotFoundError("User not found")
 
@@ -211,48 +234,264 @@ class UserService:
                 raise PermissionError("Not authorized to delete this user")
 
         try:
-            return user_crud.delete_user(self.db, user, hard_delete)
+            deleted = await async_user_crud.delete_user(self.db, user, hard_delete)
+            auth_cache.invalidate(user_id)
+            return deleted
         except DatabaseError as e:
             logger.error("Database error during user deletion: %s", e)
             raise ServiceError("Failed to delete user") from e
 
-    def list_users(
-        self, 
-        skip: int = 0, 
-        limit: int = 100, 
+    async def list_users(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        include_total: bool = True,
         requesting_user: Optional[User] = None
-    ) -> List[UserOut]:
-        """List users (admin only)."""
+    ) -> UserPage:
+        """
+        List users newest first with keyset pagination (admin only).
+        `cursor` is the `next_cursor` of the previous page; filters are
+        role, status, is_verified, onboarding_completed and email_domain.
+        """
         if requesting_user and requesting_user.role != UserRole.admin:
             raise PermissionError("Not authorized to list users")
 
         try:
-            # This would need to be implemented in user_crud
-            # users = user_crud.get_users(self.db, skip=skip, limit=limit)
-            # return [UserOut.model_validate(user) for user in users]
-            raise NotImplementedError("User listing not implemented")
-        except DatabaseError as e:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise ValidationError("Invalid cursor") from e
+
+        try:
+            # One extra row tells us whether another page exists
+            users = await async_user_crud.list_users(self.db, limit + 1, after, filters)
+            items = users[:limit]
+            next_cursor = (
+                encode_cursor(items[-1].created_at, items[-1].id)
+                if len(users) > limit else None
+            )
+            estimated_total = (
+                await async_user_crud.estimate_user_count(
+                    self.db, filters, cap=settings.USER_LIST_COUNT_CAP
+                )
+                if include_total else None
+            )
+            # End the read transaction before building the page: its connection is
+            # returned now instead of when the handler returns (same one round trip).
+            # In a batch this ends the shared read transaction (app.api.batch_routes)
+            await self.db.commit()
+            return UserPage(
+                items=USER_OUT_LIST.validate_python(items, from_attributes=True),
+                next_cursor=next_cursor,
+                estimated_total=estimated_total,
+            )
+        except (DatabaseError, SQLAlchemyError) as e:
             logger.error("Database error during user listing: %s", e)
             raise ServiceError("Failed to list users") from e
 
-    def search_users(
+    async def get_user_stats(self, requesting_user: Optional[User] = None) -> UserStatsOverview:
+        """
+        Statistics overview from the user_stats counters (admin only).
+        One small-table read, independent of the number of users.
+        """
+        if requesting_user and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to view user statistics")
+
+        try:
+            stats = await async_stats_crud.get_user_stats(self.db)
+        except SQLAlchemyError as e:
+            logger.error("Database error while reading user stats: %s", e)
+            raise ServiceError("Failed to read user statistics") from e
+
+        counters = {stat.key: stat.value for stat in stats}
+        reconciled = [stat.reconciled_at for stat in stats if stat.reconciled_at is not None]
+        return UserStatsOverview(
+            total_users=counters.get("total", 0),
+            active_users=counters.get("status:active", 0),
+            verified_users=counters.get("verified", 0),
+            onboarding_completed=counters.get("onboarding_completed", 0),
+            profiles=counters.get("profiles", 0),
+            profiles_completed=counters.get("profiles_with_content", 0),
+            by_role=self._counters_with_prefix(counters, "role:"),
+            by_status=self._counters_with_prefix(counters, "status:"),
+            last_reconciled_at=max(reconciled, default=None),
+        )
+
+    async def bulk_update_users(
+        self,
+        bulk_in: BulkUserUpdate,
+        requesting_user: Optional[User] = None
+    ) -> JobOut:
+        """
+        Change status, role and/or is_verified of many users (admin only).
+        Runs in the background as chunked set-based UPDATEs; returns the job
+        to poll for progress.
+        """
+        values = {
+            key: value for key, value in (
+                ("status", Status(bulk_in.status.value) if bulk_in.status is not None else None),
+                ("role", UserRole(bulk_in.role.value) if bulk_in.role is not None else None),
+                ("is_verified", bulk_in.is_verified),
+            ) if value is not None
+        }
+        if not values:
+            raise ValidationError("Nothing to update: set status, role or is_verified")
+        return self._submit_bulk_update("bulk_update", bulk_in.user_ids, values, requesting_user)
+
+    async def bulk_delete_users(
+        self,
+        user_ids: List[UUID],
+        requesting_user: Optional[User] = None
+    ) -> JobOut:
+        """Soft-delete (deactivate) many users in the background (admin only)."""
+        return self._submit_bulk_update(
+            "bulk_delete", user_ids, {"status": Status.deactivated}, requesting_user
+        )
+
+    async def import_users(
+        self,
+        body: AsyncIterator[bytes],
+        fmt: Optional[str] = None,
+        content_type: Optional[str] = None,
+        requesting_user: Optional[User] = None
+    ) -> JobOut:
+        """
+        Bulk-create users with profiles from a CSV or NDJSON upload (admin only).
+        The body is spooled to disk, then imported by a background job; rows
+        that fail validation or collide with existing accounts are listed in
+        the job's error report.
+        """
+        if requesting_user and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to import users")
+
+        fmt = fmt or ("csv" if content_type and "csv" in content_type else "ndjson")
+        if fmt not in import_service.IMPORT_FORMATS:
+            raise ValidationError(f"Unsupported import format: {fmt}")
+
+        path, lines = await import_service.spool_upload(body, settings.BULK_IMPORT_MAX_BYTES)
+        estimated_rows = max(0, lines - 1) if fmt == "csv" else lines
+        job = job_registry.submit(
+            "user_import", estimated_rows, lambda job: import_service.run_user_import(job, path, fmt)
+        )
+        return JobOut.from_job(job)
+
+    async def get_bulk_job(self, job_id: UUID, requesting_user: Optional[User] = None) -> JobOut:
+        """Progress of a bulk job started on this worker (admin only)."""
+        if requesting_user and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to view bulk jobs")
+
+        job = job_registry.get(job_id)
+        if job is None:
+            raise NotFoundError("Job not found")
+        return JobOut.from_job(job)
+
+    async def get_bulk_job_report(self, job_id: UUID, requesting_user: Optional[User] = None) -> str:
+        """Path of a finished job's per-row error report (admin only)."""
+        if requesting_user and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to view bulk jobs")
+
+        job = job_registry.get(job_id)
+        if job is None:
+            raise NotFoundError("Job not found")
+        if not job.done:
+            raise ConflictError("Job is still running")
+        if not job.report_path:
+            raise NotFoundError("Job has no error report")
+        return job.report_path
+
+    def export_users(
+        self,
+        fmt: str = "ndjson",
+        after: Optional[UUID] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        include_sensitive: bool = False,
+        requesting_user: Optional[User] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream users with their profiles as NDJSON or CSV, in id order (admin only).
+        Resume an interrupted export with after=<last id received>. Contact and
+        health fields are only included with include_sensitive.
+        """
+        if requesting_user and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to export users")
+        if fmt not in export_service.EXPORT_FORMATS:
+            raise ValidationError(f"Unsupported export format: {fmt}")
+
+        logger.info(
+            "User export (%s, sensitive=%s, after=%s) by %s",
+            fmt, include_sensitive, after, requesting_user.id if requesting_user else None
+        )
+        return export_service.stream_export(fmt, filters, after, include_sensitive, settings.EXPORT_YIELD_PER)
+
+    def _submit_bulk_update(
+        self,
+        kind: str,
+        user_ids: List[UUID],
+        values: Dict[str, Any],
+        requesting_user: Optional[User]
+    ) -> JobOut:
+        if requesting_user and requesting_user.role != UserRole.admin:
+            raise PermissionError("Not authorized to run bulk operations")
+
+        user_ids = list(dict.fromkeys(user_ids))
+        if len(user_ids) > settings.BULK_UPDATE_MAX_IDS:
+            raise ValidationError(f"At most {settings.BULK_UPDATE_MAX_IDS} users per bulk operation")
+
+        job = job_registry.submit(kind, len(user_ids), lambda job: run_bulk_update(job, user_ids, values))
+        return JobOut.from_job(job)
+
+    @staticmethod
+    def _counters_with_prefix(counters: Dict[str, int], prefix: str) -> Dict[str, int]:
+        """{"role:admin": 3, ...} -> {"admin": 3, ...} for one counter family."""
+        return {key[len(prefix):]: value for key, value in counters.items() if key.startswith(prefix)}
+
+    async def search_users(
         self, 
         query: str, 
+        limit: int = 20,
+        fuzzy: bool = True,
         requesting_user: Optional[User] = None
     ) -> List[UserOut]:
-        """Search users by username or email (admin only)."""
+        """Search users by username, email, full name or location (admin only)."""
         if requesting_user and requesting_user.role != UserRole.admin:
             raise PermissionError("Not authorized to search users")
 
+        if not search_terms(query):
+            raise ValidationError(f"Search query needs a term of at least {MIN_TERM_LENGTH} characters")
+
         try:
-            # This would need to be implemented in user_crud
-            # users = user_crud.search_users(self.db, query=query)
-            # return [UserOut.model_validate(user) for user in users]
-            raise NotImplementedError("User search not implemented")
-        except DatabaseError as e:
+            users = await async_search_crud.search_users(
+                self.db, query, limit, fuzzy, candidates=settings.SEARCH_MAX_CANDIDATES,
+                min_similarity=settings.SEARCH_MIN_SIMILARITY
+            )
+            return USER_OUT_LIST.validate_python(users, from_attributes=True)
+        except SQLAlchemyError as e:
             logger.error("Database error during user search: %s", e)
             raise ServiceError("Failed to search users") from e
 
+
+# -----------------------------
+# Bulk Jobs
+# -----------------------------
+def run_bulk_update(job: Job, user_ids: List[UUID], values: Dict[str, Any]) -> None:
+    """
+    Job body (worker thread, sync session): apply values chunk by chunk,
+    record progress and drop the changed users' auth snapshots after each
+    committed chunk.
+    """
+    db = SessionLocal()
+    try:
+        for processed, changed in user_crud.iter_bulk_update_users(
+            db, user_ids, values, chunk_size=settings.BULK_UPDATE_CHUNK_SIZE
+        ):
+            auth_cache.invalidate_many(changed)
+            job.processed += processed
+            job.affected += len(changed)
+    finally:
+        db.close()
+    logger.info("Bulk job %s changed %d of %d users", job.id, job.affected, job.total)
+
+
 def out():
 # def list_users(
 #     self,
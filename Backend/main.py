@@ -1,12 +1,51 @@
 # app/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import Base, engine
-from app.api import user_routes
-from app.models import user_models
+from app.core.config import engine, async_engine
+from app.core.compression import CompressionMiddleware
+from app.core.hashing import password_hasher
+from app.core.jobs import job_registry
+from app.core.rate_limit import rate_limit_sweeper
+from app.api import user_routes, internal_routes, batch_routes
+from app.database.migrations import upgrade_schema
+from app.models import user_models, auth_models
+from app.services.maintenance_service import (
+    load_revocation_filter,
+    refresh_token_purge_task,
+    seed_health_terms,
+    seed_search_index,
+    seed_user_stats,
+    touch_buffer_flush_task,
+    user_stats_reconcile_task,
+)
+
 
-app = FastAPI(title="Harmony API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_revocation_filter()
+    seed_user_stats()
+    seed_search_index()
+    seed_health_terms()
+    rate_limit_sweeper.start()
+    refresh_token_purge_task.start()
+    touch_buffer_flush_task.start()
+    user_stats_reconcile_task.start()
+    yield
+    # Shutdown: finish bulk jobs, stop background jobs, flush buffered writes and drain executors
+    await job_registry.wait_all()
+    await touch_buffer_flush_task.stop()
+    await touch_buffer_flush_task.run_once()
+    await user_stats_reconcile_task.stop()
+    await refresh_token_purge_task.stop()
+    rate_limit_sweeper.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Harmony API", lifespan=lifespan)
 
 # ✅ Add CORS middleware here
 app.add_middleware(
@@ -17,8 +56,13 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
-# DB setup
-Base.metadata.create_all(bind=engine)
+# Negotiated zstd / br / gzip for list and export payloads
+app.add_middleware(CompressionMiddleware)
+
+# DB setup: create new tables and bring existing ones up to the models
+upgrade_schema(engine)
 
 # Routes
 app.include_router(user_routes.router, prefix="/api")
+app.include_router(internal_routes.router, prefix="/api")
+app.include_router(batch_routes.router, prefix="/api")
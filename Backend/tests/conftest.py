@@ -0,0 +1,113 @@
+# tests/conftest.py
+"""
+Shared fixtures: the application on a throwaway SQLite database.
+
+DATABASE_URL is pointed at a temporary file before anything imports the
+app, so engines, create_all and the lifespan tasks (stats seed, revocation
+filter, write-behind flush) run exactly as in production. Rate limiting is
+off by default; the rate limiter tests exercise the limiters directly.
+"""
+
+import os
+import tempfile
+import time
+import uuid
+
+# Point the app at a throwaway SQLite database before any app import
+_tmpdir = tempfile.mkdtemp(prefix="harmony-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/tests.db"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["RATE_LIMIT_SQLITE_PATH"] = f"{_tmpdir}/ratelimit.db"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, update  # noqa: E402
+
+from app.core.config import SessionLocal, async_engine  # noqa: E402
+from app.models.user_models import User, UserRole  # noqa: E402
+from main import app  # noqa: E402
+
+PASSWORD = "Test-Passw0rd"
+
+
+class Account:
+    """A registered user: id, credentials and the headers of its latest login."""
+
+    def __init__(self, id: str, username: str, email: str, tokens: dict):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.tokens = tokens
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.tokens['access_token']}"}
+
+
+class StatementCounter:
+    """Counts statements executed on an engine while listening."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(client):
+    """Register a user with a unique name, optionally promote it, and log in."""
+
+    def make_user(role: UserRole = UserRole.user, prefix: str = "user") -> Account:
+        username = f"{prefix}{uuid.uuid4().hex[:10]}"
+        email = f"{username}@tests.example.com"
+        response = client.post(
+            "/api/v1/users/register",
+            json={"username": username, "email": email, "phone_number": None, "password": PASSWORD},
+        )
+        assert response.status_code == 201, response.text
+        if role != UserRole.user:
+            with SessionLocal() as db:
+                db.execute(update(User).where(User.email == email).values(role=role))
+                db.commit()
+        return Account(response.json()["id"], username, email, login(client, email))
+
+    return make_user
+
+
+@pytest.fixture
+def admin(make_user) -> Account:
+    return make_user(UserRole.admin, prefix="admin")
+
+
+@pytest.fixture
+def statement_counter():
+    """Counts statements run by request handlers on the async engine."""
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+
+def login(client: TestClient, email: str, password: str = PASSWORD) -> dict:
+    response = client.post("/api/v1/users/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def wait_for_job(client: TestClient, admin: Account, job: dict, timeout: float = 10.0) -> dict:
+    """Poll a bulk job until it has completed or failed."""
+    deadline = time.monotonic() + timeout
+    while job["status"] in ("pending", "running"):
+        assert time.monotonic() < deadline, f"job still {job['status']}"
+        time.sleep(0.05)
+        response = client.get(f"/api/v1/users/bulk/jobs/{job['job_id']}", headers=admin.headers)
+        assert response.status_code == 200, response.text
+        job = response.json()
+    return job
@@ -0,0 +1,94 @@
+# tests/test_auth_cache.py
+"""Auth snapshot cache: cache hits skip the database, every write path invalidates."""
+
+from uuid import UUID
+
+from app.core.auth_cache import auth_cache
+from app.models.user_models import UserRole
+from app.services import auth_service
+from tests.conftest import PASSWORD, wait_for_job
+
+
+def _stats(client, account):
+    return client.get("/api/v1/users/stats/overview", headers=account.headers)
+
+
+def _cached(account) -> bool:
+    return auth_cache.get(UUID(account.id)) is not None
+
+
+def test_cache_hit_runs_no_auth_query(client, admin, monkeypatch):
+    loads = []
+    load = auth_service.get_user_by_id
+    monkeypatch.setattr(auth_service, "get_user_by_id", lambda db, user_id: loads.append(user_id) or load(db, user_id))
+
+    auth_cache.invalidate(UUID(admin.id))
+    assert _stats(client, admin).status_code == 200
+    assert loads == [UUID(admin.id)]
+    for _ in range(3):
+        assert _stats(client, admin).status_code == 200
+    assert loads == [UUID(admin.id)]
+
+
+def test_demoted_admin_is_rejected_at_once(client, make_user, admin):
+    demoted = make_user(UserRole.admin, prefix="admin")
+    assert _stats(client, demoted).status_code == 200 and _cached(demoted)
+
+    body = {"username": demoted.username, "email": demoted.email, "phone_number": None, "password": None,
+            "role": "user"}
+    response = client.put(f"/api/v1/users/{demoted.id}", json=body, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    assert not _cached(demoted)
+    assert _stats(client, demoted).status_code == 403
+
+
+def test_status_change_and_deletes_reject_at_once(client, make_user, admin):
+    suspended, deactivated, removed = make_user(), make_user(), make_user()
+    for user in (suspended, deactivated, removed):
+        assert client.get("/api/v1/users/me", headers=user.headers).status_code == 200 and _cached(user)
+
+    response = client.patch(f"/api/v1/users/{suspended.id}/status", json={"status": "suspended"}, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    assert client.delete(f"/api/v1/users/{deactivated.id}", headers=admin.headers).status_code == 200
+    response = client.delete(f"/api/v1/users/{removed.id}", params={"hard_delete": "true"}, headers=admin.headers)
+    assert response.status_code == 200, response.text
+
+    for user in (suspended, deactivated, removed):
+        assert not _cached(user)
+        assert client.get("/api/v1/users/me", headers=user.headers).status_code == 401
+
+
+def test_password_change_invalidates(client, make_user):
+    user = make_user()
+    assert client.get("/api/v1/users/me", headers=user.headers).status_code == 200 and _cached(user)
+    response = client.post(
+        "/api/v1/users/me/change-password",
+        json={"old_password": PASSWORD, "new_password": PASSWORD + "-new"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+    assert not _cached(user)
+    assert client.get("/api/v1/users/me", headers=user.headers).status_code == 401
+
+
+def test_bulk_jobs_invalidate_every_changed_user(client, make_user, admin):
+    demoted = [make_user(UserRole.admin, prefix="admin") for _ in range(2)]
+    deleted = [make_user() for _ in range(2)]
+    for user in demoted:
+        assert _stats(client, user).status_code == 200
+    for user in deleted:
+        assert client.get("/api/v1/users/me", headers=user.headers).status_code == 200
+
+    response = client.put(
+        "/api/v1/users/bulk/update", json={"user_ids": [user.id for user in demoted], "role": "user"},
+        headers=admin.headers,
+    )
+    assert wait_for_job(client, admin, response.json())["status"] == "completed"
+    response = client.post(
+        "/api/v1/users/bulk/delete", json={"user_ids": [user.id for user in deleted]}, headers=admin.headers
+    )
+    assert wait_for_job(client, admin, response.json())["status"] == "completed"
+
+    assert not any(_cached(user) for user in demoted + deleted)
+    assert [_stats(client, user).status_code for user in demoted] == [403, 403]
+    assert [client.get("/api/v1/users/me", headers=user.headers).status_code for user in deleted] == [401, 401]
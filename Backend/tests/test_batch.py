@@ -0,0 +1,59 @@
+# tests/test_batch.py
+"""POST /batch: shared authentication and session, conditional GETs, unbufferable responses."""
+
+from app.core.config import settings
+
+
+def _batch(client, account, *requests):
+    response = client.post("/api/v1/batch", json={"requests": list(requests)}, headers=account.headers)
+    assert response.status_code == 200, response.text
+    return response.json()["responses"]
+
+
+def test_batch_runs_sub_requests_in_order(client, make_user):
+    user = make_user()
+    me, profile, missing = _batch(
+        client, user,
+        {"id": "me", "path": "/api/v1/users/me"},
+        {"id": "profile", "path": "/api/v1/users/me/profile"},
+        {"id": "missing", "path": "/api/v1/users/nothing-here/profile"},
+    )
+    assert (me["id"], me["status"], me["body"]["id"]) == ("me", 200, user.id)
+    assert "etag" in me["headers"] and "content-length" not in me["headers"]
+    assert (profile["id"], profile["status"], profile["body"]["id"]) == ("profile", 200, user.id)
+    assert missing["id"] == "missing" and missing["status"] >= 400
+
+
+def test_batch_conditional_get(client, make_user):
+    user = make_user()
+    etag = client.get("/api/v1/users/me", headers=user.headers).headers["etag"]
+    (result,) = _batch(client, user, {"path": "/api/v1/users/me", "headers": {"If-None-Match": etag}})
+    assert (result["status"], result["body"]) == (304, None)
+
+
+def test_streamed_sub_response_is_rejected(client, admin):
+    export, me = _batch(
+        client, admin,
+        {"id": "export", "path": "/api/v1/users/export?format=ndjson"},
+        {"id": "me", "path": "/api/v1/users/me"},
+    )
+    assert export["status"] == 413
+    assert "Streamed" in export["body"]["detail"]
+    # The other sub-requests are unaffected
+    assert me["status"] == 200
+
+
+def test_sub_response_over_the_body_cap_is_rejected(client, make_user, monkeypatch):
+    user = make_user()
+    monkeypatch.setattr(settings, "BATCH_MAX_BODY_BYTES", 64)
+    (profile,) = _batch(client, user, {"path": "/api/v1/users/me/profile"})
+    assert profile["status"] == 413
+    assert "64 bytes" in profile["body"]["detail"]
+
+
+def test_nested_batch_is_refused(client, make_user):
+    user = make_user()
+    response = client.post(
+        "/api/v1/batch", json={"requests": [{"path": "/api/v1/batch"}]}, headers=user.headers
+    )
+    assert response.status_code == 422
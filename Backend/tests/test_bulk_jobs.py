@@ -0,0 +1,61 @@
+# tests/test_bulk_jobs.py
+"""Bulk admin operations: chunked background jobs, progress and auth cache invalidation."""
+
+import uuid
+
+from app.core.config import settings
+from tests.conftest import wait_for_job
+
+
+def _user(client, admin, user_id: str) -> dict:
+    response = client.get(f"/api/v1/users/{user_id}", headers=admin.headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_bulk_update_runs_in_chunks(client, make_user, admin, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_UPDATE_CHUNK_SIZE", 2)
+    users = [make_user() for _ in range(3)]
+    ids = [user.id for user in users]
+    unknown = str(uuid.uuid4())
+    cohort = {"condition": "anxiety"}
+    # Also warms users[0]'s auth snapshot, which the job has to drop
+    assert client.get("/api/v1/users/cohorts", params=cohort, headers=users[0].headers).status_code == 403
+
+    response = client.put(
+        "/api/v1/users/bulk/update",
+        json={"user_ids": ids + [ids[0], unknown], "status": "suspended", "role": "clinician",
+              "is_verified": True},
+        headers=admin.headers,
+    )
+    assert response.status_code == 202, response.text
+    job = wait_for_job(client, admin, response.json())
+
+    assert job["status"] == "completed" and job["finished_at"] is not None
+    # Duplicates are dropped; the unknown id is processed but changes nothing
+    assert (job["total"], job["processed"], job["affected"]) == (4, 4, 3)
+    for user_id in ids:
+        user = _user(client, admin, user_id)
+        assert (user["status"], user["role"], user["is_verified"]) == ("suspended", "clinician", True)
+    # Authorization sees the new status at once: the cached snapshot was dropped
+    assert client.get("/api/v1/users/cohorts", params=cohort, headers=users[0].headers).status_code == 401
+
+
+def test_bulk_delete_deactivates(client, make_user, admin):
+    ids = [make_user().id for _ in range(2)]
+    response = client.post("/api/v1/users/bulk/delete", json={"user_ids": ids}, headers=admin.headers)
+    assert response.status_code == 202, response.text
+    job = wait_for_job(client, admin, response.json())
+
+    assert (job["status"], job["affected"]) == ("completed", 2)
+    assert {_user(client, admin, user_id)["status"] for user_id in ids} == {"deactivated"}
+
+
+def test_bulk_requests_are_validated(client, make_user, admin):
+    user = make_user()
+    response = client.put("/api/v1/users/bulk/update", json={"user_ids": [user.id]}, headers=admin.headers)
+    assert response.status_code == 422
+    response = client.post("/api/v1/users/bulk/delete", json={"user_ids": [user.id]}, headers=user.headers)
+    assert response.status_code == 403
+    response = client.get(f"/api/v1/users/bulk/jobs/{uuid.uuid4()}", headers=admin.headers)
+    assert response.status_code == 404
@@ -0,0 +1,40 @@
+# tests/test_cohorts.py
+"""Clinician cohort queries over profile_health_terms."""
+
+import uuid
+from uuid import UUID
+
+from sqlalchemy import delete
+
+from app.core.config import SessionLocal
+from app.models.user_models import ProfileHealthTerm, UserRole
+from app.services.maintenance_service import seed_health_terms
+
+
+def _cohort_ids(client, clinician, **params):
+    response = client.get("/api/v1/users/cohorts", params=params, headers=clinician.headers)
+    assert response.status_code == 200, response.text
+    return [profile["id"] for profile in response.json()["items"]]
+
+
+def test_startup_seed_indexes_profiles_without_terms(client, make_user):
+    condition = f"condition-{uuid.uuid4().hex[:8]}"
+    patient = make_user(prefix="patient")
+    response = client.patch(
+        "/api/v1/users/me/profile",
+        json={"conditions": [condition.upper()], "medications": [{"name": "Sertraline"}]},
+        headers=patient.headers,
+    )
+    assert response.status_code == 200, response.text
+    clinician = make_user(UserRole.clinician, prefix="clinician")
+    assert _cohort_ids(client, clinician, condition=condition) == [patient.id]
+
+    # A profile from before the cohort triggers existed: no term rows
+    with SessionLocal() as db:
+        db.execute(delete(ProfileHealthTerm).where(ProfileHealthTerm.profile_id == UUID(patient.id)))
+        db.commit()
+    assert _cohort_ids(client, clinician, condition=condition) == []
+
+    seed_health_terms()
+
+    assert _cohort_ids(client, clinician, condition=condition, medication="sertraline") == [patient.id]
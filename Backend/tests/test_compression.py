@@ -0,0 +1,167 @@
+# tests/test_compression.py
+"""Negotiated response compression: codings, thresholds, streaming and validators."""
+
+import gzip
+import json
+import uuid
+
+import brotli
+import pytest
+import zstandard
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CODECS, CompressionMiddleware, available_codecs, negotiate_encoding
+from app.core.config import settings
+from tests.conftest import PASSWORD
+
+BODY = json.dumps([{"id": i, "username": f"user{i}"} for i in range(200)]).encode()
+DECODE = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+async def _json(request):
+    size = int(request.query_params.get("size", len(BODY)))
+    return Response(BODY[:size], media_type="application/json", headers={"ETag": '"7"'})
+
+
+async def _encoded(request):
+    return Response(gzip.compress(BODY), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+async def _png(request):
+    return Response(b"\x89PNG" + bytes(4096), media_type="image/png")
+
+
+async def _stream(request):
+    async def rows():
+        for i in range(3):
+            yield BODY[i * 100:(i + 1) * 100]
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@pytest.fixture(scope="module")
+def raw():
+    """A tiny app behind the middleware; bodies are read as sent, not decoded."""
+    routes = [Route("/json", _json), Route("/encoded", _encoded), Route("/png", _png), Route("/stream", _stream)]
+    app = Starlette(routes=routes)
+    app.add_middleware(CompressionMiddleware)
+    with TestClient(app) as client:
+        yield client
+
+
+def _get(client, path, accept_encoding, **params):
+    with client.stream("GET", path, params=params, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize(("header", "expected"), [
+    ("gzip", "gzip"),
+    ("gzip, br, zstd", "zstd"),             # ties go to the server's preference
+    ("gzip;q=1, br;q=0.5", "gzip"),
+    ("br;q=0.8, *;q=0.9", "zstd"),          # "*" covers the codings not listed
+    ("*, zstd;q=0", "br"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=nope", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, CODECS) == expected
+
+
+def test_every_codec_round_trips_a_flushed_stream():
+    for coding, factory in available_codecs().items():
+        compressor = factory()
+        chunks = [compressor.compress(BODY[:500], False), compressor.compress(BODY[500:], True)]
+        # Each flushed chunk decodes on its own prefix: nothing is held back
+        assert DECODE[coding](b"".join(chunks)) == BODY, coding
+        assert chunks[0], coding
+
+
+@pytest.mark.parametrize("coding", ["gzip", "br", "zstd"])
+def test_large_bodies_are_compressed(raw, coding):
+    response, body = _get(raw, "/json", coding)
+    assert response.headers["content-encoding"] == coding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body) < len(BODY)
+    assert DECODE[coding](body) == BODY
+
+
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0", "compress"])
+def test_identity_when_nothing_acceptable(raw, accept_encoding):
+    response, body = _get(raw, "/json", accept_encoding)
+    assert "content-encoding" not in response.headers
+    # The representation still varies on the header
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert body == BODY and response.headers["etag"] == '"7"'
+
+
+def test_small_bodies_are_sent_as_is(raw):
+    size = settings.COMPRESSION_MINIMUM_SIZE - 1
+    response, body = _get(raw, "/json", "gzip", size=size)
+    assert "content-encoding" not in response.headers and "vary" not in response.headers
+    assert body == BODY[:size]
+
+    response, _ = _get(raw, "/json", "gzip", size=settings.COMPRESSION_MINIMUM_SIZE)
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_encoded_and_binary_responses_pass_through(raw):
+    response, body = _get(raw, "/encoded", "zstd")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == BODY
+
+    response, body = _get(raw, "/png", "gzip")
+    assert "content-encoding" not in response.headers and body.startswith(b"\x89PNG")
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk(raw):
+    response, body = _get(raw, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    # Streams are compressed whatever their size
+    assert gzip.decompress(body) == BODY[:300]
+
+
+def test_compressed_responses_have_a_weak_etag(raw):
+    response, _ = _get(raw, "/json", "gzip")
+    assert response.headers["etag"] == 'W/"7"'
+
+
+def test_application_responses(client, admin):
+    # Enough users for a list page above the size threshold
+    for _ in range(8):
+        username = f"cmp{uuid.uuid4().hex[:10]}"
+        client.post(
+            "/api/v1/users/register",
+            json={"username": username, "email": f"{username}@tests.example.com",
+                  "phone_number": None, "password": PASSWORD},
+        )
+    response = client.get("/api/v1/users/", params={"limit": 100}, headers={**admin.headers, "Accept-Encoding": "br"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()
+
+    with client.stream(
+        "GET", "/api/v1/users/export", params={"format": "ndjson"},
+        headers={**admin.headers, "Accept-Encoding": "gzip"},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        rows = [json.loads(line) for line in b"".join(response.iter_bytes()).splitlines()]
+    assert admin.id in {row["id"] for row in rows}
+
+    # A conditional GET matches the weak ETag of a compressed response
+    user = client.get("/api/v1/users/me", headers={**admin.headers, "Accept-Encoding": "gzip"})
+    response = client.get(
+        "/api/v1/users/me",
+        headers={**admin.headers, "Accept-Encoding": "gzip", "If-None-Match": f"W/{user.headers['etag'].removeprefix('W/')}"},
+    )
+    assert response.status_code == 304
@@ -0,0 +1,53 @@
+# tests/test_conditional_get.py
+"""Conditional GET (ETag / Last-Modified) for /me and /me/profile."""
+
+import pytest
+
+PATHS = ["/api/v1/users/me", "/api/v1/users/me/profile"]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_matching_if_none_match_is_not_modified(client, make_user, path):
+    user = make_user()
+    response = client.get(path, headers=user.headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+
+    for tag in (etag, f"W/{etag}", f'"nope", {etag}', "*"):
+        not_modified = client.get(path, headers={**user.headers, "If-None-Match": tag})
+        assert not_modified.status_code == 304, tag
+        assert not_modified.content == b"" and not_modified.headers["etag"] == etag
+
+    assert client.get(path, headers={**user.headers, "If-None-Match": '"nope"'}).status_code == 200
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_a_profile_write_changes_the_validators(client, make_user, path):
+    user = make_user()
+    etag = client.get(path, headers=user.headers).headers["etag"]
+    response = client.patch(
+        "/api/v1/users/me/profile", json={"full_name": "Changed"},
+        headers={**user.headers, "Content-Type": "application/merge-patch+json"},
+    )
+    assert response.status_code == 200, response.text
+
+    response = client.get(path, headers={**user.headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    body = response.json()
+    assert (body if path.endswith("/profile") else body["profile"])["full_name"] == "Changed"
+
+
+def test_if_modified_since(client, make_user):
+    user = make_user()
+    path = "/api/v1/users/me/profile"
+    last_modified = client.get(path, headers=user.headers).headers["last-modified"]
+    response = client.get(path, headers={**user.headers, "If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    # If-None-Match takes precedence over If-Modified-Since
+    both = {**user.headers, "If-Modified-Since": last_modified, "If-None-Match": '"x"'}
+    response = client.get(path, headers=both)
+    assert response.status_code == 200
+    response = client.get(path, headers={**user.headers, "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert response.status_code == 200
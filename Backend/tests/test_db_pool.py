@@ -0,0 +1,105 @@
+# tests/test_db_pool.py
+"""Connection-pool metrics: checkout wait / hold histograms, in-use counts and /internal/db-pool."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.database import PoolMetrics, WAIT_BUCKETS_MS, _attach_metrics, _instrumented_pool_class, engine_options
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """An instrumented engine of its own: one pooled connection plus one overflow, 0.1 s timeout."""
+    url = f"sqlite:///{tmp_path}/pool.db"
+    pool_settings = settings.model_copy(update={
+        "DATABASE_POOL_SIZE": 1, "DATABASE_MAX_OVERFLOW": 1, "DATABASE_POOL_TIMEOUT_SECONDS": 0.1,
+    })
+    metrics = PoolMetrics("test")
+    engine = create_engine(url, **engine_options(pool_settings, url, _instrumented_pool_class(QueuePool, metrics)))
+    _attach_metrics(engine, metrics)
+    yield engine, metrics
+    engine.dispose()
+
+
+def _bucket_total(summary: dict) -> int:
+    assert len(summary["histogram"]) == len(WAIT_BUCKETS_MS) + 1
+    return sum(summary["histogram"].values())
+
+
+def _slow_buckets(summary: dict, min_ms: float) -> int:
+    """Observations in buckets whose upper bound is above min_ms."""
+    bounds = list(WAIT_BUCKETS_MS) + [float("inf")]
+    return sum(n for bound, n in zip(bounds, summary["histogram"].values()) if bound > min_ms)
+
+
+def test_checkout_counts_and_hold_histogram(pool):
+    engine, metrics = pool
+    first, second = engine.connect(), engine.connect()
+    first.execute(text("SELECT 1"))
+    stats = metrics.stats()
+    assert (stats["checked_out"], stats["overflow"]) == (2, 1)
+    assert stats["connections_opened"] == 2 and stats["connection_age_seconds"]["count"] == 2
+
+    time.sleep(0.02)
+    first.close()
+    second.close()
+    stats = metrics.stats()
+    assert stats["checked_out"] == 0
+    hold = stats["checkout_hold"]
+    assert hold["count"] == _bucket_total(hold) == 2
+    assert hold["avg_ms"] >= 20 and _slow_buckets(hold, 10) == 2
+    assert stats["checkout_wait"]["count"] == 2 and stats["checkout_wait"]["timeouts"] == 0
+
+
+def test_waiting_for_a_connection_is_recorded(pool):
+    engine, metrics = pool
+    held = [engine.connect(), engine.connect()]
+
+    def release():
+        time.sleep(0.05)
+        held.pop().close()
+
+    threading.Thread(target=release).start()
+    with engine.connect():  # waits until a connection is returned
+        pass
+    held.pop().close()
+
+    wait = metrics.stats()["checkout_wait"]
+    assert wait["count"] == _bucket_total(wait) == 3
+    assert wait["max_ms"] >= 40 and _slow_buckets(wait, 10) == 1
+
+
+def test_pool_timeouts_are_counted(pool):
+    engine, metrics = pool
+    held = [engine.connect(), engine.connect()]
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    for connection in held:
+        connection.close()
+
+    wait = metrics.stats()["checkout_wait"]
+    assert wait["timeouts"] == 1 and wait["count"] == 3
+    assert wait["max_ms"] >= 100
+
+
+def test_db_pool_endpoint(client, make_user, admin):
+    client.get("/api/internal/db-pool", headers=admin.headers)  # warms the auth cache
+    before = client.get("/api/internal/db-pool", headers=admin.headers)
+    assert before.status_code == 200
+    stats = before.json()
+    assert stats["async"]["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert stats["sync"]["pool_class"] == "InstrumentedQueuePool"
+    # An auth cache hit: this request holds no connection
+    assert stats["async"]["checked_out"] == 0
+
+    assert client.get("/api/v1/users/me", headers=admin.headers).status_code == 200
+    after = client.get("/api/internal/db-pool", headers=admin.headers).json()["async"]
+    assert after["checkout_hold"]["count"] > stats["async"]["checkout_hold"]["count"]
+    assert after["checkout_wait"]["count"] > stats["async"]["checkout_wait"]["count"]
+
+    assert client.get("/api/internal/db-pool", headers=make_user().headers).status_code == 403
@@ -0,0 +1,84 @@
+# tests/test_export.py
+"""Streaming user export: formats, privacy-aware projection and resuming."""
+
+import csv
+import io
+import json
+import uuid
+
+from tests.conftest import PASSWORD, login
+
+
+def _register(client, domain: str, profile: dict = None, privacy: dict = None) -> str:
+    username = f"exp{uuid.uuid4().hex[:10]}"
+    email = f"{username}@{domain}"
+    response = client.post(
+        "/api/v1/users/register",
+        json={"username": username, "email": email, "phone_number": None, "password": PASSWORD},
+    )
+    assert response.status_code == 201, response.text
+    headers = {"Authorization": f"Bearer {login(client, email)['access_token']}"}
+    if profile:
+        assert client.patch("/api/v1/users/me/profile", json=profile, headers=headers).status_code == 200
+    if privacy:
+        assert client.patch("/api/v1/users/me/profile/privacy", json=privacy, headers=headers).status_code == 200
+    return response.json()["id"]
+
+
+def _export(client, admin, **params):
+    response = client.get("/api/v1/users/export", params=params, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _ndjson(client, admin, **params) -> list:
+    return [json.loads(line) for line in _export(client, admin, format="ndjson", **params).text.splitlines()]
+
+
+def test_ndjson_export_is_in_id_order_and_resumable(client, admin):
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    ids = sorted(_register(client, domain) for _ in range(4))
+
+    rows = _ndjson(client, admin, email_domain=domain)
+    assert [row["id"] for row in rows] == ids
+    assert "password_hash" not in rows[0]
+    assert {row["profile_version"] for row in rows} == {1}
+
+    # Resume after the second row received
+    assert [row["id"] for row in _ndjson(client, admin, email_domain=domain, after=ids[1])] == ids[2:]
+
+
+def test_export_projection_respects_privacy(client, admin):
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    visible = _register(client, domain, {"full_name": "Shown Person", "conditions": ["anxiety"]})
+    hidden = _register(client, domain, {"full_name": "Hidden Person"}, {"show_profile": False})
+
+    rows = {row["id"]: row for row in _ndjson(client, admin, email_domain=domain)}
+    assert rows[visible]["profile_full_name"] == "Shown Person"
+    assert rows[hidden]["profile_full_name"] is None
+    # Contact and health fields only with include_sensitive
+    assert "profile_conditions" not in rows[visible] and "phone_number" not in rows[visible]
+
+    rows = {row["id"]: row for row in _ndjson(client, admin, email_domain=domain, include_sensitive="true")}
+    assert rows[visible]["profile_conditions"] == ["anxiety"]
+    assert rows[hidden]["profile_full_name"] == "Hidden Person"
+
+
+def test_csv_export_matches_ndjson(client, admin):
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    _register(client, domain, {"conditions": ["insomnia"]})
+    _register(client, domain)
+
+    response = _export(client, admin, format="csv", email_domain=domain, include_sensitive="true")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    expected = _ndjson(client, admin, email_domain=domain, include_sensitive="true")
+    assert [row["id"] for row in rows] == [row["id"] for row in expected]
+    assert list(rows[0]) == list(expected[0])
+    # JSON columns are JSON-encoded cells
+    assert [json.loads(row["profile_conditions"]) for row in rows if row["profile_conditions"]] == [["insomnia"]]
+
+
+def test_export_requires_admin(client, make_user):
+    response = client.get("/api/v1/users/export", headers=make_user().headers)
+    assert response.status_code == 403
@@ -0,0 +1,64 @@
+# tests/test_hashing.py
+"""PasswordHasher: off-loop bcrypt, backpressure bound, cancellation accounting."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.hashing import PasswordHasher
+
+
+def test_hash_and_verify():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+
+    async def run():
+        hashed = await hasher.hash("Secret-Passw0rd")
+        return await hasher.verify("Secret-Passw0rd", hashed), await hasher.verify("wrong", hashed)
+
+    try:
+        assert asyncio.run(run()) == (True, False)
+        assert hasher.stats()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_when_saturated_and_counts_cancelled_work_until_it_finishes():
+    hasher = PasswordHasher(workers=1, max_queue=1, retry_after_seconds=7)
+    release = threading.Event()
+
+    async def run():
+        # One job running, one queued: the bound is reached
+        running = asyncio.ensure_future(hasher._submit(release.wait))
+        queued = asyncio.ensure_future(hasher._submit(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ServiceUnavailableError) as excinfo:
+            await hasher._submit(release.wait)
+        assert excinfo.value.retry_after == 7
+
+        # The client goes away: the running job keeps its worker, so it still counts
+        running.cancel()
+        await asyncio.sleep(0.05)
+        with pytest.raises(ServiceUnavailableError):
+            await asyncio.wait_for(hasher._submit(int), 1)
+
+        # A cancelled job that never started is dropped from the queue and frees its slot
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        stats = hasher.stats()
+        assert (stats["in_flight"], stats["queue_depth"]) == (1, 0)
+
+        release.set()
+        for _ in range(100):
+            if hasher.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        stats = hasher.stats()
+        assert (stats["in_flight"], stats["queue_depth"], stats["rejected"]) == (0, 0, 2)
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -0,0 +1,83 @@
+# tests/test_import.py
+"""Bulk user import: NDJSON and CSV uploads, batching and the error report."""
+
+import csv
+import io
+import json
+import uuid
+
+from app.core.config import settings
+from tests.conftest import PASSWORD, login, wait_for_job
+
+
+def _row(**fields) -> dict:
+    username = f"imp{uuid.uuid4().hex[:10]}"
+    return {"username": username, "email": f"{username}@tests.example.com", "password": PASSWORD, **fields}
+
+
+def _import(client, admin, body: str, content_type: str) -> dict:
+    response = client.post(
+        "/api/v1/users/bulk/import", content=body.encode(), headers={**admin.headers, "Content-Type": content_type}
+    )
+    assert response.status_code == 202, response.text
+    return wait_for_job(client, admin, response.json())
+
+
+def _report(client, admin, job: dict) -> list:
+    response = client.get(f"/api/v1/users/bulk/jobs/{job['job_id']}/errors", headers=admin.headers)
+    assert response.status_code == 200, response.text
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_ndjson_import_reports_rejected_rows(client, make_user, admin, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+    existing = make_user()
+    good = [_row(conditions=["insomnia"]), _row(role="clinician")]
+    lines = [
+        json.dumps(good[0]),
+        "{not json",
+        json.dumps(_row(favourite_colour="blue")),
+        json.dumps(good[1]),
+        json.dumps(_row(email=existing.email)),
+    ]
+    job = _import(client, admin, "\n".join(lines) + "\n", "application/x-ndjson")
+
+    assert job["status"] == "completed", job
+    assert (job["total"], job["processed"], job["affected"], job["failed"]) == (5, 5, 2, 3)
+    report = _report(client, admin, job)
+    assert [entry["row"] for entry in report] == [2, 3, 5]
+    assert "invalid JSON" in report[0]["errors"][0]
+    assert "favourite_colour" in report[1]["errors"][0]
+    assert report[2]["email"] == existing.email
+
+    # Imported users log in with their password and keep their role and profile
+    patient, clinician = (
+        {"Authorization": f"Bearer {login(client, row['email'])['access_token']}"} for row in good
+    )
+    assert client.get("/api/v1/users/me", headers=clinician).json()["role"] == "clinician"
+    patient_id = client.get("/api/v1/users/me", headers=patient).json()["id"]
+    cohort = client.get("/api/v1/users/cohorts", params={"condition": "insomnia"}, headers=clinician).json()
+    assert patient_id in [profile["id"] for profile in cohort["items"]]
+
+
+def test_csv_import_parses_json_columns(client, admin):
+    rows = [_row(), _row()]
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=["username", "email", "password", "conditions"])
+    writer.writeheader()
+    writer.writerow({**rows[0], "conditions": json.dumps(["anxiety"])})
+    writer.writerow({**rows[1], "conditions": "not json"})
+    job = _import(client, admin, out.getvalue(), "text/csv")
+
+    assert (job["status"], job["affected"], job["failed"]) == ("completed", 1, 1)
+    assert _report(client, admin, job)[0]["errors"] == ["conditions: must be JSON"]
+    login(client, rows[0]["email"])
+
+
+def test_import_requires_admin(client, make_user):
+    user = make_user()
+    response = client.post(
+        "/api/v1/users/bulk/import", content=b"{}\n",
+        headers={**user.headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 403
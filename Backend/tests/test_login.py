@@ -0,0 +1,43 @@
+# tests/test_login.py
+"""Failed-login counting and lockout under concurrent attempts."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from app.core.config import SessionLocal, settings
+from app.models.user_models import User
+from tests.conftest import PASSWORD
+
+
+def _attempt_concurrently(client, email: str, password: str, n: int) -> list:
+    body = {"email": email, "password": password}
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return list(pool.map(lambda _: client.post("/api/v1/users/login", json=body), range(n)))
+
+
+def _lockout_state(email: str):
+    with SessionLocal() as db:
+        return db.execute(select(User.failed_login_attempts, User.lockout_until).where(User.email == email)).one()
+
+
+def test_concurrent_failures_are_all_counted(client, make_user):
+    user = make_user()
+    n = settings.LOGIN_MAX_FAILED_ATTEMPTS - 1
+    responses = _attempt_concurrently(client, user.email, PASSWORD + "-wrong", n)
+
+    assert [response.status_code for response in responses] == [401] * n
+    # Each attempt is one atomic increment: no lost updates
+    assert tuple(_lockout_state(user.email)) == (n, None)
+
+
+def test_concurrent_failures_lock_the_account_at_the_threshold(client, make_user):
+    user = make_user()
+    n = settings.LOGIN_MAX_FAILED_ATTEMPTS
+    _attempt_concurrently(client, user.email, PASSWORD + "-wrong", n)
+
+    attempts, lockout_until = _lockout_state(user.email)
+    assert attempts == n and lockout_until is not None
+    response = client.post("/api/v1/users/login", json={"email": user.email, "password": PASSWORD})
+    assert response.status_code == 401
+    assert "locked" in response.json()["detail"]
@@ -0,0 +1,71 @@
+# tests/test_profile_patch.py
+"""Profile JSON patches applied in the database, and If-Match concurrency."""
+
+MERGE_PATCH = "application/merge-patch+json"
+JSON_PATCH = "application/json-patch+json"
+# PUT replaces the profile: every field is required
+PUT_FIELDS = (
+    "full_name", "date_of_birth", "gender", "location", "timezone", "primary_pillar_weights",
+    "medications", "conditions", "crisis_contact", "preferred_language", "privacy_settings",
+)
+
+
+def _put_body(**fields) -> dict:
+    return {**dict.fromkeys(PUT_FIELDS), **fields}
+
+
+def _patch(client, user, body, content_type=MERGE_PATCH, **headers):
+    return client.patch(
+        "/api/v1/users/me/profile", json=body,
+        headers={**user.headers, "Content-Type": content_type, **headers},
+    )
+
+
+def test_merge_patch_keeps_other_members(client, make_user):
+    user = make_user()
+    first = _patch(client, user, {"privacy_settings": {"show_email": True}, "full_name": "Ada"})
+    assert first.status_code == 200, first.text
+    second = _patch(client, user, {"privacy_settings": {"show_phone": True}})
+    assert second.status_code == 200, second.text
+
+    profile = second.json()
+    assert profile["full_name"] == "Ada"
+    assert profile["privacy_settings"]["show_email"] is True
+    assert profile["privacy_settings"]["show_phone"] is True
+    # Every write bumps the version, which is the ETag
+    assert profile["version"] == first.json()["version"] + 1
+    assert second.headers["etag"] == f'"{profile["version"]}"'
+
+
+def test_json_patch_appends_and_removes(client, make_user):
+    user = make_user()
+    assert _patch(client, user, {"conditions": ["anxiety"]}).status_code == 200
+    response = _patch(client, user, [
+        {"op": "add", "path": "/conditions/-", "value": "insomnia"},
+        {"op": "remove", "path": "/conditions/0"},
+    ], JSON_PATCH)
+    assert response.status_code == 200, response.text
+    assert response.json()["conditions"] == ["insomnia"]
+
+    response = _patch(client, user, [{"op": "move", "from": "/conditions/0", "path": "/x"}], JSON_PATCH)
+    assert response.status_code == 422
+
+
+def test_if_match_rejects_stale_writes(client, make_user):
+    user = make_user()
+    etag = client.get("/api/v1/users/me/profile", headers=user.headers).headers["etag"]
+
+    current = _patch(client, user, {"full_name": "First"}, **{"If-Match": etag})
+    assert current.status_code == 200, current.text
+    # The same (now stale) ETag fails for every write path
+    assert _patch(client, user, {"full_name": "Second"}, **{"If-Match": etag}).status_code == 412
+    stale = {**user.headers, "If-Match": etag}
+    response = client.put("/api/v1/users/me/profile", json=_put_body(full_name="Second"), headers=stale)
+    assert response.status_code == 412
+    response = client.patch("/api/v1/users/me/profile/privacy", json={"show_profile": False}, headers=stale)
+    assert response.status_code == 412
+
+    assert client.get("/api/v1/users/me/profile", headers=user.headers).json()["full_name"] == "First"
+    fresh = {**user.headers, "If-Match": current.headers["etag"]}
+    response = client.put("/api/v1/users/me/profile", json=_put_body(full_name="Second"), headers=fresh)
+    assert response.status_code == 200, response.text
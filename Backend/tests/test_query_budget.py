@@ -0,0 +1,62 @@
+# tests/test_query_budget.py
+"""
+SQL statements per request on hot endpoints stay within budget.
+
+Each endpoint runs through the real application (auth, services, CRUD) and
+the statements its handler executes on the async engine are counted, so a
+regression such as a lazy load or an extra lookup fails here instead of
+slipping into the hot path. The first request warms the auth caches; the
+budget applies to the steady state.
+"""
+
+import pytest
+
+from tests.conftest import PASSWORD
+
+# (path, caller, extra headers, max statements). "{user_id}" is the regular
+# user's id; "{etag}" the ETag /me returned to that user.
+BUDGETS = [
+    ("/api/v1/users/me", "user", {}, 2),
+    ("/api/v1/users/me", "user", {"If-None-Match": "{etag}"}, 1),
+    ("/api/v1/users/me/profile", "user", {}, 2),
+    ("/api/v1/users/{user_id}", "admin", {}, 1),
+]
+
+
+@pytest.mark.parametrize(
+    "path, caller, extra, budget", BUDGETS,
+    ids=[f"{path} {' '.join(extra)}".strip() for path, _, extra, _ in BUDGETS],
+)
+def test_statement_budget(client, make_user, admin, statement_counter, path, caller, extra, budget):
+    user = make_user()
+    me = client.get("/api/v1/users/me", headers=user.headers)
+    assert me.status_code == 200
+    values = {"user_id": user.id, "etag": me.headers["etag"]}
+    url = path.format(**values)
+    headers = {**{"user": user, "admin": admin}[caller].headers,
+               **{key: value.format(**values) for key, value in extra.items()}}
+
+    client.get(url, headers=headers)  # warm caches
+    statement_counter.count = 0
+    response = client.get(url, headers=headers)
+
+    assert response.status_code in (200, 304), response.text
+    assert statement_counter.count <= budget
+
+
+# (outcome, max statements): the user lookup, then the refresh token INSERT on
+# success or the atomic outcome UPDATE on failure. A clean success buffers
+# last_login_at instead of writing it.
+LOGIN_BUDGETS = [("success", 2), ("failure", 2)]
+
+
+@pytest.mark.parametrize("outcome, budget", LOGIN_BUDGETS, ids=[outcome for outcome, _ in LOGIN_BUDGETS])
+def test_login_statement_budget(client, make_user, statement_counter, outcome, budget):
+    user = make_user()
+    password = PASSWORD if outcome == "success" else PASSWORD + "-wrong"
+
+    statement_counter.count = 0
+    response = client.post("/api/v1/users/login", json={"email": user.email, "password": password})
+
+    assert response.status_code == (200 if outcome == "success" else 401), response.text
+    assert statement_counter.count <= budget
@@ -0,0 +1,135 @@
+# tests/test_rate_limit.py
+"""Rate limiting: algorithms on a fixed clock, both backends, and the auth endpoints."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError
+from app.core.rate_limit import (
+    MemoryBackend,
+    RateLimiter,
+    SlidingWindowCounter,
+    SQLiteBackend,
+    TokenBucket,
+    auth_account_limiter,
+)
+
+T0 = 1_000_000.0  # a window boundary for 10-second windows
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(shards=1)
+    return SQLiteBackend(str(tmp_path / "ratelimit.db"))
+
+
+def test_sliding_window_weights_the_previous_window(backend):
+    window = SlidingWindowCounter(limit=4, window_seconds=10)
+    assert [backend.hit("k", window, T0 + i).allowed for i in range(5)] == [True] * 4 + [False]
+    denied = backend.hit("k", window, T0 + 5)
+    assert not denied.allowed and denied.retry_after == pytest.approx(5)
+
+    # Halfway through the next window the previous 4 count as 2: two more requests fit
+    assert [backend.hit("k", window, T0 + 15).allowed for _ in range(3)] == [True, True, False]
+    # Two windows later the key starts over
+    assert backend.hit("k", window, T0 + 30).remaining == 3
+
+
+def test_token_bucket_refills_continuously(backend):
+    bucket = TokenBucket(limit=2, window_seconds=10)  # one token every 5 s
+    assert [backend.hit("k", bucket, T0).allowed for _ in range(3)] == [True, True, False]
+    assert backend.hit("k", bucket, T0).retry_after == pytest.approx(5)
+    assert not backend.hit("k", bucket, T0 + 4).allowed
+    assert backend.hit("k", bucket, T0 + 5).allowed
+
+
+def test_keys_are_independent(backend):
+    bucket = TokenBucket(limit=1, window_seconds=10)
+    assert backend.hit("a", bucket, T0).allowed
+    assert not backend.hit("a", bucket, T0).allowed
+    assert backend.hit("b", bucket, T0).allowed
+
+
+def test_sweep_removes_only_expired_keys():
+    backend = MemoryBackend(shards=1)
+    window = SlidingWindowCounter(limit=5, window_seconds=10)
+    backend.hit("old", window, T0)
+    backend.hit("new", window, T0 + 20)
+    # "old" expires two windows after its window started
+    assert backend.sweep(T0 + 20) == 1
+    assert len(backend) == 1
+
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    bucket = TokenBucket(limit=1, window_seconds=10)
+    assert SQLiteBackend(path).hit("k", bucket, T0).allowed
+    # A second worker opening the same file sees the spent token
+    assert not SQLiteBackend(path).hit("k", bucket, T0).allowed
+
+
+def test_enforce_raises_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    limiter = RateLimiter("test", TokenBucket(limit=1, window_seconds=60), MemoryBackend(shards=1))
+    limiter.enforce("k")
+    with pytest.raises(RateLimitExceededError) as excinfo:
+        limiter.enforce("k")
+    assert excinfo.value.retry_after >= 1
+
+
+def test_enforce_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    limiter = RateLimiter("test", TokenBucket(limit=1, window_seconds=60), MemoryBackend(shards=1))
+    assert all(limiter.enforce("k").allowed for _ in range(3))
+
+
+def test_login_is_limited_per_account(client, make_user, monkeypatch):
+    user = make_user()
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    credentials = {"email": user.email, "password": "wrong-password"}
+    statuses = [
+        client.post("/api/v1/users/login", json=credentials).status_code
+        for _ in range(settings.RATE_LIMIT_AUTH_ACCOUNT_LIMIT)
+    ]
+    assert set(statuses) == {401}
+
+    response = client.post("/api/v1/users/login", json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_enforce_async_waits_for_a_sqlite_lock_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    path = str(tmp_path / "ratelimit.db")
+    limiter = RateLimiter("test", TokenBucket(limit=5, window_seconds=60), SQLiteBackend(path))
+    # Another worker holds the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def scenario():
+        ticks = 0
+        check = asyncio.create_task(limiter.enforce_async("k"))
+        while ticks < 10:
+            await asyncio.sleep(0.02)
+            ticks += 1
+        # The loop kept running while the check waited on the lock
+        assert not check.done()
+        other.execute("COMMIT")
+        return await asyncio.wait_for(check, 5)
+
+    assert asyncio.run(scenario()).allowed
+    other.close()
+
+
+def test_login_is_limited_per_account_with_the_sqlite_backend(client, make_user, monkeypatch, tmp_path):
+    monkeypatch.setattr(auth_account_limiter, "backend", SQLiteBackend(str(tmp_path / "ratelimit.db")))
+    user = make_user()
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    credentials = {"email": user.email, "password": "wrong-password"}
+    for _ in range(settings.RATE_LIMIT_AUTH_ACCOUNT_LIMIT):
+        assert client.post("/api/v1/users/login", json=credentials).status_code == 401
+    assert client.post("/api/v1/users/login", json=credentials).status_code == 429
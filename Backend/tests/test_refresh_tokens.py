@@ -0,0 +1,53 @@
+# tests/test_refresh_tokens.py
+"""Refresh token rotation, reuse detection and revocation."""
+
+from tests.conftest import PASSWORD, login
+
+
+def _refresh(client, refresh_token):
+    return client.post("/api/v1/users/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_the_token(client, make_user):
+    user = make_user()
+    first = _refresh(client, user.tokens["refresh_token"])
+    assert first.status_code == 200, first.text
+    rotated = first.json()
+    assert rotated["refresh_token"] != user.tokens["refresh_token"]
+    me = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.status_code == 200
+
+    # The new token rotates in turn
+    assert _refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_replayed_token_revokes_its_family(client, make_user):
+    user = make_user()
+    other_login = login(client, user.email)
+    rotated = _refresh(client, user.tokens["refresh_token"]).json()
+
+    replay = _refresh(client, user.tokens["refresh_token"])
+    assert replay.status_code == 401
+    assert "reuse" in replay.json()["detail"]
+    # Every token of the family is now revoked, including the current one
+    assert _refresh(client, rotated["refresh_token"]).status_code == 401
+    # Other logins (other families) are unaffected
+    assert _refresh(client, other_login["refresh_token"]).status_code == 200
+
+
+def test_password_change_revokes_refresh_tokens(client, make_user):
+    user = make_user()
+    response = client.post(
+        "/api/v1/users/me/change-password",
+        json={"old_password": PASSWORD, "new_password": PASSWORD + "-new"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+    assert _refresh(client, user.tokens["refresh_token"]).status_code == 401
+
+
+def test_invalid_refresh_token_is_rejected(client, make_user):
+    user = make_user()
+    assert _refresh(client, "not-a-token").status_code == 401
+    # An access token is not a refresh token
+    assert _refresh(client, user.tokens["access_token"]).status_code == 401
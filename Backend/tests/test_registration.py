@@ -0,0 +1,73 @@
+# tests/test_registration.py
+"""Registration: user and profile in one transaction, conflicts from the unique constraints."""
+
+import sqlite3
+import uuid
+
+from sqlalchemy import event, func, select
+
+from app.core.config import SessionLocal, async_engine
+from app.models.user_models import User, UserProfile
+from tests.conftest import PASSWORD
+
+
+def _register(client, **fields):
+    username = f"reg{uuid.uuid4().hex[:10]}"
+    body = {"username": username, "email": f"{username}@tests.example.com", "phone_number": None,
+            "password": PASSWORD, **fields}
+    return client.post("/api/v1/users/register", json=body)
+
+
+def _users_with_email(email: str) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(User).where(User.email == email))
+
+
+def test_registration_creates_user_and_profile(client):
+    response = _register(client)
+    assert response.status_code == 201, response.text
+    user = response.json()
+    assert user["profile"]["version"] == 1
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count()).select_from(UserProfile).where(UserProfile.id == uuid.UUID(user["id"]))) == 1
+
+
+def test_duplicate_email_is_a_conflict(client):
+    email = _register(client).json()["email"]
+    response = _register(client, email=email)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Email already registered"
+    assert _users_with_email(email) == 1
+
+
+def test_duplicate_phone_number_is_a_conflict(client):
+    phone = str(uuid.uuid4().int)[:12]
+    assert _register(client, phone_number=phone).status_code == 201
+    response = _register(client, phone_number=phone)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Phone number already registered"
+
+
+def test_usernames_are_not_unique(client):
+    # users.username has no unique constraint: only email and phone number identify an account
+    username = _register(client).json()["username"]
+    assert _register(client, username=username).status_code == 201
+
+
+def test_failed_profile_insert_rolls_back_the_user(client):
+    def fail_profile_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO user_profiles"):
+            raise sqlite3.OperationalError("disk I/O error")
+
+    username = f"reg{uuid.uuid4().hex[:10]}"
+    email = f"{username}@tests.example.com"
+    event.listen(async_engine.sync_engine, "before_cursor_execute", fail_profile_insert)
+    try:
+        response = _register(client, username=username, email=email)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", fail_profile_insert)
+
+    assert response.status_code == 500
+    assert _users_with_email(email) == 0
+    # The email is free again
+    assert _register(client, username=username, email=email).status_code == 201
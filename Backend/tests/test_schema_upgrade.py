@@ -0,0 +1,66 @@
+# tests/test_schema_upgrade.py
+"""upgrade_schema brings a database created by the baseline models up to date."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.database.migrations import upgrade_schema
+from app.models.user_models import User, UserProfile
+
+# users / user_profiles as created by the first release (e.g. the checked-in test.db)
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id UUID NOT NULL, username VARCHAR(50), email VARCHAR(255) NOT NULL, phone_number VARCHAR(20),
+        password_hash VARCHAR(255) NOT NULL, role VARCHAR(9), status VARCHAR(11), is_verified BOOLEAN,
+        onboarding_completed BOOLEAN, created_at DATETIME, updated_at DATETIME, last_login_at DATETIME,
+        failed_login_attempts INTEGER, lockout_until DATETIME, password_changed_at DATETIME,
+        PRIMARY KEY (id))""",
+    "CREATE UNIQUE INDEX ix_users_id ON users (id)",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE UNIQUE INDEX ix_users_phone_number ON users (phone_number)",
+    """CREATE TABLE user_profiles (
+        id UUID NOT NULL, full_name VARCHAR(255), date_of_birth DATE, gender VARCHAR(20), location VARCHAR(255),
+        timezone VARCHAR(50), primary_pillar_weights JSON, medications JSON, conditions JSON,
+        crisis_contact VARCHAR(255), preferred_language VARCHAR(20), privacy_settings JSON,
+        last_updated_at DATETIME, PRIMARY KEY (id), FOREIGN KEY(id) REFERENCES users (id) ON DELETE CASCADE)""",
+    "CREATE UNIQUE INDEX ix_user_profiles_id ON user_profiles (id)",
+]
+
+
+def _baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/baseline.db")
+    user_id = uuid.uuid4().hex
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO users (id, username, email, password_hash, role, status, created_at) "
+            "VALUES (:id, 'olduser', 'old@example.com', 'x', 'user', 'active', '2024-01-01 00:00:00')"
+        ), {"id": user_id})
+        conn.execute(text("INSERT INTO user_profiles (id, full_name) VALUES (:id, 'Old User')"), {"id": user_id})
+    return engine
+
+
+def test_upgrade_adds_version_and_indexes(tmp_path):
+    engine = _baseline_engine(tmp_path)
+    upgrade_schema(engine)
+    upgrade_schema(engine)  # idempotent
+
+    inspector = inspect(engine)
+    assert "version" in {column["name"] for column in inspector.get_columns("user_profiles")}
+    assert {"ix_users_created_at_id", "ix_users_role_created_at_id", "ix_users_status_created_at_id"} <= {
+        index["name"] for index in inspector.get_indexes("users")
+    }
+
+    with Session(engine) as db:
+        # Existing rows are backfilled, and the current models read and write the table
+        assert db.scalar(select(UserProfile.version)) == 1
+        user = User(username="newuser", email="new@example.com", password_hash="x", created_at=datetime(2025, 1, 1))
+        user.profile = UserProfile(full_name="New User")
+        db.add(user)
+        db.commit()
+        assert db.scalar(select(UserProfile.version).where(UserProfile.id == user.id)) == 1
+    engine.dispose()
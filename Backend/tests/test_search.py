@@ -0,0 +1,83 @@
+# tests/test_search.py
+"""Profile and user search: privacy filtering, index rebuild, fuzzy ranking."""
+
+from uuid import UUID
+
+from sqlalchemy import delete
+
+from app.core.config import SessionLocal
+from app.models.user_models import UserSearchDocument
+from app.services.maintenance_service import seed_search_index
+
+
+def _set_profile(client, user, **fields):
+    response = client.patch("/api/v1/users/me/profile", json=fields, headers=user.headers)
+    assert response.status_code == 200, response.text
+
+
+def test_hidden_profile_is_redacted_in_search(client, make_user):
+    owner = make_user(prefix="hidden")
+    _set_profile(client, owner, full_name="Hidden Person", conditions=["anxiety"],
+                 medications=[{"name": "sertraline"}], location="Lisbon")
+    response = client.patch("/api/v1/users/me/profile/privacy", json={"show_profile": False}, headers=owner.headers)
+    assert response.status_code == 200
+
+    searcher = make_user()
+    response = client.get("/api/v1/users/profiles/search", params={"q": owner.username}, headers=searcher.headers)
+    assert response.status_code == 200, response.text
+    found = {profile["id"]: profile for profile in response.json()}
+    hidden = found[owner.id]
+    assert hidden["privacy_settings"] == {"show_profile": False}
+    assert (hidden["full_name"], hidden["conditions"], hidden["medications"], hidden["location"]) == (None,) * 4
+    assert hidden["last_updated_at"] is not None
+
+    # The owner still sees everything
+    response = client.get("/api/v1/users/profiles/search", params={"q": owner.username}, headers=owner.headers)
+    assert {profile["id"]: profile for profile in response.json()}[owner.id]["full_name"] == "Hidden Person"
+
+
+def test_startup_seed_indexes_users_without_documents(client, make_user, admin):
+    # A user from before the search triggers existed: no document
+    user = make_user(prefix="legacy")
+    with SessionLocal() as db:
+        db.execute(delete(UserSearchDocument).where(UserSearchDocument.user_id == UUID(user.id)))
+        db.commit()
+    params = {"q": user.username, "fuzzy": "false"}
+    assert client.get("/api/v1/users/search", params=params, headers=admin.headers).json() == []
+
+    seed_search_index()
+
+    found = client.get("/api/v1/users/search", params=params, headers=admin.headers).json()
+    assert [row["id"] for row in found] == [user.id]
+
+
+def _search_usernames(client, headers, q, **params):
+    response = client.get("/api/v1/users/search", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [row["username"] for row in response.json()]
+
+
+def test_fuzzy_search_ranks_and_requires_similarity(client, make_user, admin):
+    tag = make_user(prefix="tag").username[3:9]  # random letters/digits shared by this test's users only
+    names = [f"{tag}marigold", f"{tag}marigold7", f"{tag}lavender"]
+    for name in names:
+        response = client.post(
+            "/api/v1/users/register",
+            json={"username": name, "email": f"{name}@tests.example.com", "phone_number": None,
+                  "password": "Test-Passw0rd"},
+        )
+        assert response.status_code == 201
+
+    # Best (shortest) substring match first, even when the limit cuts the rest
+    assert _search_usernames(client, admin.headers, f"{tag}marigold", limit=1) == [f"{tag}marigold"]
+    # A transposition shares almost no trigrams but is still found, ranked by similarity;
+    # the user sharing only the tag is below the minimum similarity
+    assert _search_usernames(client, admin.headers, f"{tag}marigodl") == [f"{tag}marigold", f"{tag}marigold7"]
+    assert _search_usernames(client, admin.headers, "marigodl") == [f"{tag}marigold", f"{tag}marigold7"]
+
+
+def test_transposed_short_term_matches():
+    from app.crud.search_crud import term_variants
+
+    assert "user1" in term_variants("usre1")
+    assert term_variants("abcdefghijklmn") == ["abcdefghijklmn"]
@@ -0,0 +1,128 @@
+# tests/test_serialization.py
+"""
+Routes that serialize validated models directly (app.core.responses) send
+byte-for-byte the JSON FastAPI's response_model path would have produced.
+
+model_response / list_response are wrapped to keep what each route passed
+them; the expected body is then built by FastAPI's own serialize_response
+with the route's response field, exactly as a route returning the model did.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api import user_routes
+from app.core import responses
+from app.models.user_models import UserRole
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Models (or item lists) passed to the direct-serialization helpers during a request."""
+    calls = []
+
+    def model_response(model, *args, **kwargs):
+        calls.append(model)
+        return responses.model_response(model, *args, **kwargs)
+
+    def list_response(adapter, items, *args, **kwargs):
+        calls.append(items)
+        return responses.list_response(adapter, items, *args, **kwargs)
+
+    monkeypatch.setattr(user_routes, "model_response", model_response)
+    monkeypatch.setattr(user_routes, "list_response", list_response)
+    return calls
+
+
+def _route(method: str, path: str) -> APIRoute:
+    """The user_routes route for an /api path (the app mounts the router under /api)."""
+    path = path.removeprefix("/api")
+    return next(
+        route for route in user_routes.router.routes
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods
+    )
+
+
+def _legacy_body(route: APIRoute, content) -> bytes:
+    """The body FastAPI would send for a route returning content."""
+    return asyncio.run(serialize_response(
+        field=route.response_field,
+        response_content=content,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+        dump_json=True,
+    ))
+
+
+@pytest.fixture
+def people(client, make_user):
+    """A patient with a full profile, one hiding it, a clinician and an admin."""
+    token = uuid.uuid4().hex[:8]
+    patient, hidden = make_user(prefix="gold"), make_user(prefix="gold")
+    merge = {"Content-Type": "application/merge-patch+json"}
+    profile = {
+        "full_name": f"Zoë Golden{token}", "date_of_birth": "1990-05-17", "gender": None,
+        "location": "Kraków", "timezone": "Europe/Warsaw",
+        "primary_pillar_weights": {"health": 0.4, "work": 0.35, "growth": 0.25},
+        "medications": [{"name": "Sertraline", "dosage": "50mg"}], "conditions": ["anxiety", f"insomnia{token}"],
+    }
+    for user, privacy in ((patient, True), (hidden, False)):
+        body = {**profile, "privacy_settings": {"show_profile": privacy}}
+        response = client.patch("/api/v1/users/me/profile", json=body, headers={**user.headers, **merge})
+        assert response.status_code == 200, response.text
+    return {
+        "token": token, "patient": patient, "hidden": hidden,
+        "clinician": make_user(UserRole.clinician, prefix="clin"), "admin": make_user(UserRole.admin, prefix="admin"),
+    }
+
+
+CASES = [
+    # (caller, method, route path, url, params, json)
+    ("patient", "GET", "/api/v1/users/me", "/api/v1/users/me", {}, None),
+    ("patient", "GET", "/api/v1/users/me/profile", "/api/v1/users/me/profile", {}, None),
+    ("patient", "PATCH", "/api/v1/users/me/profile/privacy", "/api/v1/users/me/profile/privacy",
+     {}, {"show_profile": True}),
+    ("admin", "GET", "/api/v1/users/{user_id}", "/api/v1/users/{patient_id}", {}, None),
+    ("admin", "GET", "/api/v1/users/", "/api/v1/users/", {"limit": 5, "include_total": "true"}, None),
+    ("admin", "GET", "/api/v1/users/search", "/api/v1/users/search", {"q": "gold"}, None),
+    ("admin", "PATCH", "/api/v1/users/{user_id}/status", "/api/v1/users/{hidden_id}/status",
+     {}, {"status": "active"}),
+    ("clinician", "GET", "/api/v1/users/profiles/search", "/api/v1/users/profiles/search", {"q": "Golden{token}"}, None),
+    ("admin", "GET", "/api/v1/users/profiles/search", "/api/v1/users/profiles/search", {"q": "Golden{token}"}, None),
+    ("clinician", "GET", "/api/v1/users/cohorts", "/api/v1/users/cohorts", {"condition": "insomnia{token}"}, None),
+    ("clinician", "GET", "/api/v1/users/cohorts/facets", "/api/v1/users/cohorts/facets", {}, None),
+]
+
+
+def test_direct_serialization_matches_response_model(client, people, captured):
+    values = {"patient_id": people["patient"].id, "hidden_id": people["hidden"].id, "token": people["token"]}
+    for caller, method, path, url, params, body in CASES:
+        captured.clear()
+        params = {key: value.format(**values) if isinstance(value, str) else value for key, value in params.items()}
+        response = client.request(
+            method, url.format(**values), params=params, json=body, headers=people[caller].headers,
+        )
+        assert response.status_code == 200, (url, response.text)
+        assert len(captured) == 1, url
+        assert response.content == _legacy_body(_route(method, path), captured[0]), (caller, url)
+
+
+def test_redacted_profiles_and_null_fields(client, people, captured):
+    # A hidden profile still matches its owner's username, redacted for non-admins
+    response = client.get(
+        "/api/v1/users/profiles/search", params={"q": people["hidden"].username, "fuzzy": "false"},
+        headers=people["clinician"].headers,
+    )
+    assert response.status_code == 200, response.text
+    hidden = {item["id"]: item for item in response.json()}[people["hidden"].id]
+    # Redacted and unset fields are sent as null, not dropped
+    assert hidden["full_name"] is None and hidden["gender"] is None
+    assert hidden["privacy_settings"] == {"show_profile": False}
+    assert response.content == _legacy_body(_route("GET", "/api/v1/users/profiles/search"), captured[0])
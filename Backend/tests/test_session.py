@@ -0,0 +1,59 @@
+# tests/test_session.py
+"""Request sessions: one transaction and one pool checkout per handler, none when unused."""
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import async_engine
+from app.core.database import pool_stats
+
+
+class TransactionCounter:
+    """Counts transactions ended (COMMIT / ROLLBACK) on an engine while listening."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn):
+        self.count += 1
+
+
+@pytest.fixture
+def transaction_counter():
+    counter = TransactionCounter()
+    for name in ("commit", "rollback"):
+        event.listen(async_engine.sync_engine, name, counter)
+    yield counter
+    for name in ("commit", "rollback"):
+        event.remove(async_engine.sync_engine, name, counter)
+
+
+def _checkouts() -> int:
+    return pool_stats()["async"]["checkout_hold"]["count"]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/users/me", "/api/v1/users/me/profile", "/api/v1/users/?limit=5"])
+def test_read_handler_uses_one_transaction(client, make_user, admin, statement_counter, transaction_counter, path):
+    caller = admin if path.startswith("/api/v1/users/?") else make_user()
+    client.get(path, headers=caller.headers)  # warm caches
+    statement_counter.count = transaction_counter.count = 0
+    checkouts = _checkouts()
+
+    response = client.get(path, headers=caller.headers)
+
+    assert response.status_code == 200, response.text
+    assert statement_counter.count >= 2
+    # Every read of the handler runs in the same transaction, ended once
+    assert transaction_counter.count == 1
+    assert _checkouts() - checkouts == 1
+
+
+def test_request_without_database_work_checks_nothing_out(client, admin, statement_counter, transaction_counter):
+    client.get("/api/v1/users/me", headers=admin.headers)  # warm the auth cache
+    statement_counter.count = transaction_counter.count = 0
+    checkouts = _checkouts()
+
+    response = client.get("/api/v1/users/?limit=0", headers=admin.headers)
+
+    assert response.status_code == 422
+    assert (statement_counter.count, transaction_counter.count, _checkouts() - checkouts) == (0, 0, 0)
@@ -0,0 +1,42 @@
+# tests/test_timestamps.py
+"""Timestamps have one format whether a response comes from a write or a read."""
+
+from datetime import datetime
+
+from tests.conftest import PASSWORD, login
+
+USER_TIMESTAMPS = ("created_at", "updated_at", "last_login_at", "password_changed_at")
+
+
+def _assert_naive(body: dict, fields) -> None:
+    for field in fields:
+        if body.get(field) is not None:
+            assert datetime.fromisoformat(body[field]).tzinfo is None, (field, body[field])
+
+
+def test_register_login_and_read_share_one_format(client, make_user):
+    user = make_user()
+    registered = client.get("/api/v1/users/me", headers=user.headers).json()
+    _assert_naive(registered, USER_TIMESTAMPS)
+    _assert_naive(registered["profile"], ("last_updated_at",))
+
+    response = client.post(
+        "/api/v1/users/register",
+        json={"username": f"x{user.username}", "email": f"x{user.email}", "phone_number": None, "password": PASSWORD},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    _assert_naive(body, USER_TIMESTAMPS)
+    _assert_naive(body["profile"], ("last_updated_at",))
+
+    headers = {"Authorization": f"Bearer {login(client, body['email'])['access_token']}"}
+    read = client.get("/api/v1/users/me", headers=headers).json()
+    assert read["created_at"] == body["created_at"]
+    assert read["profile"]["last_updated_at"] == body["profile"]["last_updated_at"]
+
+
+def test_login_touch_is_naive(client, make_user):
+    user = make_user()
+    tokens = login(client, user.email)
+    _assert_naive(tokens["user"], USER_TIMESTAMPS)
+    assert tokens["user"]["last_login_at"] is not None
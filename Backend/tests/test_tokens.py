@@ -0,0 +1,126 @@
+# tests/test_tokens.py
+"""TokenCodec and its verified-claims cache; access tokens revoked by a password change."""
+
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+from app.core import tokens
+from app.core.config import settings
+from app.core.tokens import ExpiredSignatureError, InvalidTokenError, TokenCodec, VerifiedClaimsCache
+from app.services.auth_service import AuthService
+from tests.conftest import PASSWORD, login
+
+KEY = "test-secret-key-of-at-least-32-bytes"
+
+
+def _codec(max_entries: int = 100) -> TokenCodec:
+    return TokenCodec(KEY, "HS256", timedelta(minutes=5), cache=VerifiedClaimsCache(max_entries))
+
+
+def _count_verifications(monkeypatch, codec: TokenCodec) -> list:
+    calls = []
+    verify = codec._verify
+    monkeypatch.setattr(codec, "_verify", lambda token: calls.append(token) or verify(token))
+    return calls
+
+
+def test_cache_hit_skips_verification(monkeypatch):
+    codec = _codec()
+    calls = _count_verifications(monkeypatch, codec)
+    token = codec.encode({"sub": "a"})
+
+    first = codec.decode(token)
+    assert codec.decode(token) is first
+    assert calls == [token] and len(codec.cache) == 1
+    assert first["sub"] == "a" and isinstance(first["iat"], float)
+
+
+def test_entries_expire_at_exp(monkeypatch):
+    codec = _codec()
+    token = codec.encode({"sub": "a"})
+    exp = codec.decode(token)["exp"]
+    digest = codec.cache.digest(token)
+
+    monkeypatch.setattr(tokens.time, "time", lambda: exp)
+    assert codec.cache.get(digest) is None
+    assert len(codec.cache) == 0
+
+    # An expired token is rejected, never cached
+    with pytest.raises(ExpiredSignatureError):
+        codec.decode(codec.encode({"sub": "a"}, timedelta(seconds=-1)))
+    assert len(codec.cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    codec = _codec(max_entries=2)
+    first, second, third = (codec.encode({"sub": sub}) for sub in "abc")
+    codec.decode(first)
+    codec.decode(second)
+    codec.decode(first)  # second is now the least recently used
+    codec.decode(third)
+
+    cached = [codec.cache.get(codec.cache.digest(token)) is not None for token in (first, second, third)]
+    assert cached == [True, False, True]
+    assert len(codec.cache) == 2
+
+
+def test_tampered_tokens_are_rejected_after_the_original_is_cached():
+    codec = _codec()
+    token = codec.encode({"sub": "a", "role": "user"})
+    codec.decode(token)
+    header, payload, signature = token.split(".")
+
+    forged_payload = jwt.utils.base64url_encode(b'{"sub":"a","role":"admin","exp":9999999999}').decode()
+    forged_signature = signature[:-4] + ("AAAA" if not signature.endswith("AAAA") else "BBBB")
+    for tampered in (
+        f"{header}.{forged_payload}.{signature}",   # same header prefix, new claims
+        f"{header}.{payload}.{forged_signature}",   # same header and payload
+        token + "A",
+    ):
+        with pytest.raises(InvalidTokenError):
+            codec.decode(tampered)
+    assert len(codec.cache) == 1
+
+
+def test_token_type_is_checked():
+    refresh = TokenCodec(KEY, "HS256", timedelta(days=1), token_type="refresh")
+    access = TokenCodec(KEY, "HS256", timedelta(minutes=5))
+    with pytest.raises(InvalidTokenError):
+        refresh.decode(access.encode({"sub": "a"}))
+    assert refresh.decode(refresh.encode({"sub": "a"}))["type"] == "refresh"
+
+
+def test_same_second_password_change_revokes_earlier_tokens():
+    changed_at = datetime(2026, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    snapshot = SimpleNamespace(password_changed_at=changed_at.replace(tzinfo=None))
+    service = AuthService(db=None)
+    # Issued earlier within the same second: revoked
+    assert not service.validate_token_issue_time({}, snapshot, changed_at - timedelta(milliseconds=300))
+    assert service.validate_token_issue_time({}, snapshot, changed_at + timedelta(milliseconds=1))
+
+
+def test_password_change_revokes_access_tokens(client, make_user):
+    user = make_user()
+    assert client.get("/api/v1/users/me", headers=user.headers).status_code == 200
+    response = client.post(
+        "/api/v1/users/me/change-password",
+        json={"old_password": PASSWORD, "new_password": PASSWORD + "-new"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+
+    # The old token is cached as verified, but revoked by password_changed_at
+    assert client.get("/api/v1/users/me", headers=user.headers).status_code == 401
+    fresh = login(client, user.email, PASSWORD + "-new")
+    assert client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {fresh['access_token']}"}).status_code == 200
+
+
+def test_access_token_without_iat_is_rejected(client, make_user):
+    user = make_user()
+    claims = {"sub": user.id, "email": user.email, "exp": int(time.time()) + 300}
+    token = jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    assert client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
@@ -0,0 +1,74 @@
+# tests/test_user_listing.py
+"""Admin user listing: keyset cursors, filters and estimated totals."""
+
+import uuid
+
+from tests.conftest import PASSWORD
+
+
+def _register(client, domain: str) -> str:
+    username = f"list{uuid.uuid4().hex[:10]}"
+    response = client.post(
+        "/api/v1/users/register",
+        json={"username": username, "email": f"{username}@{domain}", "phone_number": None, "password": PASSWORD},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _page(client, admin, **params):
+    response = client.get("/api/v1/users/", params=params, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _walk(client, admin, **params):
+    ids, cursor = [], None
+    while True:
+        page = _page(client, admin, **params, **({"cursor": cursor} if cursor else {}))
+        ids += [user["id"] for user in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_pages_cover_every_user_once_newest_first(client, admin):
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    registered = [_register(client, domain) for _ in range(5)]
+
+    first = _page(client, admin, email_domain=domain, limit=2)
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    assert first["estimated_total"] == 5
+
+    ids = _walk(client, admin, email_domain=domain, limit=2)
+    assert sorted(ids) == sorted(registered)
+    items = _page(client, admin, email_domain=domain, limit=5)["items"]
+    assert [user["id"] for user in items] == ids
+    keys = [(user["created_at"], user["id"]) for user in items]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_users_added_while_paging_are_not_repeated(client, admin):
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    registered = [_register(client, domain) for _ in range(4)]
+
+    first = _page(client, admin, email_domain=domain, limit=2)
+    # A newer user sorts before the cursor, so it cannot shift the following pages
+    _register(client, domain)
+    second = _page(client, admin, email_domain=domain, limit=2, cursor=first["next_cursor"])
+
+    seen = [user["id"] for user in first["items"] + second["items"]]
+    assert sorted(seen) == sorted(registered) and second["next_cursor"] is None
+
+
+def test_filters_and_totals(client, admin):
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    _register(client, domain)
+    assert _page(client, admin, email_domain=domain, role="admin")["items"] == []
+    assert _page(client, admin, email_domain=domain, include_total=False)["estimated_total"] is None
+
+
+def test_invalid_cursor_and_non_admin_are_rejected(client, admin, make_user):
+    response = client.get("/api/v1/users/", params={"cursor": "garbage"}, headers=admin.headers)
+    assert response.status_code == 422
+    assert client.get("/api/v1/users/", headers=make_user().headers).status_code == 403
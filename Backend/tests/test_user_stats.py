@@ -0,0 +1,102 @@
+# tests/test_user_stats.py
+"""The trigger-maintained user_stats counters agree with real counts after every write path."""
+
+from sqlalchemy import func, insert, select, update
+
+from app.core.config import SessionLocal
+from app.models.user_models import Status, User, UserProfile, UserStat
+from app.services import maintenance_service
+from tests.conftest import wait_for_job
+
+
+def _counts() -> dict:
+    """The overview's numbers from COUNT(*) over users / user_profiles."""
+    with SessionLocal() as db:
+        def count(*where, table=User):
+            return db.scalar(select(func.count()).select_from(table).where(*where))
+
+        by_role = dict(db.execute(select(User.role, func.count()).group_by(User.role)).all())
+        by_status = dict(db.execute(select(User.status, func.count()).group_by(User.status)).all())
+        return {
+            "total_users": count(),
+            "active_users": by_status.get(Status.active, 0),
+            "verified_users": count(User.is_verified.is_(True)),
+            "onboarding_completed": count(User.onboarding_completed.is_(True)),
+            "profiles": count(table=UserProfile),
+            "profiles_completed": count(UserProfile.full_name.is_not(None), table=UserProfile),
+            "by_role": {role.name: n for role, n in by_role.items()},
+            "by_status": {status.name: n for status, n in by_status.items()},
+        }
+
+
+def _assert_overview_matches(client, admin) -> dict:
+    response = client.get("/api/v1/users/stats/overview", headers=admin.headers)
+    assert response.status_code == 200, response.text
+    overview = response.json()
+    expected = _counts()
+    # Counters that dropped to zero stay as rows
+    overview["by_role"] = {key: n for key, n in overview["by_role"].items() if n}
+    overview["by_status"] = {key: n for key, n in overview["by_status"].items() if n}
+    assert {key: overview[key] for key in expected} == expected
+    return overview
+
+
+def test_register_and_profile_writes(client, make_user, admin):
+    before = _assert_overview_matches(client, admin)
+    user = make_user()
+    after = _assert_overview_matches(client, admin)
+    assert after["total_users"] == before["total_users"] + 1
+
+    response = client.patch(
+        "/api/v1/users/me/profile", json={"full_name": "Counted"},
+        headers={**user.headers, "Content-Type": "application/merge-patch+json"},
+    )
+    assert response.status_code == 200, response.text
+    after = _assert_overview_matches(client, admin)
+    assert after["profiles_completed"] == before["profiles_completed"] + 1
+
+
+def test_status_change_and_delete(client, make_user, admin):
+    user, doomed = make_user(), make_user()
+    response = client.patch(f"/api/v1/users/{user.id}/status", json={"status": "suspended"}, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    _assert_overview_matches(client, admin)
+
+    assert client.delete(f"/api/v1/users/{user.id}", headers=admin.headers).status_code == 200
+    before = _assert_overview_matches(client, admin)
+    response = client.delete(f"/api/v1/users/{doomed.id}", params={"hard_delete": "true"}, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    after = _assert_overview_matches(client, admin)
+    assert (after["total_users"], after["profiles"]) == (before["total_users"] - 1, before["profiles"] - 1)
+
+
+def test_bulk_job(client, make_user, admin):
+    ids = [make_user().id for _ in range(3)]
+    response = client.put(
+        "/api/v1/users/bulk/update",
+        json={"user_ids": ids, "status": "suspended", "role": "clinician", "is_verified": True},
+        headers=admin.headers,
+    )
+    assert response.status_code == 202, response.text
+    assert wait_for_job(client, admin, response.json())["status"] == "completed"
+    _assert_overview_matches(client, admin)
+
+
+def test_reconcile_repairs_drift_and_folds_shards(client, make_user, admin):
+    make_user()
+    with SessionLocal() as db:
+        # Drift on one counter, and a count spread over another shard
+        db.execute(update(UserStat).where(UserStat.key == "total", UserStat.shard == 0).values(value=UserStat.value + 5))
+        db.execute(update(UserStat).where(UserStat.key == "profiles", UserStat.shard == 0).values(value=UserStat.value - 2))
+        db.execute(insert(UserStat).values(key="profiles", shard=3, value=2))
+        db.commit()
+    # Readers sum the shards: only the drift on "total" is visible
+    response = client.get("/api/v1/users/stats/overview", headers=admin.headers)
+    assert response.json()["total_users"] == _counts()["total_users"] + 5
+    assert response.json()["profiles"] == _counts()["profiles"]
+
+    assert maintenance_service.reconcile_user_stats() == {"total": -5}
+    overview = _assert_overview_matches(client, admin)
+    assert overview["last_reconciled_at"] is not None
+    with SessionLocal() as db:
+        assert set(db.scalars(select(UserStat.shard))) == {0}
@@ -0,0 +1,108 @@
+# tests/test_write_behind.py
+"""Write-behind touch buffer: coalescing, forward-only writes, bounds and the shutdown flush."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.core.background import PeriodicTask
+from app.core.config import SessionLocal
+from app.core.write_behind import TouchBuffer, user_touch_buffer
+from app.models.user_models import User
+from app.services import maintenance_service
+from tests.conftest import login
+
+# Later than any real login, which the app's own buffer may flush during a test
+T0 = datetime(2999, 1, 1, 12, 0, 0)
+
+
+def _buffer(max_entries: int = 100) -> TouchBuffer:
+    return TouchBuffer(User.__table__, frozenset({"last_login_at", "updated_at"}), SessionLocal, max_entries)
+
+
+def _row(user_id: str):
+    with SessionLocal() as db:
+        return db.execute(select(User.last_login_at, User.updated_at).where(User.id == UUID(user_id))).one()
+
+
+def test_touches_coalesce_to_the_newest_value(make_user):
+    user = make_user()
+    buffer = _buffer()
+    for minutes in (1, 3, 2):
+        assert buffer.touch(UUID(user.id), last_login_at=T0 + timedelta(minutes=minutes))
+
+    assert buffer.stats()["pending"] == 1
+    assert buffer.flush() == 1
+    assert _row(user.id).last_login_at == T0 + timedelta(minutes=3)
+    assert buffer.stats()["pending"] == 0 and buffer.flush() == 0
+
+
+def test_flush_never_moves_a_timestamp_backwards(make_user):
+    user = make_user()
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.id == UUID(user.id)).values(last_login_at=T0 + timedelta(hours=1)))
+        db.commit()
+    buffer = _buffer()
+    buffer.touch(UUID(user.id), last_login_at=T0)
+    buffer.flush()
+    assert _row(user.id).last_login_at == T0 + timedelta(hours=1)
+
+
+def test_flush_leaves_updated_at_alone(make_user):
+    user = make_user()
+    updated_at = _row(user.id).updated_at
+    buffer = _buffer()
+    buffer.touch(UUID(user.id), last_login_at=T0 + timedelta(days=365))
+    buffer.flush()
+    assert _row(user.id) == (T0 + timedelta(days=365), updated_at)
+
+
+def test_full_buffer_drops_new_rows_only(make_user):
+    first, second, third = (make_user() for _ in range(3))
+    buffer = _buffer(max_entries=2)
+    assert buffer.touch(UUID(first.id), last_login_at=T0)
+    assert buffer.touch(UUID(second.id), last_login_at=T0)
+    assert not buffer.touch(UUID(third.id), last_login_at=T0)
+    # Rows already buffered still take newer touches
+    assert buffer.touch(UUID(first.id), last_login_at=T0 + timedelta(minutes=1))
+
+    assert buffer.stats()["dropped"] == 1
+    assert buffer.flush() == 2
+    assert _row(first.id).last_login_at == T0 + timedelta(minutes=1)
+    assert _row(third.id).last_login_at != T0
+
+
+def test_login_touch_keeps_the_me_validators(client, make_user):
+    user = make_user()
+    user_touch_buffer.flush()
+    me = client.get("/api/v1/users/me", headers=user.headers)
+    before = _row(user.id).last_login_at
+
+    login(client, user.email)
+    user_touch_buffer.flush()
+
+    assert _row(user.id).last_login_at > before
+    response = client.get("/api/v1/users/me", headers={**user.headers, "If-None-Match": me.headers["etag"]})
+    assert response.status_code == 304
+    assert response.headers["last-modified"] == me.headers["last-modified"]
+
+
+def test_shutdown_flushes_pending_touches(client, make_user):
+    user = make_user()
+    user_touch_buffer.flush()
+    before = _row(user.id).last_login_at
+    login(client, user.email)
+    assert user_touch_buffer.stats()["pending"] >= 1
+
+    async def lifespan():
+        # The shutdown order of main.lifespan: stop the periodic flush, then flush once more
+        task = PeriodicTask("touch-buffer-flush", 3600, maintenance_service.flush_touch_buffer)
+        task.start()
+        await task.stop()
+        await task.run_once()
+
+    asyncio.run(lifespan())
+    assert user_touch_buffer.stats()["pending"] == 0
+    assert _row(user.id).last_login_at > before
@@ -1,4 +1,4 @@
-import { API_BASE_URL, STORAGE_KEYS } from '../utils/constants';
+import { API_BASE_URL, BATCH_URL, STORAGE_KEYS } from '../utils/constants';
 
 // In-memory storage for Claude artifacts (fallback when localStorage isn't available)
 let memoryStorage = {};
@@ -47,7 +47,8 @@ class UserAPI {
         };
 
         try {
-            const response = await fetch(`${API_BASE_URL}${endpoint}`, config);
+            const url = endpoint.startsWith('http') ? endpoint : `${API_BASE_URL}${endpoint}`;
+            const response = await fetch(url, config);
             const data = await response.json();
 
             if (!response.ok) {
@@ -103,6 +104,33 @@ class UserAPI {
         return this.request('/me');
     }
 
+    /**
+     * Run several GET requests in one round trip (authenticated once).
+     * Endpoints are relative to the users API, e.g. ['/me', '/me/profile'];
+     * resolves to [{ id, status, headers, body }] in the same order.
+     */
+    async batch(endpoints) {
+        const usersPath = new URL(API_BASE_URL).pathname;
+        const data = await this.request(BATCH_URL, {
+            method: 'POST',
+            body: JSON.stringify({
+                requests: endpoints.map((endpoint) => ({ id: endpoint, path: `${usersPath}${endpoint}` })),
+            }),
+        });
+        return data.responses;
+    }
+
+    /**
+     * Get the current user and their profile in one round trip
+     */
+    async bootstrap() {
+        const [user, profile] = await this.batch(['/me', '/me/profile']);
+        if (user.status !== 200) {
+            throw new Error(user.body?.detail || 'Request failed');
+        }
+        return { user: user.body, profile: profile.status === 200 ? profile.body : null };
+    }
+
     /**
      * Update user profile information
      */
@@ -164,6 +192,10 @@ class UserAPI {
         if (response.access_token) {
             storage.setItem(STORAGE_KEYS.ACCESS_TOKEN, response.access_token);
         }
+        // Refresh tokens are single-use: always keep the rotated one
+        if (response.refresh_token) {
+            storage.setItem(STORAGE_KEYS.REFRESH_TOKEN, response.refresh_token);
+        }
 
         return response;
     }
@@ -1,5 +1,6 @@
 // API Configuration
 export const API_BASE_URL = "http://localhost:8000/api/v1/users";
+export const BATCH_URL = "http://localhost:8000/api/v1/batch";
 
 // Gender Options
 export const GENDER_OPTIONS = [